@@ -109,6 +109,7 @@ def main():
     # Save to database
     print(f"\nSaving results to database (run_id={args.run_id})...")
     analyzer.save_to_database(args.run_id)
+    analyzer.close()
 
     # Extract composition rules
     print("\nExtracting composition rules...")
@@ -66,6 +66,12 @@ def main():
         default='louvain',
         help='Community detection method'
     )
+    parser.add_argument(
+        '--n-jobs',
+        type=int,
+        default=1,
+        help='Worker processes for per-component closeness (-1 = all cores)'
+    )
     parser.add_argument(
         '--output-dir',
         default='results/semantic_network',
@@ -94,13 +100,11 @@ def main():
     communities = analyzer.detect_communities(method=args.community_method)
     print(f"Found {len(set(communities.values()))} communities")
 
-    # Compute centrality
-    print("\nComputing centrality measures...")
-    centrality = analyzer.compute_centrality()
-
-    # Get network stats
-    print("\nComputing network statistics...")
-    stats = analyzer.get_network_stats()
+    # Compute centrality and network stats once for saving and export
+    print("\nComputing centrality measures and network statistics...")
+    results = analyzer.compute_all(n_jobs=args.n_jobs)
+    centrality = results['centrality']
+    stats = results['stats']
 
     # Find bridges and articulation points
     print("\nFinding structural features...")
@@ -109,7 +113,7 @@ def main():
 
     # Save to database
     print(f"\nSaving results to database (run_id={args.network_run_id})...")
-    analyzer.save_to_database(args.network_run_id)
+    analyzer.save_to_database(args.network_run_id, results)
 
     # Create output directory
     output_dir = Path(args.output_dir) / args.network_run_id
@@ -117,7 +121,7 @@ def main():
 
     # Export network to JSON
     print(f"\nExporting network to JSON...")
-    analyzer.export_to_json(output_dir / 'network.json')
+    analyzer.export_to_json(output_dir / 'network.json', results)
 
     # Save community assignments
     with open(output_dir / 'communities.json', 'w', encoding='utf-8') as f:
@@ -127,6 +127,16 @@ def main():
                        help="Number of top unlabeled characters to label")
     parser.add_argument("--rate-limit-delay", type=float, default=1.0,
                        help="Delay between API calls (seconds)")
+    parser.add_argument("--batch-size", type=int, default=10,
+                       help="Characters packed into one API call (1 = one call per character)")
+    parser.add_argument("--use-batch-api", action="store_true",
+                       help="Submit via the asynchronous OpenAI Batch API (cheaper, up to 24h)")
+    parser.add_argument("--cache-path", default="results/llm_labels/llm_cache.db",
+                       help="SQLite cache of previous LLM answers (empty string to disable)")
+    parser.add_argument("--max-budget-usd", type=float, default=None,
+                       help="Stop labeling once actual API spend exceeds this amount")
+    parser.add_argument("--dedup-threshold", type=float, default=None,
+                       help="Share one LLM label among characters at least this similar (e.g. 0.85)")
     parser.add_argument("--estimate-cost-only", action="store_true",
                        help="Only estimate cost, don't run labeling")
 
@@ -168,6 +178,8 @@ def main():
         api_key=args.api_key,
         base_url=args.base_url,
         temperature=0.0,
+        cache_path=args.cache_path or None,
+        max_budget_usd=args.max_budget_usd,
     )
 
     # Estimate cost
@@ -225,6 +237,9 @@ def main():
         characters_data,
         existing_categories,
         rate_limit_delay=args.rate_limit_delay,
+        batch_size=args.batch_size,
+        use_batch_api=args.use_batch_api,
+        dedup_threshold=args.dedup_threshold,
     )
 
     # Save results
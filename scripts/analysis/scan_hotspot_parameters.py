@@ -17,12 +17,12 @@ from typing import Dict, List
 import numpy as np
 import pandas as pd
 from sklearn.cluster import DBSCAN
-from sklearn.neighbors import KernelDensity
 
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
 from src.spatial.coordinate_loader import CoordinateLoader
+from src.spatial.hotspot_detector import HotspotDetector
 from src.schema import REGION_LEVELS
 
 
@@ -63,16 +63,19 @@ def choose_sample_indices(n_points: int, sample_size: int, seed: int) -> np.ndar
     return rng.choice(n_points, size=sample_size, replace=False)
 
 
-def evaluate_density(coords: np.ndarray, sample_indices: np.ndarray, bandwidth_km: float) -> np.ndarray:
-    kde = KernelDensity(
-        bandwidth=bandwidth_km / 111.0,
-        algorithm="ball_tree",
-        kernel="gaussian",
-        metric="euclidean",
+def evaluate_density(
+    coords: np.ndarray,
+    sample_indices: np.ndarray,
+    bandwidth_km: float,
+    kernel: str = "epanechnikov",
+) -> np.ndarray:
+    # Same KDE as the hotspot pipeline: Epanechnikov uses the grid hash
+    detector = HotspotDetector(
+        bandwidth_km=bandwidth_km,
+        kernel=kernel,
+        use_grid_hash=kernel == "epanechnikov",
     )
-    kde.fit(coords)
-    log_density = kde.score_samples(coords[sample_indices])
-    return np.exp(log_density)
+    return detector.compute_density(coords, coords[sample_indices])
 
 
 def cluster_hotspots(
@@ -281,7 +284,14 @@ def format_result(result: dict) -> str:
     return "\n".join(lines)
 
 
-def build_report(results: List[dict], db_path: str, sample_size: int, seed: int, total_points: int) -> str:
+def build_report(
+    results: List[dict],
+    db_path: str,
+    sample_size: int,
+    seed: int,
+    total_points: int,
+    kernel: str = "epanechnikov",
+) -> str:
     lines = []
     lines.append("Hotspot Parameter Scan")
     lines.append("=" * 80)
@@ -290,6 +300,7 @@ def build_report(results: List[dict], db_path: str, sample_size: int, seed: int,
     lines.append(f"Total valid coordinate points: {total_points:,}")
     lines.append(f"Sample size for KDE evaluation: {sample_size:,}")
     lines.append(f"Random seed: {seed}")
+    lines.append(f"KDE kernel: {kernel}")
     lines.append("")
     lines.append("Note: sample_candidate_count is counted from sampled KDE candidate points.")
     lines.append("Full-count fields are computed against all valid coordinate points.")
@@ -324,6 +335,8 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("--output", default=None)
     parser.add_argument("--sample-size", type=int, default=10000)
     parser.add_argument("--seed", type=int, default=20260712)
+    parser.add_argument("--kernel", choices=["epanechnikov", "gaussian"], default="epanechnikov",
+                        help="KDE kernel (the hotspot pipeline defaults to epanechnikov)")
     parser.add_argument(
         "--modes",
         default=",".join(config.name for config in DEFAULT_CONFIGS),
@@ -345,8 +358,8 @@ def main() -> int:
 
     density_by_bandwidth: Dict[float, np.ndarray] = {}
     for bandwidth in sorted({config.bandwidth_km for config in configs}):
-        print(f"Computing KDE density for bandwidth={bandwidth:.1f}km...")
-        density_by_bandwidth[bandwidth] = evaluate_density(coords, sample_indices, bandwidth)
+        print(f"Computing {args.kernel} KDE density for bandwidth={bandwidth:.1f}km...")
+        density_by_bandwidth[bandwidth] = evaluate_density(coords, sample_indices, bandwidth, args.kernel)
 
     results = []
     for config in configs:
@@ -364,7 +377,7 @@ def main() -> int:
     output_path = Path(args.output) if args.output else Path("results") / f"hotspot_parameter_scan_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt"
     output_path.parent.mkdir(parents=True, exist_ok=True)
     output_path.write_text(
-        build_report(results, args.db_path, len(sample_indices), args.seed, len(coords)),
+        build_report(results, args.db_path, len(sample_indices), args.seed, len(coords), args.kernel),
         encoding="utf-8",
     )
     print(f"Report written to: {output_path}")
@@ -35,6 +35,8 @@ def main():
     parser.add_argument("--hotspot-cluster-min-samples", type=int, default=5)
     parser.add_argument("--hotspot-full-count-radius-km", type=float, default=3.0)
     parser.add_argument("--hotspot-sample-seed", type=int, default=20260712)
+    parser.add_argument("--hotspot-kernel", choices=["epanechnikov", "gaussian"], default="epanechnikov",
+                        help="KDE kernel; epanechnikov is evaluated with a bandwidth grid hash")
     parser.add_argument("--batch-size", type=int, default=10000, help="Rows per batch in features mode")
 
     args = parser.parse_args()
@@ -50,6 +52,8 @@ def main():
                 cluster_min_samples=args.hotspot_cluster_min_samples,
                 full_count_radius_km=args.hotspot_full_count_radius_km,
                 sample_seed=args.hotspot_sample_seed,
+                kernel=args.hotspot_kernel,
+                use_grid_hash=args.hotspot_kernel == "epanechnikov",
             )
             logger.info(f"Done: {result['hotspots_count']} hotspots in {result['runtime_seconds']}s")
         else:
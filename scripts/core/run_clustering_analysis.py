@@ -121,6 +121,17 @@ def main():
         default=500,
         help='KMeans max iterations (default: 500)'
     )
+    parser.add_argument(
+        '--minibatch-sweep',
+        action='store_true',
+        help='Screen k values with MiniBatchKMeans and refit only the best k'
+    )
+    parser.add_argument(
+        '--n-jobs',
+        type=int,
+        default=-1,
+        help='Number of k values fitted in parallel (default: -1, all cores)'
+    )
     parser.add_argument(
         '--random-state',
         type=int,
@@ -197,6 +208,8 @@ def main():
         logger.info(f"PCA components: {args.pca_components}")
     logger.info(f"N init: {args.n_init}")
     logger.info(f"Max iter: {args.max_iter}")
+    logger.info(f"MiniBatch k sweep: {args.minibatch_sweep}")
+    logger.info(f"Parallel jobs: {args.n_jobs}")
     logger.info(f"Random state: {args.random_state}")
     logger.info(f"Semantic lexicon path: {args.semantic_lexicon_path}")
     logger.info(f"Use semantic features: {args.use_semantic}")
@@ -223,6 +236,8 @@ def main():
             pca_n_components=args.pca_components,
             n_init=args.n_init,
             max_iter=args.max_iter,
+            minibatch_sweep=args.minibatch_sweep,
+            n_jobs=args.n_jobs,
             random_state=args.random_state,
             semantic_lexicon_path=args.semantic_lexicon_path,
             output_dir=args.output_dir
@@ -61,6 +61,7 @@ def main():
     parser.add_argument('--schema', default='guangdong', choices=['guangdong', 'national'], help='Village table schema')
     parser.add_argument('--chunk-size', type=int, default=10000, help='Village load chunk size')
     parser.add_argument('--persist-batch-size', type=int, default=10000, help='Rows to persist per DB batch')
+    parser.add_argument('--n-jobs', type=int, default=1, help='Worker processes for per-level computation (-1 = one per level)')
     parser.add_argument('--min-global-support', type=int, default=20, help='Minimum global support')
     parser.add_argument('--min-regional-support', type=int, default=5, help='Minimum regional support')
     parser.add_argument('--smoothing-alpha', type=float, default=1.0, help='Tendency smoothing alpha')
@@ -84,6 +85,7 @@ def main():
     config.frequency.region_levels = _split_csv_values(args.region_levels)
     config.frequency.chunk_size = args.chunk_size
     config.frequency.persist_batch_size = args.persist_batch_size
+    config.frequency.n_jobs = args.n_jobs
     config.tendency.min_global_support = args.min_global_support
     config.tendency.min_regional_support = args.min_regional_support
     config.tendency.smoothing_alpha = args.smoothing_alpha
@@ -69,6 +69,7 @@ def main():
     parser.add_argument('--region-levels', default=','.join(REGION_LEVELS[:3]), help='Comma-separated region levels')
     parser.add_argument('--schema', default='guangdong', choices=['guangdong', 'national'], help='Village table schema')
     parser.add_argument('--chunk-size', type=int, default=10000, help='Village load chunk size')
+    parser.add_argument('--n-jobs', type=int, default=1, help='Worker processes for per-pattern analysis (-1 = one per pattern type)')
     parser.add_argument('--min-global-support', type=int, default=20, help='Minimum global support')
     parser.add_argument('--min-regional-support', type=int, default=5, help='Minimum regional support')
     parser.add_argument('--smoothing-alpha', type=float, default=1.0, help='Tendency smoothing alpha')
@@ -95,6 +96,7 @@ def main():
     )
     config.frequency.region_levels = region_levels
     config.frequency.chunk_size = args.chunk_size
+    config.frequency.n_jobs = args.n_jobs
     config.tendency.min_global_support = args.min_global_support
     config.tendency.min_regional_support = args.min_regional_support
     config.tendency.smoothing_alpha = args.smoothing_alpha
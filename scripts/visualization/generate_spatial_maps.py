@@ -109,12 +109,12 @@ Examples:
     try:
         # Load spatial features
         logger.info("Loading spatial features from database...")
-        features_query = f"""
+        features_query = """
             SELECT *
             FROM village_spatial_features
-            WHERE run_id = '{args.run_id}'
+            WHERE run_id = ?
         """
-        features_df = pd.read_sql_query(features_query, conn)
+        features_df = pd.read_sql_query(features_query, conn, params=(args.run_id,))
 
         if len(features_df) == 0:
             logger.error(f"No spatial features found for run_id: {args.run_id}")
@@ -148,12 +148,12 @@ Examples:
             logger.info("Generating hotspot map...")
 
             # Load hotspots
-            hotspots_query = f"""
+            hotspots_query = """
                 SELECT *
                 FROM spatial_hotspots
-                WHERE run_id = '{args.run_id}'
+                WHERE run_id = ?
             """
-            hotspots_df = pd.read_sql_query(hotspots_query, conn)
+            hotspots_df = pd.read_sql_query(hotspots_query, conn, params=(args.run_id,))
 
             if len(hotspots_df) > 0:
                 map_gen.create_hotspot_map(
@@ -133,7 +133,7 @@ def compute_char_frequency_by_region(
         group_cols = [schema.city_col, schema.county_col, schema.township_col]
 
     # Group by hierarchical key
-    for group_key, group in valid_df.groupby(group_cols):
+    for group_key, group in valid_df.groupby(group_cols, observed=True):
         # Handle single vs multiple group columns
         # IMPORTANT: groupby always returns tuple, even for single column
         if region_level == REGION_LEVELS[0]:
@@ -1,6 +1,7 @@
 """Morphology pattern frequency computation (suffix/prefix)."""
 
 import logging
+from typing import Dict, List, Tuple
 import pandas as pd
 import numpy as np
 
@@ -9,6 +10,19 @@ from src.schema import REGION_LEVELS, VillageTableSchema, DEFAULT_SCHEMA
 logger = logging.getLogger(__name__)
 
 
+def count_patterns(patterns: pd.Series) -> pd.Series:
+    """
+    Count patterns like value_counts(), for object or categorical columns.
+
+    Counts only observed values (categorical value_counts would also list
+    unused categories) and keeps value_counts' order: count descending,
+    ties in order of first appearance.
+    """
+    return patterns.groupby(patterns, observed=True, sort=False).size().sort_values(
+        ascending=False, kind='stable'
+    )
+
+
 def compute_pattern_frequency_global(
     villages_df: pd.DataFrame,
     pattern_col: str
@@ -46,7 +60,7 @@ def compute_pattern_frequency_global(
         return pd.DataFrame(columns=['pattern', 'village_count', 'total_villages', 'frequency', 'rank'])
 
     # Count pattern occurrences
-    pattern_counts = valid_df[pattern_col].value_counts().to_dict()
+    pattern_counts = count_patterns(valid_df[pattern_col]).to_dict()
 
     # Build result DataFrame
     results = []
@@ -71,6 +85,142 @@ def compute_pattern_frequency_global(
     return df
 
 
+def _rollup_counts(base: pd.DataFrame, keys: List[str]) -> pd.DataFrame:
+    """Sum counts (and keep first positions) of base over the given key levels, dropping NaN keys."""
+    return base.groupby(level=keys, observed=True, sort=False).agg(
+        size=('size', 'sum'), min=('min', 'min')
+    ).reset_index()
+
+
+def compute_pattern_frequencies(
+    villages_df: pd.DataFrame,
+    pattern_col: str,
+    region_levels: List[str],
+    schema: VillageTableSchema = DEFAULT_SCHEMA,
+) -> Tuple[pd.DataFrame, Dict[str, pd.DataFrame]]:
+    """
+    Compute global and regional pattern frequencies from one pass over the villages.
+
+    Valid villages are counted once per (city, county, township, pattern),
+    keeping the position where each pair first appears; the global table and
+    every regional table are rolled up from those counts. Results match
+    compute_pattern_frequency_global and the per-level hierarchical grouping,
+    including the value_counts order of tied patterns.
+
+    Args:
+        villages_df: DataFrame with region columns, pattern column, and is_valid
+        pattern_col: Column name (e.g., 'suffix_1', 'prefix_2')
+        region_levels: Region levels to compute regional frequencies for
+        schema: Table schema definition
+
+    Returns:
+        Tuple of (global frequency DataFrame, dict of region level ->
+        regional frequency DataFrame), with the columns documented on
+        compute_pattern_frequency_global and compute_pattern_frequency_by_region
+    """
+    for region_level in region_levels:
+        if region_level not in schema.level_map:
+            raise ValueError(f"Invalid region_level: {region_level}")
+
+    hierarchy = [schema.city_col, schema.county_col, schema.township_col]
+
+    # Filter to valid villages with non-null patterns
+    mask = villages_df['is_valid'] & villages_df[pattern_col].notna()
+    valid_df = villages_df.loc[mask, hierarchy + [pattern_col]]
+    total_villages = len(valid_df)
+
+    # Count each (city, county, township, pattern) once, with first position
+    base = valid_df.assign(_pos=np.arange(total_villages)).groupby(
+        hierarchy + [pattern_col], observed=True, dropna=False, sort=False
+    )['_pos'].agg(['size', 'min'])
+
+    # Global frequencies
+    logger.info(f"Computing global frequencies for {pattern_col}: {total_villages:,} valid villages")
+
+    if total_villages == 0:
+        global_freq = pd.DataFrame(columns=['pattern', 'village_count', 'total_villages', 'frequency', 'rank'])
+    else:
+        counts = _rollup_counts(base, [pattern_col]).sort_values(
+            ['size', 'min'], ascending=[False, True], kind='stable'
+        )
+        village_count = counts['size'].to_numpy()
+        global_freq = pd.DataFrame({
+            'pattern': counts[pattern_col].to_numpy(),
+            'village_count': village_count,
+            'total_villages': total_villages,
+            'frequency': village_count / total_villages,
+        })
+
+        # Sort by frequency and add rank
+        global_freq = global_freq.sort_values('frequency', ascending=False).reset_index(drop=True)
+        global_freq['rank'] = global_freq.index + 1
+
+        logger.info(f"Computed frequencies for {len(global_freq)} unique patterns")
+        logger.info(f"Top 5 patterns: {global_freq.head(5)['pattern'].tolist()}")
+
+    # Regional frequencies, grouped by hierarchical key to separate duplicate place names
+    regional_freqs = {}
+    for region_level in region_levels:
+        logger.info(f"Computing {region_level}-level frequencies for {pattern_col} with hierarchical grouping")
+
+        if region_level == REGION_LEVELS[0]:
+            group_cols = hierarchy[:1]
+        elif region_level == REGION_LEVELS[1]:
+            group_cols = hierarchy[:2]
+        else:  # township
+            group_cols = hierarchy
+        rank_group_cols = REGION_LEVELS[:len(group_cols)]
+
+        counts = _rollup_counts(base, group_cols + [pattern_col])
+        counts['total'] = counts.groupby(group_cols, sort=False)['size'].transform('sum')
+        # Regions in key order; within a region, patterns by count then first appearance
+        counts = counts.sort_values(
+            group_cols + ['size', 'min'],
+            ascending=[True] * len(group_cols) + [False, True],
+            kind='stable'
+        )
+
+        # Region name for display: the value on the first village of the region
+        region_col = schema.level_map[region_level]
+        if region_col in group_cols:
+            region_name = counts[region_col].to_numpy()
+        else:
+            first_rows = villages_df.loc[mask, group_cols + [region_col]].drop_duplicates(group_cols)
+            region_name = counts[group_cols].merge(first_rows, on=group_cols, how='left')[region_col].to_numpy()
+
+        n_rows = len(counts)
+        village_count = counts['size'].to_numpy()
+        total = counts['total'].to_numpy()
+        df = pd.DataFrame({
+            'region_level': region_level,
+            REGION_LEVELS[0]: counts[schema.city_col].to_numpy(),
+            REGION_LEVELS[1]: counts[schema.county_col].to_numpy() if len(group_cols) > 1 else [None] * n_rows,
+            REGION_LEVELS[2]: counts[schema.township_col].to_numpy() if len(group_cols) > 2 else [None] * n_rows,
+            'region_name': region_name,
+            'pattern': counts[pattern_col].to_numpy(),
+            'village_count': village_count,
+            'total_villages': total,
+            'frequency': village_count / total,
+        })
+
+        # Add rank within each hierarchical region (not just by region_name)
+        df['rank_within_region'] = df.groupby(rank_group_cols)['frequency'].rank(
+            ascending=False, method='dense'
+        ).astype(int)
+
+        # Sort by hierarchical key and frequency
+        sort_cols = rank_group_cols + ['frequency']
+        df = df.sort_values(sort_cols, ascending=[True] * len(rank_group_cols) + [False])
+
+        # Count unique regions (by hierarchical key, not just region_name)
+        unique_regions = df.groupby(rank_group_cols).ngroups
+        logger.info(f"Computed frequencies for {unique_regions} {region_level} regions (hierarchically separated)")
+
+        regional_freqs[region_level] = df
+
+    return global_freq, regional_freqs
+
+
 def compute_pattern_frequency_by_region(
     villages_df: pd.DataFrame,
     region_level: str,
@@ -99,91 +249,8 @@ def compute_pattern_frequency_by_region(
         - frequency: Proportion
         - rank_within_region: Rank within this region
     """
-    if region_level not in schema.level_map:
-        raise ValueError(f"Invalid region_level: {region_level}")
-
-    region_col = schema.level_map[region_level]
-
-    # Filter to valid villages with non-null patterns
-    valid_df = villages_df[
-        villages_df['is_valid'] & villages_df[pattern_col].notna()
-    ].copy()
-
-    logger.info(f"Computing {region_level}-level frequencies for {pattern_col} with hierarchical grouping")
-
-    results = []
-
-    # Group by hierarchical key to separate duplicate place names
-    if region_level == REGION_LEVELS[0]:
-        group_cols = [schema.city_col]
-    elif region_level == REGION_LEVELS[1]:
-        group_cols = [schema.city_col, schema.county_col]
-    else:  # township
-        group_cols = [schema.city_col, schema.county_col, schema.township_col]
-
-    # Group by hierarchical key
-    for group_key, group in valid_df.groupby(group_cols):
-        # Handle single vs multiple group columns
-        # IMPORTANT: groupby always returns tuple, even for single column
-        if region_level == REGION_LEVELS[0]:
-            city = group_key[0] if isinstance(group_key, tuple) else group_key
-            county = None
-            township = None
-        elif region_level == REGION_LEVELS[1]:
-            city, county = group_key
-            township = None
-        else:  # township
-            city, county, township = group_key
-
-        # Skip if any key is NaN
-        if pd.isna(city) or (region_level in [REGION_LEVELS[1], REGION_LEVELS[2]] and pd.isna(county)) or (region_level == REGION_LEVELS[2] and pd.isna(township)):
-            continue
-
-        # Get region name for display
-        region_name = group[region_col].iloc[0]
-        total_villages = len(group)
-
-        # Count patterns in this region
-        pattern_counts = group[pattern_col].value_counts().to_dict()
-
-        # Add to results
-        for pattern, count in pattern_counts.items():
-            results.append({
-                'region_level': region_level,
-                REGION_LEVELS[0]: city,
-                REGION_LEVELS[1]: county,
-                REGION_LEVELS[2]: township,
-                'region_name': region_name,
-                'pattern': pattern,
-                'village_count': count,
-                'total_villages': total_villages,
-                'frequency': count / total_villages if total_villages > 0 else 0.0
-            })
-
-    df = pd.DataFrame(results)
-
-    # Add rank within each hierarchical region (not just by region_name)
-    # Group by hierarchical key for ranking
-    if region_level == REGION_LEVELS[0]:
-        rank_group_cols = [REGION_LEVELS[0]]
-    elif region_level == REGION_LEVELS[1]:
-        rank_group_cols = [REGION_LEVELS[0], REGION_LEVELS[1]]
-    else:  # township
-        rank_group_cols = [REGION_LEVELS[0], REGION_LEVELS[1], REGION_LEVELS[2]]
-
-    df['rank_within_region'] = df.groupby(rank_group_cols)['frequency'].rank(
-        ascending=False, method='dense'
-    ).astype(int)
-
-    # Sort by hierarchical key and frequency
-    sort_cols = rank_group_cols + ['frequency']
-    df = df.sort_values(sort_cols, ascending=[True] * len(rank_group_cols) + [False])
-
-    # Count unique regions (by hierarchical key, not just region_name)
-    unique_regions = df.groupby(rank_group_cols).ngroups
-    logger.info(f"Computed frequencies for {unique_regions} {region_level} regions (hierarchically separated)")
-
-    return df
+    _, regional_freqs = compute_pattern_frequencies(villages_df, pattern_col, [region_level], schema)
+    return regional_freqs[region_level]
 
 
 def calculate_pattern_lift(
@@ -205,18 +272,18 @@ def calculate_pattern_lift(
         - global_frequency
         - lift_vs_global
     """
-    # Create lookup dict for global frequencies
-    global_lookup = global_freq.set_index('pattern')[['village_count', 'frequency']].to_dict('index')
+    # Global frequencies indexed by pattern (one hashed lookup per column)
+    global_lookup = global_freq.drop_duplicates('pattern', keep='last').set_index('pattern')
 
     # Add global stats and compute lift
     regional_freq = regional_freq.copy()
 
     regional_freq['global_village_count'] = regional_freq['pattern'].map(
-        lambda p: global_lookup.get(p, {}).get('village_count', 0)
-    )
+        global_lookup['village_count']
+    ).fillna(0).astype(np.int64)
     regional_freq['global_frequency'] = regional_freq['pattern'].map(
-        lambda p: global_lookup.get(p, {}).get('frequency', 0.0)
-    )
+        global_lookup['frequency']
+    ).fillna(0.0).astype(np.float64)
 
     # Compute lift (avoid division by zero)
     regional_freq['lift_vs_global'] = np.where(
@@ -7,6 +7,12 @@ from src.schema import REGION_LEVELS
 from typing import Optional
 from scipy import stats
 
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
 
@@ -78,6 +84,55 @@ def compute_z_score(n_region: int, N_region: int, p_global: float) -> float:
     return (n_region - expected) / np.sqrt(variance)
 
 
+def _log_odds_values(p_region: np.ndarray, p_global: np.ndarray) -> np.ndarray:
+    """Vectorized compute_log_odds over float64 frequency arrays."""
+    p_r_smooth = np.minimum(np.maximum(p_region, 1e-10), 1 - 1e-10)
+    p_g_smooth = np.minimum(np.maximum(p_global, 1e-10), 1 - 1e-10)
+    return np.log(p_r_smooth / (1 - p_r_smooth)) - np.log(p_g_smooth / (1 - p_g_smooth))
+
+
+def _z_score_values(n_region: np.ndarray, N_region: np.ndarray, p_global: np.ndarray) -> np.ndarray:
+    """Vectorized compute_z_score over float64 count/frequency arrays."""
+    expected = N_region * p_global
+    variance = N_region * p_global * (1 - p_global)
+    degenerate = variance < 1e-10
+    return np.where(degenerate, 0.0, (n_region - expected) / np.sqrt(np.where(degenerate, 1.0, variance)))
+
+
+def _tendency_kernel(frequency, global_frequency, village_count, total_villages):
+    """
+    Log-odds and z-score for every row in one loop (compiled with numba).
+
+    Args:
+        frequency: Regional frequency per row (float64)
+        global_frequency: Global frequency per row (float64)
+        village_count: Regional count per row (float64)
+        total_villages: Regional total per row (float64)
+
+    Returns:
+        (log_odds, z_score) float64 arrays
+    """
+    n = frequency.shape[0]
+    log_odds = np.empty(n)
+    z_score = np.empty(n)
+    for i in range(n):
+        p_r = min(max(frequency[i], 1e-10), 1 - 1e-10)
+        p_g = min(max(global_frequency[i], 1e-10), 1 - 1e-10)
+        log_odds[i] = np.log(p_r / (1 - p_r)) - np.log(p_g / (1 - p_g))
+
+        expected = total_villages[i] * global_frequency[i]
+        variance = total_villages[i] * global_frequency[i] * (1 - global_frequency[i])
+        if variance < 1e-10:
+            z_score[i] = 0.0
+        else:
+            z_score[i] = (village_count[i] - expected) / np.sqrt(variance)
+    return log_odds, z_score
+
+
+if NUMBA_AVAILABLE:
+    _tendency_kernel = njit(cache=True)(_tendency_kernel)
+
+
 def filter_by_support(
     df: pd.DataFrame,
     min_global: int = 20,
@@ -272,22 +327,23 @@ def compute_regional_tendency(
     df['lift'] = df['lift_vs_global']
     df['log_lift'] = np.log(df['lift'].replace(0, np.nan))
 
-    # Compute log-odds
-    df['log_odds'] = df.apply(
-        lambda row: compute_log_odds(row['frequency'], row['global_frequency'], smoothing_alpha),
-        axis=1
-    )
+    # Compute log-odds and z-score (compute_log_odds / compute_z_score over
+    # whole columns: a compiled loop with numba, else numpy expressions)
+    p_region = df['frequency'].to_numpy(dtype=np.float64)
+    p_global = df['global_frequency'].to_numpy(dtype=np.float64)
+    n_region = df['village_count'].to_numpy(dtype=np.float64)
+    N_region = df['total_villages'].to_numpy(dtype=np.float64)
+    if NUMBA_AVAILABLE:
+        log_odds, z_score = _tendency_kernel(p_region, p_global, n_region, N_region)
+    else:
+        log_odds = _log_odds_values(p_region, p_global)
+        z_score = None
+
+    df['log_odds'] = log_odds
 
     # Compute z-score (always compute if normalization_method is 'zscore')
     if compute_z or normalization_method == 'zscore':
-        df['z_score'] = df.apply(
-            lambda row: compute_z_score(
-                row['village_count'],
-                row['total_villages'],
-                row['global_frequency']
-            ),
-            axis=1
-        )
+        df['z_score'] = z_score if z_score is not None else _z_score_values(n_region, N_region, p_global)
 
     # Filter by support
     df = filter_by_support(df, min_global_support, min_regional_support)
@@ -9,8 +9,75 @@ import pandas as pd
 from typing import List, Dict, Tuple, Optional
 from sklearn.preprocessing import StandardScaler
 from sklearn.decomposition import PCA
-from sklearn.cluster import KMeans
+from sklearn.cluster import KMeans, MiniBatchKMeans
 from sklearn.metrics import silhouette_score, davies_bouldin_score, calinski_harabasz_score
+from joblib import Parallel, delayed
+
+
+def _make_kmeans(
+    k: int,
+    n_init: int,
+    max_iter: int,
+    minibatch: bool,
+    random_state: int
+):
+    """Build an unfitted KMeans (or MiniBatchKMeans screening) model."""
+    if minibatch:
+        return MiniBatchKMeans(
+            n_clusters=k,
+            batch_size=4096,
+            n_init=3,
+            max_iter=max_iter,
+            random_state=random_state
+        )
+    return KMeans(
+        n_clusters=k,
+        n_init=n_init,
+        max_iter=max_iter,
+        random_state=random_state
+    )
+
+
+def _fit_one(
+    X: np.ndarray,
+    k: int,
+    n_init: int,
+    max_iter: int,
+    minibatch: bool,
+    silhouette_sample_size: int,
+    random_state: int
+) -> Dict:
+    """
+    Fit one k and compute its evaluation metrics.
+
+    Module-level so joblib workers can run it.
+    """
+    model = _make_kmeans(k, n_init, max_iter, minibatch, random_state)
+    labels = model.fit_predict(X)
+
+    # Calculate metrics (silhouette is O(N^2), so sample large inputs)
+    if k <= 1:
+        sil_score = 0.0
+    elif len(X) > silhouette_sample_size:
+        sil_score = silhouette_score(
+            X, labels,
+            sample_size=silhouette_sample_size,
+            random_state=random_state
+        )
+    else:
+        sil_score = silhouette_score(X, labels)
+    db_index = davies_bouldin_score(X, labels) if k > 1 else 0.0
+    ch_score = calinski_harabasz_score(X, labels) if k > 1 else 0.0
+
+    return {
+        'k': k,
+        'model': model,
+        'labels': labels,
+        'inertia': model.inertia_,
+        'silhouette_score': sil_score,
+        'davies_bouldin_index': db_index,
+        'calinski_harabasz_score': ch_score
+    }
 
 
 class ClusteringEngine:
@@ -41,7 +108,7 @@ class ClusteringEngine:
 
         Steps:
         1. StandardScaler normalization (z-score)
-        2. Optional PCA dimensionality reduction
+        2. Optional PCA dimensionality reduction (randomized SVD solver)
 
         Args:
             X: Feature matrix (n_samples, n_features)
@@ -56,7 +123,12 @@ class ClusteringEngine:
 
         # Apply PCA if requested
         if use_pca and X.shape[1] > n_components:
-            self.pca = PCA(n_components=n_components, random_state=self.random_state)
+            # Randomized SVD: O(n*d*k) instead of a full SVD when d >> n_components
+            self.pca = PCA(
+                n_components=n_components,
+                svd_solver='randomized',
+                random_state=self.random_state
+            )
             self.X_transformed = self.pca.fit_transform(self.X_scaled)
             return self.X_transformed
         else:
@@ -68,16 +140,26 @@ class ClusteringEngine:
         X: np.ndarray,
         k_range: List[int] = [4, 6, 8, 10, 12, 15, 18, 20],
         n_init: int = 20,
-        max_iter: int = 500
+        max_iter: int = 500,
+        minibatch: bool = False,
+        silhouette_sample_size: int = 5000,
+        n_jobs: int = 1
     ) -> List[Dict]:
         """
         Run KMeans clustering for multiple k values.
 
+        With ``minibatch=True`` the sweep uses MiniBatchKMeans (3 inits) as a
+        cheap screen; refit the selected k with ``refit_kmeans`` afterwards.
+
         Args:
             X: Preprocessed feature matrix
             k_range: List of k values to try
             n_init: Number of initializations per k
             max_iter: Maximum iterations
+            minibatch: Screen k values with MiniBatchKMeans instead of KMeans
+            silhouette_sample_size: Sample size for the silhouette score when
+                X has more rows than this (exact below it)
+            n_jobs: Number of k values fitted in parallel (-1 = all cores)
 
         Returns:
             List of result dictionaries, each containing:
@@ -89,34 +171,42 @@ class ClusteringEngine:
             - davies_bouldin_index: DB index
             - calinski_harabasz_score: CH score
         """
-        results = []
-
-        for k in k_range:
-            # Fit KMeans
-            model = KMeans(
-                n_clusters=k,
-                n_init=n_init,
-                max_iter=max_iter,
-                random_state=self.random_state
+        # Each k is independent; joblib keeps results in k_range order
+        results = Parallel(n_jobs=n_jobs, backend='loky')(
+            delayed(_fit_one)(
+                X, k, n_init, max_iter, minibatch,
+                silhouette_sample_size, self.random_state
             )
-            labels = model.fit_predict(X)
-
-            # Calculate metrics
-            sil_score = silhouette_score(X, labels) if k > 1 else 0.0
-            db_index = davies_bouldin_score(X, labels) if k > 1 else 0.0
-            ch_score = calinski_harabasz_score(X, labels) if k > 1 else 0.0
-
-            results.append({
-                'k': k,
-                'model': model,
-                'labels': labels,
-                'inertia': model.inertia_,
-                'silhouette_score': sil_score,
-                'davies_bouldin_index': db_index,
-                'calinski_harabasz_score': ch_score
-            })
-
-        return results
+            for k in k_range
+        )
+
+        return list(results)
+
+    def refit_kmeans(
+        self,
+        X: np.ndarray,
+        k: int,
+        n_init: int = 20,
+        max_iter: int = 500,
+        silhouette_sample_size: int = 5000
+    ) -> Dict:
+        """
+        Fit full KMeans for a single k (e.g. the winner of a minibatch sweep).
+
+        Args:
+            X: Preprocessed feature matrix
+            k: Number of clusters
+            n_init: Number of initializations
+            max_iter: Maximum iterations
+            silhouette_sample_size: Sample size for the silhouette score
+
+        Returns:
+            Result dictionary in the same format as fit_kmeans entries
+        """
+        return _fit_one(
+            X, k, n_init, max_iter, False,
+            silhouette_sample_size, self.random_state
+        )
 
     def select_best_k(
         self,
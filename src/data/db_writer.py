@@ -21,6 +21,24 @@ from src.schema import REGION_LEVELS, VillageTableSchema, DEFAULT_SCHEMA
 logger = logging.getLogger(__name__)
 
 
+def configure_bulk_write_pragmas(conn: sqlite3.Connection) -> None:
+    """
+    Tune a connection for large batch inserts.
+
+    WAL journaling with synchronous=NORMAL avoids an fsync per commit;
+    temp tables, a ~200MB page cache and a 256MB mmap window keep index
+    builds in memory.
+
+    Args:
+        conn: SQLite database connection
+    """
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute("PRAGMA cache_size=-200000")
+    conn.execute("PRAGMA mmap_size=268435456")
+
+
 def create_analysis_tables(conn: sqlite3.Connection) -> None:
     """
     Create analysis result tables if they don't exist.
@@ -654,7 +672,13 @@ def create_morphology_indexes(conn: sqlite3.Connection) -> None:
     logger.info("Morphology indexes created successfully")
 
 
-def save_pattern_frequency_global(conn: sqlite3.Connection, pattern_type: str, df: pd.DataFrame, batch_size: int = 10000) -> None:
+def save_pattern_frequency_global(
+    conn: sqlite3.Connection,
+    pattern_type: str,
+    df: pd.DataFrame,
+    batch_size: int = 10000,
+    commit: bool = True
+) -> None:
     """
     Save global pattern frequency data (optimized schema without run_id).
 
@@ -663,6 +687,7 @@ def save_pattern_frequency_global(conn: sqlite3.Connection, pattern_type: str, d
         pattern_type: Pattern type (e.g., 'suffix_1', 'prefix_2')
         df: DataFrame with columns: pattern, village_count, total_villages, frequency, rank
         batch_size: Number of rows to insert per batch
+        commit: Commit after inserting (False leaves the caller's transaction open)
     """
     cursor = conn.cursor()
 
@@ -683,7 +708,8 @@ def save_pattern_frequency_global(conn: sqlite3.Connection, pattern_type: str, d
             VALUES (?, ?, ?, ?, ?, ?)
         """, batch)
 
-    conn.commit()
+    if commit:
+        conn.commit()
     logger.info(f"Saved {len(data)} global pattern frequency records for {pattern_type}")
 
 
@@ -811,9 +837,12 @@ def persist_morphology_results_to_db(
     try:
         # Step 1: Create tables and indexes
         logger.info("Creating morphology tables...")
+        configure_bulk_write_pragmas(conn)
         create_morphology_tables(conn)
 
-        # Step 2: Process each pattern type
+        # Step 2: Process each pattern type, all in one transaction
+        if not conn.in_transaction:
+            conn.execute("BEGIN IMMEDIATE")
         for pattern_type in pattern_types:
             logger.info(f"\nProcessing {pattern_type}...")
 
@@ -827,7 +856,7 @@ def persist_morphology_results_to_db(
             logger.info(f"Loaded {len(global_freq_df)} global frequency records")
 
             # Save global frequency (without run_id)
-            save_pattern_frequency_global(conn, pattern_type, global_freq_df, batch_size)
+            save_pattern_frequency_global(conn, pattern_type, global_freq_df, batch_size, commit=False)
 
             # Load and merge regional frequency + tendency data
             regional_freq_dfs = []
@@ -910,9 +939,10 @@ def persist_morphology_results_to_db(
                         VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
                     """, batch)
 
-                conn.commit()
                 logger.info(f"Saved {len(data)} merged regional analysis records for {pattern_type}")
 
+        conn.commit()
+
         # Step 3: Create indexes
         logger.info("\nCreating morphology indexes...")
         create_morphology_indexes(conn)
@@ -1467,15 +1497,29 @@ def create_feature_materialization_tables(
 def create_feature_materialization_indexes(
     conn: sqlite3.Connection,
     lexicon_path: str = 'data/semantic_lexicon_v1.json',
+    schema: VillageTableSchema = DEFAULT_SCHEMA,
 ) -> None:
     """
     Create indexes for feature materialization tables.
 
     Args:
         conn: SQLite database connection
+        lexicon_path: Semantic lexicon used for the sem_* column indexes
+        schema: Table schema definition (for the preprocessed village table)
     """
     cursor = conn.cursor()
 
+    # Preprocessed village name lookup used by the village_id mapping
+    cursor.execute(
+        "SELECT 1 FROM sqlite_master WHERE type='table' AND name=?",
+        (schema.preprocessed_table,)
+    )
+    if cursor.fetchone():
+        cursor.execute(
+            f"CREATE INDEX IF NOT EXISTS idx_preproc_vname "
+            f"ON {schema.preprocessed_table}({schema.village_name_col_prefix_removed})"
+        )
+
     # Indexes for village_features
     cursor.execute("CREATE INDEX IF NOT EXISTS idx_village_features_city ON village_features(city)")
     cursor.execute("CREATE INDEX IF NOT EXISTS idx_village_features_county ON village_features(county)")
@@ -1483,6 +1527,13 @@ def create_feature_materialization_indexes(
     cursor.execute("CREATE INDEX IF NOT EXISTS idx_village_features_suffix_2 ON village_features(suffix_2)")
     cursor.execute("CREATE INDEX IF NOT EXISTS idx_village_features_suffix_3 ON village_features(suffix_3)")
 
+    # Run-scoped region key: region aggregation filters on run_id and
+    # groups by a city/county/township prefix, read in index order
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_village_features_run_region "
+        "ON village_features(run_id, city, county, township)"
+    )
+
     # Semantic category indexes (dynamic from lexicon)
     from src.semantic.lexicon_loader import SemanticLexicon
     lexicon = SemanticLexicon(lexicon_path)
@@ -6,6 +6,7 @@ Extracts semantic tags, morphology patterns, and data quality flags from village
 
 import logging
 from typing import Dict, List, Optional, Set, Tuple
+import numpy as np
 import pandas as pd
 from pathlib import Path
 
@@ -139,6 +140,36 @@ class VillageFeatureExtractor:
 
         return features
 
+    def _extract_columns(self, village_names: List[str]) -> Dict[str, np.ndarray]:
+        """
+        Extract features for each name into one preallocated array per feature.
+
+        0/1 flags are stored as int8, so aggregations scan an eighth of the
+        memory; name_length is int64 and morphology strings are objects.
+
+        Args:
+            village_names: Village name strings
+
+        Returns:
+            Dict mapping feature names to arrays of length len(village_names)
+        """
+        flag_cols = {f"sem_{cat}" for cat in self.categories} | {'has_valid_chars'}
+        columns = {}
+        for key in self.extract_all_features(''):
+            if key in flag_cols:
+                dtype = np.int8
+            elif key == 'name_length':
+                dtype = np.int64
+            else:
+                dtype = object
+            columns[key] = np.empty(len(village_names), dtype=dtype)
+
+        for i, village_name in enumerate(village_names):
+            for key, value in self.extract_all_features(village_name).items():
+                columns[key][i] = value
+
+        return columns
+
     def extract_batch(self, villages_df: pd.DataFrame, village_name_col: str = '自然村') -> pd.DataFrame:
         """
         Extract features for a batch of villages.
@@ -152,17 +183,28 @@ class VillageFeatureExtractor:
         """
         logger.info(f"Extracting features for {len(villages_df)} villages")
 
-        # Extract features for each village
-        features_list = []
-        for idx, row in villages_df.iterrows():
-            village_name = row[village_name_col]
-            features = self.extract_all_features(village_name)
-            features_list.append(features)
-
-        # Convert to DataFrame
-        features_df = pd.DataFrame(features_list)
+        columns = self._extract_columns(villages_df[village_name_col].tolist())
+        features_df = pd.DataFrame(columns, copy=False)
 
         logger.info(f"Extracted {len(features_df.columns)} features")
 
         return features_df
 
+    def extract_batch_inplace(self, villages_df: pd.DataFrame, village_name_col: str = '自然村') -> None:
+        """
+        Extract features for a batch of villages as new columns of villages_df.
+
+        Same features as extract_batch, written straight into the village
+        frame so callers do not concat (and copy) a separate features frame.
+
+        Args:
+            villages_df: DataFrame with village data (modified in place)
+            village_name_col: Column name containing village names
+        """
+        logger.info(f"Extracting features for {len(villages_df)} villages")
+
+        columns = self._extract_columns(villages_df[village_name_col].tolist())
+        for key, values in columns.items():
+            villages_df[key] = values
+
+        logger.info(f"Extracted {len(columns)} features")
@@ -9,7 +9,7 @@ from .embedding_trainer import CharacterEmbeddingTrainer
 from .embedding_analyzer import EmbeddingAnalyzer
 from .embedding_visualizer import EmbeddingVisualizer
 from .embedding_storage import EmbeddingStorage
-from .llm_labeler import LLMLabeler, LabelingResult
+from .llm_labeler import LLMLabeler, LabelingResult, LabelingCache
 from .lexicon_expander import LexiconExpander
 from .semantic_cooccurrence import SemanticCooccurrence
 from .semantic_network import SemanticNetwork
@@ -21,6 +21,7 @@ __all__ = [
     "EmbeddingStorage",
     "LLMLabeler",
     "LabelingResult",
+    "LabelingCache",
     "LexiconExpander",
     "SemanticCooccurrence",
     "SemanticNetwork",
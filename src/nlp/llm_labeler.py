@@ -5,15 +5,100 @@ Integrates with LLM APIs to generate semantic labels for characters.
 """
 
 import json
+import re
 import time
 import logging
-from typing import List, Dict, Optional, Tuple
+import hashlib
+import sqlite3
+import tempfile
+from dataclasses import asdict
+from itertools import islice
+from typing import Iterator, List, Dict, Optional, Tuple
 from dataclasses import dataclass
+from functools import lru_cache
 import os
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+SYSTEM_PROMPT = "你是一位語言學專家，專門研究中文地名語義。"
+
+# Providers that expose the OpenAI /v1/batches endpoint
+BATCH_API_PROVIDERS = ("openai",)
+
+# Pricing per 1M tokens (as of 2024)
+MODEL_PRICING = {
+    "gpt-4": {"input": 30.0, "output": 60.0},
+    "gpt-4-turbo": {"input": 10.0, "output": 30.0},
+    "gpt-3.5-turbo": {"input": 0.5, "output": 1.5},
+    "claude-3-opus": {"input": 15.0, "output": 75.0},
+    "claude-3-sonnet": {"input": 3.0, "output": 15.0},
+    "claude-3-haiku": {"input": 0.25, "output": 1.25},
+    "deepseek-chat": {"input": 0.14, "output": 0.28},
+}
+DEFAULT_PRICING = {"input": 1.0, "output": 2.0}
+
+# Body of the first ```json fence, or of any fence if none is tagged json
+_JSON_FENCE_RE = re.compile(r"```json(.*?)```", re.DOTALL)
+_FENCE_RE = re.compile(r"```(.*?)```", re.DOTALL)
+_JSON_START_RE = re.compile(r"[{\[]")
+
+_JSON_DECODER = json.JSONDecoder()
+
+
+def _json_loads(text: str):
+    """Parse JSON with orjson when installed, else the stdlib parser."""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(text)
+    return json.loads(text)
+
+
+@lru_cache(maxsize=4096)
+def _build_labeling_prompt(
+    char: str,
+    frequency: int,
+    example_villages: Tuple[str, ...],
+    similar_chars: Tuple[Tuple[str, float], ...],
+    existing_categories: Tuple[str, ...],
+) -> str:
+    """Format the single-character labeling prompt (memoized on its inputs)."""
+    similar_chars_str = ", ".join([f"{c}({s:.2f})" for c, s in similar_chars])
+    examples_str = ", ".join(example_villages)
+    categories_str = ", ".join(existing_categories)
+
+    prompt = f"""你是一位專門研究廣東省地名的語言學家。請為以下漢字分配語義類別。
+
+字符: {char}
+出現頻率: {frequency} 個村莊
+示例村名: {examples_str}
+相似字符: {similar_chars_str}
+
+現有類別:
+{categories_str}
+
+請分析這個字符的語義，並：
+1. 從現有類別中選擇最合適的類別，或建議新類別
+2. 提供信心分數 (0-1)
+3. 解釋你的推理
+4. 列出可能的替代類別
+
+請以JSON格式回答:
+{{
+    "category": "類別名稱",
+    "confidence": 0.95,
+    "reasoning": "推理過程",
+    "alternative_categories": ["替代1", "替代2"],
+    "is_new_category": false
+}}"""
+
+    return prompt
+
 
 @dataclass
 class LabelingResult:
@@ -26,6 +111,60 @@ class LabelingResult:
     is_new_category: bool
 
 
+class LabelingCache:
+    """
+    Persistent SQLite cache of LabelingResult objects keyed by prompt hash.
+
+    A hit means the exact same prompt was already answered by the same model,
+    so repeat runs skip the API call entirely.
+    """
+
+    def __init__(self, db_path: str):
+        """
+        Open (or create) the cache database.
+
+        Args:
+            db_path: Path to the SQLite cache file
+        """
+        parent = os.path.dirname(db_path)
+        if parent:
+            os.makedirs(parent, exist_ok=True)
+        self.conn = sqlite3.connect(db_path)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS llm_label_cache (
+                key TEXT PRIMARY KEY,
+                result_json TEXT NOT NULL
+            )
+        """)
+        self.conn.commit()
+
+    @staticmethod
+    def make_key(model: str, prompt: str) -> str:
+        """Hash a model name and prompt into a cache key."""
+        return hashlib.sha256(f"{model}\0{prompt}".encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[LabelingResult]:
+        """Return the cached result for a key, or None on a miss."""
+        row = self.conn.execute(
+            "SELECT result_json FROM llm_label_cache WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        return LabelingResult(**_json_loads(row[0]))
+
+    def put(self, key: str, result: LabelingResult):
+        """Store a result under a key."""
+        self.conn.execute(
+            "INSERT OR REPLACE INTO llm_label_cache (key, result_json) VALUES (?, ?)",
+            (key, json.dumps(asdict(result), ensure_ascii=False)),
+        )
+        self.conn.commit()
+
+    def close(self):
+        """Close the cache database."""
+        self.conn.close()
+
+
 class LLMLabeler:
     """
     Integrates with LLM APIs to label characters semantically.
@@ -45,6 +184,10 @@ class LLMLabeler:
         base_url: Optional[str] = None,
         temperature: float = 0.0,
         max_tokens: int = 500,
+        cache_path: Optional[str] = None,
+        max_budget_usd: Optional[float] = None,
+        cache_discount: float = 0.9,
+        batch_discount: float = 0.5,
     ):
         """
         Initialize LLM labeler.
@@ -56,6 +199,10 @@ class LLMLabeler:
             base_url: Base URL for API (for local models)
             temperature: Sampling temperature (0 for deterministic)
             max_tokens: Maximum tokens in response
+            cache_path: SQLite file for the persistent result cache (None = no cache)
+            max_budget_usd: Stop batch labeling once actual spend exceeds this (None = no cap)
+            cache_discount: Fraction of the input price saved on provider-cached prompt tokens
+            batch_discount: Fraction of the price saved on Batch API requests
         """
         self.provider = provider
         self.model = model
@@ -75,6 +222,20 @@ class LLMLabeler:
         self.client = None
         self._initialize_client()
 
+        self.cache = LabelingCache(cache_path) if cache_path else None
+
+        # Actual token usage reported by the API
+        self.max_budget_usd = max_budget_usd
+        self.cache_discount = cache_discount
+        self.batch_discount = batch_discount
+        self.total_input_tokens = 0
+        self.total_output_tokens = 0
+        self.cached_tokens = 0
+        # Share of the totals above that went through the Batch API
+        self.batch_input_tokens = 0
+        self.batch_output_tokens = 0
+        self.batch_cached_tokens = 0
+
     def _initialize_client(self):
         """Initialize API client based on provider."""
         if self.provider == "openai":
@@ -133,36 +294,13 @@ class LLMLabeler:
         Returns:
             Formatted prompt string
         """
-        similar_chars_str = ", ".join([f"{c}({s:.2f})" for c, s in similar_chars[:10]])
-        examples_str = ", ".join(example_villages[:5])
-        categories_str = ", ".join(existing_categories)
-
-        prompt = f"""你是一位專門研究廣東省地名的語言學家。請為以下漢字分配語義類別。
-
-字符: {char}
-出現頻率: {frequency} 個村莊
-示例村名: {examples_str}
-相似字符: {similar_chars_str}
-
-現有類別:
-{categories_str}
-
-請分析這個字符的語義，並：
-1. 從現有類別中選擇最合適的類別，或建議新類別
-2. 提供信心分數 (0-1)
-3. 解釋你的推理
-4. 列出可能的替代類別
-
-請以JSON格式回答:
-{{
-    "category": "類別名稱",
-    "confidence": 0.95,
-    "reasoning": "推理過程",
-    "alternative_categories": ["替代1", "替代2"],
-    "is_new_category": false
-}}"""
-
-        return prompt
+        return _build_labeling_prompt(
+            char,
+            frequency,
+            tuple(example_villages[:5]),
+            tuple((c, float(score)) for c, score in similar_chars[:10]),
+            tuple(existing_categories),
+        )
 
     def label_character(
         self,
@@ -185,104 +323,707 @@ class LLMLabeler:
         Returns:
             LabelingResult or None if failed
         """
+        prompt = self.create_labeling_prompt(
+            char, frequency, example_villages, similar_chars, existing_categories
+        )
+
+        if self.cache is not None:
+            cached = self.cache.get(LabelingCache.make_key(self.model, prompt))
+            if cached is not None:
+                return cached
+
         if not self.client:
             logger.error("LLM client not initialized")
             return None
 
+        try:
+            content = self._complete(prompt)
+            if content is None:
+                return None
+
+            result_dict = self._parse_json_content(content)
+
+            result = self._result_from_dict(char, result_dict)
+            if self.cache is not None:
+                self.cache.put(LabelingCache.make_key(self.model, prompt), result)
+            return result
+
+        except Exception as e:
+            logger.error(f"Error labeling character '{char}': {e}")
+            return None
+
+    def _cache_key(self, char_data: Dict, existing_categories: List[str]) -> str:
+        """Cache key of the single-character prompt for a characters_data entry."""
         prompt = self.create_labeling_prompt(
-            char, frequency, example_villages, similar_chars, existing_categories
+            char_data["char"],
+            char_data["frequency"],
+            char_data["example_villages"],
+            char_data["similar_chars"],
+            existing_categories,
         )
+        return LabelingCache.make_key(self.model, prompt)
+
+    def _complete(self, prompt: str, max_tokens: Optional[int] = None) -> Optional[str]:
+        """
+        Send a prompt to the configured provider and return the raw text reply.
+
+        Args:
+            prompt: User prompt
+            max_tokens: Override for the response token budget
+
+        Returns:
+            Response text, or None for an unsupported provider
+        """
+        max_tokens = max_tokens or self.max_tokens
+
+        if self.provider in ["openai", "deepseek", "local"]:
+            response = self.client.chat.completions.create(
+                **self._chat_request_body(prompt, max_tokens)
+            )
+            self._record_usage(response)
+            return response.choices[0].message.content
+
+        elif self.provider == "anthropic":
+            response = self.client.messages.create(
+                model=self.model,
+                max_tokens=max_tokens,
+                temperature=self.temperature,
+                messages=[
+                    {"role": "user", "content": prompt}
+                ]
+            )
+            self._record_usage(response)
+            return response.content[0].text
+
+        logger.error(f"Unsupported provider: {self.provider}")
+        return None
+
+    def _record_usage(self, response):
+        """Add the token usage reported with a response to the running totals."""
+        usage = getattr(response, "usage", None)
+        if usage is None:
+            return
+
+        if self.provider == "anthropic":
+            input_tokens = getattr(usage, "input_tokens", 0) or 0
+            output_tokens = getattr(usage, "output_tokens", 0) or 0
+            cached = getattr(usage, "cache_read_input_tokens", 0) or 0
+            # Anthropic reports cache reads separately from input_tokens
+            input_tokens += cached
+        else:
+            input_tokens = getattr(usage, "prompt_tokens", 0) or 0
+            output_tokens = getattr(usage, "completion_tokens", 0) or 0
+            details = getattr(usage, "prompt_tokens_details", None)
+            cached = (getattr(details, "cached_tokens", 0) or 0) if details else 0
+
+        self.total_input_tokens += input_tokens
+        self.total_output_tokens += output_tokens
+        self.cached_tokens += cached
+
+    def _record_batch_usage(self, usage: Optional[Dict]):
+        """Add the usage of one Batch API output line to the running totals."""
+        if not usage:
+            return
+
+        input_tokens = usage.get("prompt_tokens", 0) or 0
+        output_tokens = usage.get("completion_tokens", 0) or 0
+        cached = (usage.get("prompt_tokens_details") or {}).get("cached_tokens", 0) or 0
+
+        self.total_input_tokens += input_tokens
+        self.total_output_tokens += output_tokens
+        self.cached_tokens += cached
+        self.batch_input_tokens += input_tokens
+        self.batch_output_tokens += output_tokens
+        self.batch_cached_tokens += cached
+
+    def get_spent_usd(self) -> float:
+        """
+        Compute the actual spend so far from recorded token usage.
+
+        Batch API tokens are priced at the batch discount.
+
+        Returns:
+            Spend in USD
+        """
+        sync_cost = self._token_cost(
+            self.total_input_tokens - self.batch_input_tokens,
+            self.cached_tokens - self.batch_cached_tokens,
+            self.total_output_tokens - self.batch_output_tokens,
+        )
+        batch_cost = self._token_cost(
+            self.batch_input_tokens, self.batch_cached_tokens, self.batch_output_tokens
+        )
+        return sync_cost + batch_cost * (1 - self.batch_discount)
+
+    def _token_cost(self, input_tokens: int, cached_tokens: int, output_tokens: int) -> float:
+        """List-price cost in USD of the given token counts."""
+        model_pricing = MODEL_PRICING.get(self.model, DEFAULT_PRICING)
+
+        uncached_input = input_tokens - cached_tokens
+        input_cost = (
+            uncached_input + cached_tokens * (1 - self.cache_discount)
+        ) / 1_000_000 * model_pricing["input"]
+        output_cost = output_tokens / 1_000_000 * model_pricing["output"]
+
+        return input_cost + output_cost
+
+    def _over_budget(self) -> bool:
+        """Whether actual spend has passed max_budget_usd."""
+        return self.max_budget_usd is not None and self.get_spent_usd() > self.max_budget_usd
+
+    def _chat_request_body(self, prompt: str, max_tokens: int) -> Dict:
+        """Build an OpenAI-compatible chat completions request body."""
+        return {
+            "model": self.model,
+            "messages": [
+                {"role": "system", "content": SYSTEM_PROMPT},
+                {"role": "user", "content": prompt}
+            ],
+            "temperature": self.temperature,
+            "max_tokens": max_tokens,
+        }
+
+    @staticmethod
+    def _parse_json_content(content: str):
+        """
+        Parse the JSON in a reply, ignoring surrounding text.
+
+        A fenced code block is used when present. Otherwise the first object,
+        or array of objects, that decodes from a '{' or '[' is returned, so
+        bracketed prose before it and any text after it are skipped.
+        """
+        match = _JSON_FENCE_RE.search(content) or _FENCE_RE.search(content)
+        if match:
+            return _json_loads(match.group(1).strip())
+
+        for start in _JSON_START_RE.finditer(content):
+            try:
+                value = _JSON_DECODER.raw_decode(content, start.start())[0]
+            except ValueError:
+                continue
+            if isinstance(value, dict) or (
+                isinstance(value, list) and all(isinstance(item, dict) for item in value)
+            ):
+                return value
+        return _json_loads(content)
+
+    @staticmethod
+    def _result_from_dict(char: str, result_dict: Dict) -> LabelingResult:
+        """Build a LabelingResult from a parsed JSON object."""
+        return LabelingResult(
+            char=char,
+            category=result_dict["category"],
+            confidence=result_dict["confidence"],
+            reasoning=result_dict["reasoning"],
+            alternative_categories=result_dict.get("alternative_categories", []),
+            is_new_category=result_dict.get("is_new_category", False),
+        )
+
+    def create_batch_labeling_prompt(
+        self,
+        chars_data: List[Dict],
+        existing_categories: List[str],
+    ) -> str:
+        """
+        Create a single prompt that labels several characters at once.
+
+        Args:
+            chars_data: List of dicts with char, frequency, example_villages, similar_chars
+            existing_categories: Existing semantic categories
+
+        Returns:
+            Formatted prompt string
+        """
+        categories_str = ", ".join(existing_categories)
+
+        entries = []
+        for i, char_data in enumerate(chars_data, 1):
+            similar_chars_str = ", ".join(
+                [f"{c}({s:.2f})" for c, s in char_data["similar_chars"][:10]]
+            )
+            examples_str = ", ".join(char_data["example_villages"][:5])
+            entries.append(
+                f"{i}. 字符: {char_data['char']}\n"
+                f"   出現頻率: {char_data['frequency']} 個村莊\n"
+                f"   示例村名: {examples_str}\n"
+                f"   相似字符: {similar_chars_str}"
+            )
+        entries_str = "\n".join(entries)
+
+        prompt = f"""你是一位專門研究廣東省地名的語言學家。請為以下 {len(chars_data)} 個漢字分別分配語義類別。
+
+{entries_str}
+
+現有類別:
+{categories_str}
+
+請逐一分析每個字符的語義，並：
+1. 從現有類別中選擇最合適的類別，或建議新類別
+2. 提供信心分數 (0-1)
+3. 解釋你的推理
+4. 列出可能的替代類別
+
+請以JSON格式回答，results 中每個字符一項，並在 char 欄位填寫對應字符:
+{{
+    "results": [
+        {{
+            "char": "字符",
+            "category": "類別名稱",
+            "confidence": 0.95,
+            "reasoning": "推理過程",
+            "alternative_categories": ["替代1", "替代2"],
+            "is_new_category": false
+        }}
+    ]
+}}"""
+
+        return prompt
+
+    def label_characters_in_one_call(
+        self,
+        chars_data: List[Dict],
+        existing_categories: List[str],
+    ) -> Dict[str, LabelingResult]:
+        """
+        Label several characters with a single API call.
+
+        Args:
+            chars_data: List of dicts with char, frequency, example_villages, similar_chars
+            existing_categories: Existing semantic categories
+
+        Returns:
+            Mapping of char -> LabelingResult for every character the model
+            answered; characters missing from the reply are simply absent
+        """
+        if not self.client:
+            logger.error("LLM client not initialized")
+            return {}
+
+        prompt = self.create_batch_labeling_prompt(chars_data, existing_categories)
+        requested = {char_data["char"] for char_data in chars_data}
 
         try:
-            if self.provider in ["openai", "deepseek", "local"]:
-                response = self.client.chat.completions.create(
-                    model=self.model,
-                    messages=[
-                        {"role": "system", "content": "你是一位語言學專家，專門研究中文地名語義。"},
-                        {"role": "user", "content": prompt}
-                    ],
-                    temperature=self.temperature,
-                    max_tokens=self.max_tokens,
-                )
-                content = response.choices[0].message.content
-
-            elif self.provider == "anthropic":
-                response = self.client.messages.create(
-                    model=self.model,
-                    max_tokens=self.max_tokens,
-                    temperature=self.temperature,
-                    messages=[
-                        {"role": "user", "content": prompt}
-                    ]
+            content = self._complete(prompt, max_tokens=self.max_tokens * len(chars_data))
+            if content is None:
+                return {}
+
+            parsed = self._parse_json_content(content)
+            items = parsed.get("results", []) if isinstance(parsed, dict) else parsed
+
+        except Exception as e:
+            logger.error(f"Error labeling batch {''.join(sorted(requested))}: {e}")
+            return {}
+
+        results = {}
+        for item in items:
+            char = item.get("char") if isinstance(item, dict) else None
+            if char not in requested or char in results:
+                continue
+            try:
+                results[char] = self._result_from_dict(char, item)
+            except (KeyError, TypeError) as e:
+                logger.warning(f"Malformed batch entry for '{char}': {e}")
+
+        if len(results) != len(requested):
+            logger.warning(
+                f"Batch reply covered {len(results)}/{len(requested)} characters"
+            )
+
+        return results
+
+    def iter_label_characters(
+        self,
+        characters_data: List[Dict],
+        existing_categories: List[str],
+        rate_limit_delay: float = 1.0,
+        batch_size: int = 10,
+        use_batch_api: bool = False,
+        dedup_threshold: Optional[float] = None,
+    ) -> Iterator[LabelingResult]:
+        """
+        Label multiple characters, yielding each result as soon as it is ready.
+
+        Characters already in the persistent cache are yielded first without
+        an API call. The rest are packed ``batch_size`` at a time into one
+        prompt; any character missing from a batch reply is retried
+        individually. Results of each batch are yielded in input order.
+
+        Args:
+            characters_data: List of dicts with char, frequency, examples, similar_chars
+            existing_categories: Existing semantic categories
+            rate_limit_delay: Delay between API calls (seconds)
+            batch_size: Characters per API call (1 = one call per character)
+            use_batch_api: Submit through the asynchronous OpenAI Batch API
+                (discounted, no RPM throttling) instead of synchronous calls
+            dedup_threshold: If set, characters whose embedding similarity to an
+                earlier character is at least this value are not sent to the
+                LLM; they inherit that character's label (None = label all)
+
+        Yields:
+            LabelingResult objects
+        """
+        if dedup_threshold is None:
+            yield from self._iter_label_characters(
+                characters_data, existing_categories, rate_limit_delay, batch_size, use_batch_api
+            )
+            return
+
+        groups = self._group_similar_characters(characters_data, dedup_threshold)
+        representatives = [d for d in characters_data if d["char"] in groups]
+        logger.info(
+            f"Deduplicated {len(characters_data)} characters to "
+            f"{len(representatives)} representatives (threshold={dedup_threshold})"
+        )
+
+        for result in self._iter_label_characters(
+            representatives, existing_categories, rate_limit_delay, batch_size, use_batch_api
+        ):
+            yield result
+            for member in groups[result.char]:
+                yield LabelingResult(
+                    char=member,
+                    category=result.category,
+                    confidence=result.confidence * 0.9,
+                    reasoning=f"{result.reasoning} (cluster-propagated from {result.char})",
+                    alternative_categories=list(result.alternative_categories),
+                    is_new_category=result.is_new_category,
                 )
-                content = response.content[0].text
 
+    @staticmethod
+    def _group_similar_characters(
+        characters_data: List[Dict], threshold: float
+    ) -> Dict[str, List[str]]:
+        """
+        Greedily group characters by their embedding neighbourhoods.
+
+        Each character joins the first earlier representative it is at least
+        ``threshold`` similar to (according to either character's
+        similar_chars list), otherwise it becomes a representative itself.
+
+        Args:
+            characters_data: List of dicts with char and similar_chars
+            threshold: Minimum cosine similarity to share a label
+
+        Returns:
+            Mapping of representative char -> member chars
+        """
+        similarity = {}
+        for char_data in characters_data:
+            for other, score in char_data["similar_chars"]:
+                pair = frozenset((char_data["char"], other))
+                similarity[pair] = max(similarity.get(pair, score), score)
+
+        groups = {}
+        for char_data in characters_data:
+            char = char_data["char"]
+            for representative in groups:
+                if similarity.get(frozenset((char, representative)), 0.0) >= threshold:
+                    groups[representative].append(char)
+                    break
             else:
-                logger.error(f"Unsupported provider: {self.provider}")
-                return None
+                groups[char] = []
+
+        return groups
+
+    def _iter_label_characters(
+        self,
+        characters_data: List[Dict],
+        existing_categories: List[str],
+        rate_limit_delay: float,
+        batch_size: int,
+        use_batch_api: bool,
+    ) -> Iterator[LabelingResult]:
+        """Label every character in characters_data (see iter_label_characters)."""
+        total = len(characters_data)
+        n_labeled = 0
+        cached_chars = set()
+
+        if self.cache is not None:
+            for char_data in characters_data:
+                cached = self.cache.get(self._cache_key(char_data, existing_categories))
+                if cached is not None:
+                    cached_chars.add(char_data["char"])
+                    n_labeled += 1
+                    yield cached
+            if cached_chars:
+                logger.info(f"Cache hits: {len(cached_chars)}/{total} characters")
+        pending = [d for d in characters_data if d["char"] not in cached_chars]
 
-            # Parse JSON response
-            # Extract JSON from markdown code blocks if present
-            if "```json" in content:
-                content = content.split("```json")[1].split("```")[0].strip()
-            elif "```" in content:
-                content = content.split("```")[1].split("```")[0].strip()
-
-            result_dict = json.loads(content)
-
-            return LabelingResult(
-                char=char,
-                category=result_dict["category"],
-                confidence=result_dict["confidence"],
-                reasoning=result_dict["reasoning"],
-                alternative_categories=result_dict.get("alternative_categories", []),
-                is_new_category=result_dict.get("is_new_category", False),
+        if pending and use_batch_api and self.provider not in BATCH_API_PROVIDERS:
+            logger.warning(
+                f"Batch API not supported for provider '{self.provider}', "
+                f"falling back to synchronous labeling"
             )
+            use_batch_api = False
 
-        except Exception as e:
-            logger.error(f"Error labeling character '{char}': {e}")
-            return None
+        if pending and use_batch_api and self.max_budget_usd is not None:
+            estimate = (
+                self.estimate_cost(len(pending))["total_cost_usd"] * (1 - self.batch_discount)
+            )
+            remaining = self.max_budget_usd - self.get_spent_usd()
+            if estimate > remaining:
+                logger.warning(
+                    f"Estimated batch cost ${estimate:.4f} exceeds the remaining budget "
+                    f"${remaining:.4f}, labeling synchronously until the budget is reached"
+                )
+                use_batch_api = False
+
+        if pending and use_batch_api:
+            batch_id = self.submit_batch_job(pending, existing_categories)
+            batch_labeled = {r.char: r for r in self.poll_batch(batch_id)}
+            self._cache_results(pending, existing_categories, batch_labeled)
+            for char_data in pending:
+                if char_data["char"] in batch_labeled:
+                    n_labeled += 1
+                    yield batch_labeled[char_data["char"]]
+
+            # Characters the batch errored on or did not return go through
+            # the synchronous path below
+            pending = [d for d in pending if d["char"] not in batch_labeled]
+            if pending:
+                logger.warning(
+                    f"Batch left {len(pending)} characters unlabeled, "
+                    f"retrying them synchronously"
+                )
+
+        batch_size = max(1, batch_size)
+        iterator = iter(pending)
+        done = 0
+
+        while True:
+            if self._over_budget():
+                logger.warning(
+                    f"Budget exceeded (${self.get_spent_usd():.4f} > "
+                    f"${self.max_budget_usd:.4f}), stopping after {done}/{len(pending)} characters"
+                )
+                break
+
+            chunk = list(islice(iterator, batch_size))
+            if not chunk:
+                break
+
+            logger.info(
+                f"Labeling characters {done+1}-{done+len(chunk)}/{len(pending)}: "
+                f"{''.join(d['char'] for d in chunk)}"
+            )
+
+            if len(chunk) == 1:
+                chunk_labeled = {}
+                missing = chunk
+            else:
+                chunk_labeled = self.label_characters_in_one_call(chunk, existing_categories)
+                self._cache_results(chunk, existing_categories, chunk_labeled)
+                missing = [d for d in chunk if d["char"] not in chunk_labeled]
+
+            for char_data in missing:
+                if self._over_budget():
+                    break
+                if len(chunk) > 1:
+                    time.sleep(rate_limit_delay)
+                result = self.label_character(
+                    char=char_data["char"],
+                    frequency=char_data["frequency"],
+                    example_villages=char_data["example_villages"],
+                    similar_chars=char_data["similar_chars"],
+                    existing_categories=existing_categories,
+                )
+                if result:
+                    chunk_labeled[char_data["char"]] = result
+
+            for char_data in chunk:
+                if char_data["char"] in chunk_labeled:
+                    n_labeled += 1
+                    yield chunk_labeled[char_data["char"]]
+
+            done += len(chunk)
+
+            # Rate limiting
+            if done < len(pending):
+                time.sleep(rate_limit_delay)
+
+        logger.info(f"Labeled {n_labeled}/{total} characters")
+        logger.info(
+            f"Token usage: {self.total_input_tokens} input "
+            f"({self.cached_tokens} cached), {self.total_output_tokens} output, "
+            f"${self.get_spent_usd():.4f} spent"
+        )
 
     def batch_label_characters(
         self,
         characters_data: List[Dict],
         existing_categories: List[str],
         rate_limit_delay: float = 1.0,
+        batch_size: int = 10,
+        use_batch_api: bool = False,
+        dedup_threshold: Optional[float] = None,
     ) -> List[LabelingResult]:
         """
         Label multiple characters in batch.
 
+        Collects iter_label_characters into a list in input order.
+
         Args:
             characters_data: List of dicts with char, frequency, examples, similar_chars
             existing_categories: Existing semantic categories
             rate_limit_delay: Delay between API calls (seconds)
+            batch_size: Characters per API call (1 = one call per character)
+            use_batch_api: Submit through the asynchronous OpenAI Batch API
+            dedup_threshold: Similarity above which characters share one label
 
         Returns:
             List of LabelingResult objects
         """
-        results = []
+        order = {d["char"]: i for i, d in enumerate(characters_data)}
+        results = list(self.iter_label_characters(
+            characters_data,
+            existing_categories,
+            rate_limit_delay=rate_limit_delay,
+            batch_size=batch_size,
+            use_batch_api=use_batch_api,
+            dedup_threshold=dedup_threshold,
+        ))
+        results.sort(key=lambda r: order[r.char])
+        return results
 
-        for i, char_data in enumerate(characters_data):
-            logger.info(f"Labeling character {i+1}/{len(characters_data)}: {char_data['char']}")
+    def _cache_results(
+        self,
+        chars_data: List[Dict],
+        existing_categories: List[str],
+        labeled: Dict[str, LabelingResult],
+    ):
+        """Store freshly labeled characters in the persistent cache."""
+        if self.cache is None:
+            return
+        for char_data in chars_data:
+            result = labeled.get(char_data["char"])
+            if result is not None:
+                self.cache.put(self._cache_key(char_data, existing_categories), result)
 
-            result = self.label_character(
-                char=char_data["char"],
-                frequency=char_data["frequency"],
-                example_villages=char_data["example_villages"],
-                similar_chars=char_data["similar_chars"],
-                existing_categories=existing_categories,
-            )
+    def submit_batch_job(
+        self,
+        characters_data: List[Dict],
+        existing_categories: List[str],
+    ) -> str:
+        """
+        Submit one labeling request per character to the OpenAI Batch API.
 
-            if result:
-                results.append(result)
+        Args:
+            characters_data: List of dicts with char, frequency, examples, similar_chars
+            existing_categories: Existing semantic categories
 
-            # Rate limiting
-            if i < len(characters_data) - 1:
-                time.sleep(rate_limit_delay)
+        Returns:
+            Batch job ID
+        """
+        if self.provider not in BATCH_API_PROVIDERS:
+            raise ValueError(f"Batch API not supported for provider: {self.provider}")
+        if not self.client:
+            raise RuntimeError("LLM client not initialized")
+
+        with tempfile.NamedTemporaryFile(
+            "w", suffix=".jsonl", encoding="utf-8", delete=False
+        ) as f:
+            for char_data in characters_data:
+                prompt = self.create_labeling_prompt(
+                    char_data["char"],
+                    char_data["frequency"],
+                    char_data["example_villages"],
+                    char_data["similar_chars"],
+                    existing_categories,
+                )
+                request = {
+                    "custom_id": char_data["char"],
+                    "method": "POST",
+                    "url": "/v1/chat/completions",
+                    "body": self._chat_request_body(prompt, self.max_tokens),
+                }
+                f.write(json.dumps(request, ensure_ascii=False) + "\n")
+            input_path = f.name
+
+        try:
+            with open(input_path, "rb") as f:
+                input_file = self.client.files.create(file=f, purpose="batch")
+        finally:
+            os.remove(input_path)
+
+        batch = self.client.batches.create(
+            input_file_id=input_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h",
+        )
+        logger.info(f"Submitted batch {batch.id} with {len(characters_data)} requests")
+        return batch.id
+
+    def poll_batch(
+        self,
+        batch_id: str,
+        poll_interval: float = 30.0,
+        timeout: Optional[float] = None,
+    ) -> List[LabelingResult]:
+        """
+        Wait for a Batch API job to finish and parse its output.
 
-        logger.info(f"Labeled {len(results)}/{len(characters_data)} characters")
+        Args:
+            batch_id: Batch job ID returned by submit_batch_job
+            poll_interval: Seconds between status checks
+            timeout: Give up after this many seconds (None = wait indefinitely)
+
+        Returns:
+            List of LabelingResult objects for successful requests
+        """
+        start = time.time()
+
+        while True:
+            batch = self.client.batches.retrieve(batch_id)
+            if batch.status in ("completed", "failed", "expired", "cancelled"):
+                break
+            if timeout is not None and time.time() - start > timeout:
+                raise TimeoutError(f"Batch {batch_id} still {batch.status} after {timeout}s")
+            logger.info(f"Batch {batch_id} status: {batch.status}")
+            time.sleep(poll_interval)
+
+        if getattr(batch, "error_file_id", None):
+            self._log_batch_errors(batch_id, batch.error_file_id)
+
+        if batch.status != "completed" or not batch.output_file_id:
+            logger.error(f"Batch {batch_id} ended with status: {batch.status}")
+            return []
+
+        output = self.client.files.content(batch.output_file_id).text
+
+        results = []
+        for line in output.splitlines():
+            if not line.strip():
+                continue
+            record = _json_loads(line)
+            char = record["custom_id"]
+            try:
+                body = record["response"]["body"]
+                self._record_batch_usage(body.get("usage"))
+                content = body["choices"][0]["message"]["content"]
+                results.append(
+                    self._result_from_dict(char, self._parse_json_content(content))
+                )
+            except Exception as e:
+                logger.error(f"Error parsing batch result for '{char}': {e}")
+
+        logger.info(f"Batch {batch_id}: parsed {len(results)} results")
         return results
 
+    def _log_batch_errors(self, batch_id: str, error_file_id: str):
+        """Log each failed request listed in a Batch API error file."""
+        errors = self.client.files.content(error_file_id).text
+
+        n_errors = 0
+        for line in errors.splitlines():
+            if not line.strip():
+                continue
+            record = _json_loads(line)
+            error = record.get("error") or (record.get("response") or {}).get("body", {}).get("error")
+            logger.warning(f"Batch request for '{record.get('custom_id')}' failed: {error}")
+            n_errors += 1
+
+        logger.warning(f"Batch {batch_id}: {n_errors} requests failed")
+
     def estimate_cost(
         self,
         num_characters: int,
@@ -300,18 +1041,7 @@ class LLMLabeler:
         Returns:
             Dictionary with cost estimates
         """
-        # Pricing per 1M tokens (as of 2024)
-        pricing = {
-            "gpt-4": {"input": 30.0, "output": 60.0},
-            "gpt-4-turbo": {"input": 10.0, "output": 30.0},
-            "gpt-3.5-turbo": {"input": 0.5, "output": 1.5},
-            "claude-3-opus": {"input": 15.0, "output": 75.0},
-            "claude-3-sonnet": {"input": 3.0, "output": 15.0},
-            "claude-3-haiku": {"input": 0.25, "output": 1.25},
-            "deepseek-chat": {"input": 0.14, "output": 0.28},
-        }
-
-        model_pricing = pricing.get(self.model, {"input": 1.0, "output": 2.0})
+        model_pricing = MODEL_PRICING.get(self.model, DEFAULT_PRICING)
 
         total_input_tokens = num_characters * avg_prompt_tokens
         total_output_tokens = num_characters * avg_completion_tokens
@@ -6,15 +6,75 @@ Analyzes how semantic categories co-occur in village names.
 
 import logging
 import sqlite3
-from typing import Dict, List, Tuple, Set
-from collections import defaultdict, Counter
+from typing import Dict, List, Optional, Tuple, Set
+from collections import Counter
 import numpy as np
 import pandas as pd
-from scipy.stats import chi2_contingency
+from scipy.sparse import csr_matrix
+from scipy.stats import chi2 as chi2_dist
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+CREATE_COOCCURRENCE_SQL = """
+CREATE TABLE IF NOT EXISTS semantic_cooccurrence (
+    run_id TEXT NOT NULL,
+    category1 TEXT NOT NULL,
+    category2 TEXT NOT NULL,
+    cooccurrence_count INTEGER NOT NULL,
+    pmi REAL NOT NULL,
+    is_significant INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    PRIMARY KEY (run_id, category1, category2)
+)
+"""
+
+INSERT_COOCCURRENCE_SQL = """
+INSERT OR REPLACE INTO semantic_cooccurrence
+VALUES (?, ?, ?, ?, ?, ?, ?)
+"""
+
+
+if NUMBA_AVAILABLE:
+    @njit
+    def _cooccurrence_kernel(cat_codes, offsets, n_categories):
+        """
+        Count category co-occurrence over villages stored as a flat buffer.
+
+        Args:
+            cat_codes: Category index per character (-1 = no category)
+            offsets: Start offset of each village in cat_codes (length n+1)
+            n_categories: Number of categories
+
+        Returns:
+            (n_categories x n_categories) int64 co-occurrence matrix
+        """
+        cooccurrence = np.zeros((n_categories, n_categories), dtype=np.int64)
+        present = np.zeros(n_categories, dtype=np.bool_)
+        members = np.empty(n_categories, dtype=np.int64)
+
+        for v in range(len(offsets) - 1):
+            n_members = 0
+            for pos in range(offsets[v], offsets[v + 1]):
+                cat = cat_codes[pos]
+                if cat >= 0 and not present[cat]:
+                    present[cat] = True
+                    members[n_members] = cat
+                    n_members += 1
+
+            for a in range(n_members):
+                for b in range(n_members):
+                    cooccurrence[members[a], members[b]] += 1
+                present[members[a]] = False
+
+        return cooccurrence
+
 
 class SemanticCooccurrence:
     """
@@ -31,16 +91,46 @@ class SemanticCooccurrence:
         """
         self.db_path = db_path
         self.lexicon = lexicon
+        self.categories = list(lexicon.keys())
+        self._cat_idx = {cat: i for i, cat in enumerate(self.categories)}
         self.char_to_category = {}
-        for category, chars in lexicon.items():
+        # Codepoint -> category index (-1 = none) for BMP characters, with a
+        # small dict for the rare characters outside the BMP
+        self.char_to_cat_idx = np.full(0x10000, -1, dtype=np.int16)
+        self.astral_char_to_cat_idx = {}
+        for cat_idx, (category, chars) in enumerate(lexicon.items()):
             for char in chars:
                 self.char_to_category[char] = category
-
-        self.cooccurrence_matrix = None
-        self.pmi_matrix = None
+                if ord(char) < 0x10000:
+                    self.char_to_cat_idx[ord(char)] = cat_idx
+                else:
+                    self.astral_char_to_cat_idx[ord(char)] = cat_idx
+
+        # Results are kept as plain arrays indexed like self.categories and
+        # only wrapped in DataFrames at the public boundary
+        self._cooccurrence = None
+        self._counts = None
+        self._pmi = None
         self.category_counts = None
         self.total_villages = 0
 
+        # Write connection, opened lazily and reused across save_to_database calls
+        self._conn = None
+
+    @property
+    def cooccurrence_matrix(self) -> Optional[pd.DataFrame]:
+        """Co-occurrence counts as a category x category DataFrame."""
+        if self._cooccurrence is None:
+            return None
+        return pd.DataFrame(self._cooccurrence, index=self.categories, columns=self.categories)
+
+    @property
+    def pmi_matrix(self) -> Optional[pd.DataFrame]:
+        """PMI values as a category x category DataFrame."""
+        if self._pmi is None:
+            return None
+        return pd.DataFrame(self._pmi, index=self.categories, columns=self.categories)
+
     def analyze_villages(self, villages_df: pd.DataFrame, village_col: str = "自然村"):
         """
         Analyze semantic co-occurrence in village names.
@@ -51,55 +141,106 @@ class SemanticCooccurrence:
         """
         logger.info(f"Analyzing {len(villages_df)} villages for semantic co-occurrence...")
 
-        # Initialize counters
-        categories = list(self.lexicon.keys())
+        categories = self.categories
         n_categories = len(categories)
 
-        # Category counts (how many villages contain each category)
-        category_counts = Counter()
+        villages = villages_df[village_col].dropna().to_numpy(dtype=object)
+        names = villages[villages != ""].tolist()
+        cat_codes, offsets = self._encode_villages(names)
+
+        if not names:
+            cooccurrence = np.zeros((n_categories, n_categories), dtype=np.int64)
+        elif n_categories <= 64:
+            cooccurrence = self._bitmask_cooccurrence(cat_codes, offsets, n_categories)
+        elif NUMBA_AVAILABLE:
+            cooccurrence = _cooccurrence_kernel(cat_codes, offsets, n_categories)
+        else:
+            # Village x category membership (one entry per village/category pair)
+            village_ids = np.repeat(np.arange(len(names)), np.diff(offsets))
+            known = cat_codes >= 0
+            membership = csr_matrix(
+                (np.ones(int(known.sum()), dtype=np.int32),
+                 (village_ids[known], cat_codes[known])),
+                shape=(len(names), n_categories),
+            )
+            membership.data[:] = 1
+            cooccurrence = (membership.T @ membership).toarray()
+
+        # Co-occurrence counts (how many villages contain both categories);
+        # the diagonal is the per-category village count
+        counts = np.diag(cooccurrence)
 
-        # Co-occurrence counts (how many villages contain both categories)
-        cooccurrence_counts = defaultdict(int)
+        self.total_villages = len(villages_df)
+        self._cooccurrence = cooccurrence.astype(np.int64)
+        self._counts = counts.astype(np.int64)
+        self._pmi = None
+        self.category_counts = Counter(
+            {cat: int(count) for cat, count in zip(categories, counts) if count > 0}
+        )
 
-        # Process each village
-        for village_name in villages_df[village_col]:
-            if pd.isna(village_name) or not village_name:
-                continue
+        logger.info(f"Processed {self.total_villages} villages")
+        logger.info(f"Found {len(self.category_counts)} categories with occurrences")
 
-            # Find categories present in this village
-            categories_in_village = set()
-            for char in village_name:
-                if char in self.char_to_category:
-                    categories_in_village.add(self.char_to_category[char])
+        return self.cooccurrence_matrix
 
-            # Update category counts
-            for cat in categories_in_village:
-                category_counts[cat] += 1
+    def _encode_villages(self, names: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Flatten village names into per-character category codes.
 
-            # Update co-occurrence counts
-            cats_list = list(categories_in_village)
-            for i, cat1 in enumerate(cats_list):
-                for cat2 in cats_list[i:]:  # Include self-cooccurrence
-                    pair = tuple(sorted([cat1, cat2]))
-                    cooccurrence_counts[pair] += 1
+        Args:
+            names: Non-empty village names
 
-        self.total_villages = len(villages_df)
-        self.category_counts = category_counts
+        Returns:
+            (cat_codes, offsets): category index per character (-1 for
+            characters outside the lexicon, in lexicon order) and the start
+            offset of each village, with offsets[-1] == len(cat_codes)
+        """
+        codepoints = np.frombuffer("".join(names).encode("utf-32-le"), dtype="<u4")
+
+        in_bmp = codepoints < 0x10000
+        cat_codes = np.full(len(codepoints), -1, dtype=np.int16)
+        cat_codes[in_bmp] = self.char_to_cat_idx[codepoints[in_bmp]]
+        if self.astral_char_to_cat_idx:
+            for pos in np.flatnonzero(~in_bmp):
+                cat_codes[pos] = self.astral_char_to_cat_idx.get(int(codepoints[pos]), -1)
+
+        offsets = np.zeros(len(names) + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum([len(name) for name in names])
+
+        return cat_codes, offsets
+
+    @staticmethod
+    def _bitmask_cooccurrence(
+        cat_codes: np.ndarray, offsets: np.ndarray, n_categories: int
+    ) -> np.ndarray:
+        """
+        Count co-occurrence for up to 64 categories using uint64 bitmasks.
+
+        Each village's category set is OR-reduced into one bitmask; only the
+        distinct masks (usually a few hundred) are expanded into the matrix,
+        weighted by how many villages share them.
 
-        # Build co-occurrence matrix
-        self.cooccurrence_matrix = pd.DataFrame(
-            0, index=categories, columns=categories, dtype=int
+        Args:
+            cat_codes: Category index per character (-1 = no category)
+            offsets: Start offset of each village in cat_codes (length n+1)
+            n_categories: Number of categories (<= 64)
+
+        Returns:
+            (n_categories x n_categories) int64 co-occurrence matrix
+        """
+        char_bits = np.zeros(len(cat_codes), dtype=np.uint64)
+        known = cat_codes >= 0
+        char_bits[known] = np.left_shift(
+            np.uint64(1), cat_codes[known].astype(np.uint64)
         )
 
-        for (cat1, cat2), count in cooccurrence_counts.items():
-            self.cooccurrence_matrix.loc[cat1, cat2] = count
-            if cat1 != cat2:
-                self.cooccurrence_matrix.loc[cat2, cat1] = count
+        village_bits = np.bitwise_or.reduceat(char_bits, offsets[:-1])
+        patterns, pattern_counts = np.unique(village_bits, return_counts=True)
 
-        logger.info(f"Processed {self.total_villages} villages")
-        logger.info(f"Found {len(category_counts)} categories with occurrences")
+        bit_positions = np.arange(n_categories, dtype=np.uint64)
+        unpacked = ((patterns[:, None] >> bit_positions) & np.uint64(1)).astype(np.int64)
 
-        return self.cooccurrence_matrix
+        return unpacked.T @ (unpacked * pattern_counts[:, None])
 
     def compute_pmi(self) -> pd.DataFrame:
         """
@@ -110,40 +251,23 @@ class SemanticCooccurrence:
         Returns:
             DataFrame with PMI values
         """
-        if self.cooccurrence_matrix is None:
+        if self._cooccurrence is None:
             raise ValueError("Must call analyze_villages() first")
 
         logger.info("Computing PMI for category pairs...")
 
-        categories = self.cooccurrence_matrix.index
-        pmi_matrix = pd.DataFrame(
-            0.0, index=categories, columns=categories, dtype=float
-        )
-
-        for cat1 in categories:
-            for cat2 in categories:
-                # Get counts
-                cooccur_count = self.cooccurrence_matrix.loc[cat1, cat2]
-                cat1_count = self.category_counts.get(cat1, 0)
-                cat2_count = self.category_counts.get(cat2, 0)
-
-                if cooccur_count == 0 or cat1_count == 0 or cat2_count == 0:
-                    pmi_matrix.loc[cat1, cat2] = 0.0
-                    continue
+        cooccur = self._cooccurrence.astype(np.float64)
+        counts = self._counts.astype(np.float64)
 
-                # Compute probabilities
-                p_cat1_cat2 = cooccur_count / self.total_villages
-                p_cat1 = cat1_count / self.total_villages
-                p_cat2 = cat2_count / self.total_villages
+        # P(cat1, cat2) / (P(cat1) * P(cat2)) == C * N / (n1 * n2)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            pmi = np.log2(cooccur * self.total_villages / np.outer(counts, counts))
+        pmi[~np.isfinite(pmi) | (cooccur == 0)] = 0.0
 
-                # Compute PMI
-                pmi = np.log2(p_cat1_cat2 / (p_cat1 * p_cat2))
-                pmi_matrix.loc[cat1, cat2] = pmi
-
-        self.pmi_matrix = pmi_matrix
+        self._pmi = pmi
         logger.info("PMI computation complete")
 
-        return pmi_matrix
+        return self.pmi_matrix
 
     def compute_chi_square(self) -> pd.DataFrame:
         """
@@ -152,41 +276,53 @@ class SemanticCooccurrence:
         Returns:
             DataFrame with p-values
         """
-        if self.cooccurrence_matrix is None:
+        if self._cooccurrence is None:
             raise ValueError("Must call analyze_villages() first")
 
         logger.info("Computing chi-square tests...")
 
-        categories = self.cooccurrence_matrix.index
-        pvalue_matrix = pd.DataFrame(
-            1.0, index=categories, columns=categories, dtype=float
-        )
-
-        for i, cat1 in enumerate(categories):
-            for cat2 in categories[i+1:]:
-                # Build contingency table
-                both = self.cooccurrence_matrix.loc[cat1, cat2]
-                cat1_only = self.category_counts[cat1] - both
-                cat2_only = self.category_counts[cat2] - both
-                neither = self.total_villages - cat1_only - cat2_only - both
-
-                contingency = np.array([
-                    [both, cat1_only],
-                    [cat2_only, neither]
-                ])
-
-                # Chi-square test
-                try:
-                    chi2, pvalue, dof, expected = chi2_contingency(contingency)
-                    pvalue_matrix.loc[cat1, cat2] = pvalue
-                    pvalue_matrix.loc[cat2, cat1] = pvalue
-                except:
-                    pvalue_matrix.loc[cat1, cat2] = 1.0
-                    pvalue_matrix.loc[cat2, cat1] = 1.0
+        pvalues = self._chi_square_pvalues()
 
         logger.info("Chi-square tests complete")
 
-        return pvalue_matrix
+        return pd.DataFrame(pvalues, index=self.categories, columns=self.categories)
+
+    def _chi_square_pvalues(self) -> np.ndarray:
+        """Chi-square independence p-values for all pairs as a K x K array."""
+        n = float(self.total_villages)
+        both = self._cooccurrence.astype(np.float64)
+        counts = self._counts.astype(np.float64)
+        row_total = counts[:, None]
+        col_total = counts[None, :]
+
+        # 2x2 contingency table [[both, cat1_only], [cat2_only, neither]]
+        # for every pair at once, stacked along the first axis
+        observed = np.stack([
+            both,
+            row_total - both,
+            col_total - both,
+            n - row_total - col_total + both,
+        ])
+        with np.errstate(divide="ignore", invalid="ignore"):
+            expected = np.stack(np.broadcast_arrays(
+                row_total * col_total / n,
+                row_total * (n - col_total) / n,
+                (n - row_total) * col_total / n,
+                (n - row_total) * (n - col_total) / n,
+            ))
+
+            # Yates' continuity correction, as chi2_contingency applies for dof=1
+            diff = expected - observed
+            observed = observed + np.sign(diff) * np.minimum(0.5, np.abs(diff))
+            chi2 = ((observed - expected) ** 2 / expected).sum(axis=0)
+
+        pvalues = chi2_dist.sf(chi2, df=1)
+
+        # Tables with an empty row/column have no valid test
+        pvalues[(expected == 0).any(axis=0) | ~np.isfinite(pvalues)] = 1.0
+        np.fill_diagonal(pvalues, 1.0)
+
+        return pvalues
 
     def extract_composition_rules(
         self, top_k: int = 20, min_support: int = 0
@@ -206,36 +342,37 @@ class SemanticCooccurrence:
         rules = []
 
         # Find pairs with high co-occurrence
-        if self.pmi_matrix is None:
+        if self._pmi is None:
             self.compute_pmi()
 
-        categories = self.cooccurrence_matrix.index
-        for i, cat1 in enumerate(categories):
-            for cat2 in categories[i+1:]:
-                count = self.cooccurrence_matrix.loc[cat1, cat2]
-                pmi = self.pmi_matrix.loc[cat1, cat2]
-
-                if count >= min_support:
-                    # Compute conditional probabilities
-                    p_cat2_given_cat1 = count / self.category_counts[cat1]
-                    p_cat1_given_cat2 = count / self.category_counts[cat2]
-
-                    rules.append({
-                        "categories": [cat1, cat2],
-                        "count": int(count),
-                        "frequency": float(count / self.total_villages),
-                        "pmi": float(pmi),
-                        "p_cat2_given_cat1": float(p_cat2_given_cat1),
-                        "p_cat1_given_cat2": float(p_cat1_given_cat2),
-                        "lift": float(count / (self.category_counts[cat1] * self.category_counts[cat2] / self.total_villages)),
-                    })
-
-        # Sort by count descending
-        rules.sort(key=lambda x: x["count"], reverse=True)
+        # Upper-triangle pairs in row-major order, sorted by count descending
+        # (stable, so ties keep pair order) and cut to top_k before building dicts
+        rows, cols = np.triu_indices(len(self.categories), k=1)
+        pair_counts = self._cooccurrence[rows, cols]
+        keep = np.flatnonzero(pair_counts >= min_support)
+        top = keep[np.argsort(-pair_counts[keep], kind="stable")[:top_k]]
+
+        n = self.total_villages
+        for idx in top:
+            i, j = rows[idx], cols[idx]
+            count = pair_counts[idx]
+            count_i, count_j = self._counts[i], self._counts[j]
+
+            # Compute conditional probabilities
+            with np.errstate(divide="ignore", invalid="ignore"):
+                rules.append({
+                    "categories": [self.categories[i], self.categories[j]],
+                    "count": int(count),
+                    "frequency": float(count / n),
+                    "pmi": float(self._pmi[i, j]),
+                    "p_cat2_given_cat1": float(count / count_i),
+                    "p_cat1_given_cat2": float(count / count_j),
+                    "lift": float(count / (count_i * count_j / n)),
+                })
 
         logger.info(f"Extracted {len(rules)} composition rules")
 
-        return rules[:top_k]
+        return rules
 
     def compute_category_entropy(self) -> pd.DataFrame:
         """
@@ -247,41 +384,31 @@ class SemanticCooccurrence:
         Returns:
             DataFrame with entropy values
         """
-        if self.cooccurrence_matrix is None:
+        if self._cooccurrence is None:
             raise ValueError("Must call analyze_villages() first")
 
         logger.info("Computing category entropy...")
 
-        entropy_data = []
-
-        for category in self.cooccurrence_matrix.index:
-            # Get co-occurrence distribution
-            cooccur_counts = self.cooccurrence_matrix.loc[category]
-
-            # Exclude self-cooccurrence
-            cooccur_counts = cooccur_counts.drop(category)
+        # Co-occurrence distribution per category, excluding self-cooccurrence
+        cooccur = self._cooccurrence.astype(np.float64)
+        np.fill_diagonal(cooccur, 0.0)
 
-            # Compute probabilities
-            total = cooccur_counts.sum()
-            if total == 0:
-                entropy = 0.0
-            else:
-                probs = cooccur_counts / total
-                # Compute entropy
-                entropy = -np.sum(probs * np.log2(probs + 1e-10))
+        totals = cooccur.sum(axis=1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            probs = cooccur / totals[:, None]
+            entropy = -np.sum(probs * np.log2(probs + 1e-10), axis=1)
+        entropy[totals == 0] = 0.0
 
-            # Count unique co-occurrences
-            unique_cooccurrences = (cooccur_counts > 0).sum()
-
-            entropy_data.append({
-                'category': category,
-                'entropy': float(entropy),
-                'unique_cooccurrences': int(unique_cooccurrences)
-            })
+        # Count unique co-occurrences
+        unique_cooccurrences = (cooccur > 0).sum(axis=1)
 
         logger.info("Entropy computation complete")
 
-        return pd.DataFrame(entropy_data)
+        return pd.DataFrame({
+            'category': self.categories,
+            'entropy': entropy,
+            'unique_cooccurrences': unique_cooccurrences.astype(int),
+        })
 
     def get_summary_statistics(self) -> Dict:
         """
@@ -290,23 +417,20 @@ class SemanticCooccurrence:
         Returns:
             Dictionary of statistics
         """
-        if self.cooccurrence_matrix is None:
+        if self._cooccurrence is None:
             raise ValueError("Must call analyze_villages() first")
 
         stats = {
             "total_villages": self.total_villages,
             "num_categories": len(self.category_counts),
             "category_counts": dict(self.category_counts),
-            "total_cooccurrences": int(self.cooccurrence_matrix.sum().sum()),
+            "total_cooccurrences": int(self._cooccurrence.sum()),
             "avg_categories_per_village": sum(self.category_counts.values()) / self.total_villages,
         }
 
-        if self.pmi_matrix is not None:
+        if self._pmi is not None:
             # Get non-diagonal PMI values
-            pmi_values = []
-            for i, cat1 in enumerate(self.pmi_matrix.index):
-                for cat2 in self.pmi_matrix.columns[i+1:]:
-                    pmi_values.append(self.pmi_matrix.loc[cat1, cat2])
+            pmi_values = self._pmi[np.triu_indices(len(self.categories), k=1)]
 
             stats["avg_pmi"] = float(np.mean(pmi_values))
             stats["max_pmi"] = float(np.max(pmi_values))
@@ -327,36 +451,30 @@ class SemanticCooccurrence:
         Returns:
             DataFrame with significant pairs
         """
-        if self.cooccurrence_matrix is None:
+        if self._cooccurrence is None:
             raise ValueError("Must call analyze_villages() first")
 
-        if self.pmi_matrix is None:
+        if self._pmi is None:
             self.compute_pmi()
 
         # Compute chi-square tests
-        pvalue_matrix = self.compute_chi_square()
-
-        # Extract significant pairs
-        significant_pairs = []
-        categories = self.cooccurrence_matrix.index
-
-        for i, cat1 in enumerate(categories):
-            for cat2 in categories[i+1:]:
-                count = self.cooccurrence_matrix.loc[cat1, cat2]
-                pmi = self.pmi_matrix.loc[cat1, cat2]
-                pvalue = pvalue_matrix.loc[cat1, cat2]
-
-                if count >= min_cooccurrence and pvalue < alpha:
-                    significant_pairs.append({
-                        'category1': cat1,
-                        'category2': cat2,
-                        'cooccurrence_count': int(count),
-                        'pmi': float(pmi),
-                        'pvalue': float(pvalue),
-                        'is_significant': 1
-                    })
-
-        return pd.DataFrame(significant_pairs)
+        pvalues = self._chi_square_pvalues()
+
+        # Extract significant pairs (upper triangle, row-major order)
+        rows, cols = np.triu_indices(len(self.categories), k=1)
+        counts = self._cooccurrence[rows, cols]
+        pair_pvalues = pvalues[rows, cols]
+        keep = (counts >= min_cooccurrence) & (pair_pvalues < alpha)
+
+        categories = np.array(self.categories, dtype=object)
+        return pd.DataFrame({
+            'category1': categories[rows[keep]],
+            'category2': categories[cols[keep]],
+            'cooccurrence_count': counts[keep].astype(int),
+            'pmi': self._pmi[rows[keep], cols[keep]],
+            'pvalue': pair_pvalues[keep],
+            'is_significant': 1,
+        })
 
     def save_to_database(self, run_id: str):
         """
@@ -365,64 +483,81 @@ class SemanticCooccurrence:
         Args:
             run_id: Analysis run ID
         """
-        if self.cooccurrence_matrix is None:
+        if self._cooccurrence is None:
             raise ValueError("Must call analyze_villages() first")
 
         logger.info(f"Saving results to database (run_id={run_id})...")
 
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-
-        # Create table if not exists
-        cursor.execute("""
-        CREATE TABLE IF NOT EXISTS semantic_cooccurrence (
-            run_id TEXT NOT NULL,
-            category1 TEXT NOT NULL,
-            category2 TEXT NOT NULL,
-            cooccurrence_count INTEGER NOT NULL,
-            pmi REAL NOT NULL,
-            is_significant INTEGER NOT NULL,
-            created_at REAL NOT NULL,
-            PRIMARY KEY (run_id, category1, category2)
-        )
-        """)
-
         # Compute PMI if not done
-        if self.pmi_matrix is None:
+        if self._pmi is None:
             self.compute_pmi()
 
         # Find significant pairs
         significant_pairs = self.find_significant_pairs()
 
-        # Save all pairs
-        categories = self.cooccurrence_matrix.index
-        for i, cat1 in enumerate(categories):
-            for cat2 in categories[i+1:]:
-                count = self.cooccurrence_matrix.loc[cat1, cat2]
-                pmi = self.pmi_matrix.loc[cat1, cat2]
-
-                # Check if significant
-                is_significant = 0
-                if not significant_pairs.empty:
-                    mask = ((significant_pairs['category1'] == cat1) &
-                           (significant_pairs['category2'] == cat2))
-                    if mask.any():
-                        is_significant = 1
-
-                cursor.execute("""
-                INSERT OR REPLACE INTO semantic_cooccurrence
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    run_id,
-                    cat1,
-                    cat2,
-                    int(count),
-                    float(pmi),
-                    is_significant,
-                    pd.Timestamp.now().timestamp()
-                ))
-
-        conn.commit()
-        conn.close()
+        significant_set = set()
+        if not significant_pairs.empty:
+            significant_set = set(zip(
+                significant_pairs['category1'].tolist(),
+                significant_pairs['category2'].tolist(),
+            ))
+
+        # Save all pairs (upper triangle) in one transaction
+        categories = self.categories
+        cooccur = self._cooccurrence
+        pmi = self._pmi
+        created_at = pd.Timestamp.now().timestamp()
+
+        rows = [
+            (
+                run_id,
+                cat1,
+                cat2,
+                int(cooccur[i, j]),
+                float(pmi[i, j]),
+                1 if (cat1, cat2) in significant_set else 0,
+                created_at,
+            )
+            for i, cat1 in enumerate(categories)
+            for j, cat2 in enumerate(categories[i+1:], start=i+1)
+        ]
+
+        conn = self._get_connection()
+        conn.execute("BEGIN")
+        try:
+            conn.executemany(INSERT_COOCCURRENCE_SQL, rows)
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
 
         logger.info(f"Saved {len(categories) * (len(categories) - 1) // 2} pairs to database")
+
+    def _get_connection(self) -> sqlite3.Connection:
+        """
+        Return the shared write connection, opening it on first use.
+
+        The connection runs in autocommit mode (transactions are explicit)
+        with WAL journaling so readers are not blocked during saves.
+        """
+        if self._conn is None:
+            self._conn = sqlite3.connect(
+                self.db_path, isolation_level=None, check_same_thread=False
+            )
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute("PRAGMA temp_store=MEMORY")
+            self._conn.execute(CREATE_COOCCURRENCE_SQL)
+        return self._conn
+
+    def close(self):
+        """Close the database connection if open."""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
@@ -5,17 +5,238 @@ Constructs and analyzes semantic networks from category co-occurrence patterns.
 Nodes represent semantic categories, edges represent co-occurrence strength.
 """
 
+import heapq
+import os
 import sqlite3
 import json
 from typing import Dict, List, Tuple, Optional, Set
 from pathlib import Path
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 
 import pandas as pd
 import numpy as np
 import networkx as nx
+import scipy.sparse as sp
+from scipy.sparse.csgraph import connected_components, shortest_path
+from scipy.sparse.linalg import ArpackNoConvergence, eigsh
 from networkx.algorithms import community
 
+try:
+    import networkit as nk
+    NETWORKIT_AVAILABLE = True
+except ImportError:
+    NETWORKIT_AVAILABLE = False
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+def _json_dumps(obj) -> str:
+    """Serialize JSON with orjson when installed, else the stdlib encoder."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj).decode('utf-8')
+    return json.dumps(obj, ensure_ascii=False)
+
+
+def _component_closeness(
+    nodes: List[str],
+    edges: List[Tuple[str, str, float]]
+) -> Dict[str, float]:
+    """
+    Weighted closeness centrality of one connected component.
+
+    Module-level so it can run in a worker process.
+
+    Args:
+        nodes: Component nodes
+        edges: Component edges as (u, v, weight)
+
+    Returns:
+        Dictionary mapping node to closeness centrality
+    """
+    graph = nx.Graph()
+    graph.add_nodes_from(nodes)
+    graph.add_weighted_edges_from(edges)
+    return nx.closeness_centrality(graph, distance='weight')
+
+
+def _modularity_csr(
+    A: sp.csr_array,
+    labels: np.ndarray,
+    resolution: float = 1.0
+) -> float:
+    """
+    Weighted modularity of a partition, computed on a CSR adjacency.
+
+    Matches ``networkx.community.modularity`` (self-loops count twice
+    towards degree) without walking the graph's dict-of-dicts.
+
+    Args:
+        A: Symmetric CSR adjacency matrix (edge weights)
+        labels: Community label per row of ``A``
+        resolution: Modularity resolution
+
+    Returns:
+        Modularity score
+    """
+    loops = A.diagonal()
+    degrees = np.asarray(A.sum(axis=1)).ravel() + loops
+    two_m = degrees.sum()
+    if two_m == 0:
+        return 0.0
+
+    coo = A.tocoo()
+    intra = labels[coo.row] == labels[coo.col]
+    # Off-diagonal entries appear twice, self-loops once
+    intra_weight = (coo.data[intra].sum() + loops.sum()) / 2.0
+
+    comm_degree = np.bincount(labels, weights=degrees)
+    return float(
+        intra_weight / (two_m / 2.0)
+        - resolution * np.square(comm_degree / two_m).sum()
+    )
+
+
+def _eigenvector_csr(A: sp.csr_array, dense_max_nodes: int = 200) -> np.ndarray:
+    """
+    Dominant eigenvector of a symmetric adjacency matrix.
+
+    Uses ARPACK (``eigsh``, largest algebraic eigenvalue) on the sparse
+    matrix, or a dense solver for small graphs where ARPACK cannot be
+    used. The vector is oriented to a positive sum and L2-normalized, the
+    same scaling as ``networkx.eigenvector_centrality``.
+
+    Args:
+        A: Symmetric CSR adjacency matrix (edge weights)
+        dense_max_nodes: Use the dense solver up to this many nodes
+
+    Returns:
+        Eigenvector centrality per row of ``A``
+    """
+    N = A.shape[0]
+    if N == 0:
+        return np.zeros(0)
+
+    if N <= dense_max_nodes:
+        _, vecs = np.linalg.eigh(A.toarray())
+        v = vecs[:, -1]
+    else:
+        _, vecs = eigsh(A, k=1, which='LA')
+        v = vecs[:, 0]
+
+    if v.sum() < 0:
+        v = -v
+    return v / np.linalg.norm(v)
+
+
+def _average_clustering_csr(A: sp.csr_array) -> float:
+    """
+    Weighted average clustering coefficient on a CSR adjacency.
+
+    Same definition as ``networkx.average_clustering(G, weight=...)``: the
+    geometric mean of max-normalized triangle edge weights divided by
+    deg*(deg-1), with self-loops ignored and zero-degree nodes counted.
+
+    Args:
+        A: Symmetric CSR adjacency matrix (edge weights)
+
+    Returns:
+        Average clustering coefficient
+    """
+    N = A.shape[0]
+    if N == 0:
+        return 0.0
+
+    W = A.tocoo()
+    max_weight = W.data.max() if W.nnz else 1.0
+    off_diag = W.row != W.col
+    # Degree counts neighbours (including zero-weight edges), not weights
+    degree = np.bincount(W.row[off_diag], minlength=N).astype(float)
+
+    W = sp.csr_array(
+        (np.cbrt(W.data[off_diag] / max_weight), (W.row[off_diag], W.col[off_diag])),
+        shape=A.shape
+    )
+    # (W @ W) * W summed per row = 2 * weighted triangles at each node
+    triangles = np.asarray(((W @ W) * W).sum(axis=1)).ravel()
+
+    possible = degree * (degree - 1)
+    clustering = np.zeros(N)
+    mask = possible > 0
+    clustering[mask] = triangles[mask] / possible[mask]
+    return float(clustering.mean())
+
+
+def _pagerank_csr(
+    A: sp.csr_array,
+    alpha: float = 0.85,
+    tol: float = 1e-6,
+    max_iter: int = 100,
+    sweep_every: int = 25
+) -> np.ndarray:
+    """
+    Weighted PageRank by sparse power iteration.
+
+    Mirrors networkx's scipy PageRank: rows are normalized by out-weight,
+    dangling nodes redistribute uniformly and iteration stops once the L1
+    change drops below ``N * tol``.
+
+    Uses adaptive skipping: nodes whose score moved by less than
+    ``tol * 0.1`` are frozen and not recomputed, with a full sweep every
+    ``sweep_every`` iterations. Convergence is only declared on a full sweep.
+
+    Args:
+        A: Square CSR adjacency matrix (edge weights)
+        alpha: Damping parameter
+        tol: Convergence tolerance
+        max_iter: Maximum number of iterations
+        sweep_every: Recompute all nodes at least this often
+
+    Returns:
+        PageRank score per row of ``A``
+    """
+    N = A.shape[0]
+    if N == 0:
+        return np.zeros(0)
+
+    out_weight = np.asarray(A.sum(axis=1)).ravel()
+    inv_out = np.zeros(N)
+    nonzero = out_weight != 0
+    inv_out[nonzero] = 1.0 / out_weight[nonzero]
+    # Transposed, row-normalized transition matrix so each step is one SpMV
+    M = (sp.diags_array(inv_out) @ A).T.tocsr()
+    is_dangling = np.flatnonzero(~nonzero)
+
+    x = np.full(N, 1.0 / N)
+    teleport = (1.0 - alpha) / N
+    active = np.ones(N, dtype=bool)
+    for iteration in range(1, max_iter + 1):
+        x_last = x
+        dangling_share = x_last[is_dangling].sum() / N
+        full_sweep = bool(active.all())
+        if full_sweep:
+            x = alpha * (M @ x_last + dangling_share) + teleport
+        else:
+            rows = np.flatnonzero(active)
+            x = x_last.copy()
+            x[rows] = alpha * (M[rows] @ x_last + dangling_share) + teleport
+
+        delta = np.abs(x - x_last)
+        if delta.sum() < N * tol:
+            if full_sweep:
+                # Frozen nodes can leak a little mass; restore a distribution
+                return x / x.sum()
+            active[:] = True
+        elif iteration % sweep_every == 0:
+            active[:] = True
+        else:
+            active = delta > tol * 0.1
+    raise nx.PowerIterationFailedConvergence(max_iter)
+
 
 class SemanticNetwork:
     """
@@ -37,6 +258,70 @@ class SemanticNetwork:
         self.db_path = db_path
         self.graph = None
         self.communities = None
+        self._index_checked = False
+        self._centrality_cache = None
+        self._stats_cache = None
+        self._csr = None
+        self._node_order = None
+        self._csr_key = None
+
+    def _build_adjacency(self):
+        """Build the weighted CSR adjacency and node order for self.graph."""
+        self._node_order = list(self.graph.nodes())
+        self._csr = nx.to_scipy_sparse_array(
+            self.graph,
+            nodelist=self._node_order,
+            weight='weight',
+            dtype=float,
+            format='csr'
+        )
+        self._csr_key = (
+            id(self.graph),
+            self.graph.number_of_nodes(),
+            self.graph.number_of_edges()
+        )
+
+    def _adjacency(self) -> Tuple[sp.csr_array, List[str]]:
+        """
+        Return the cached CSR adjacency and its node order.
+
+        Rebuilt if the graph was replaced or its size changed since the
+        last build.
+        """
+        key = (
+            id(self.graph),
+            self.graph.number_of_nodes(),
+            self.graph.number_of_edges()
+        )
+        if self._csr is None or self._csr_key != key:
+            self._build_adjacency()
+        return self._csr, self._node_order
+
+    def _components(self) -> List[List[str]]:
+        """Connected components as node lists, via scipy.sparse.csgraph."""
+        A, nodes = self._adjacency()
+        if not nodes:
+            raise nx.NetworkXPointlessConcept(
+                "Connectivity is undefined for the null graph."
+            )
+        n_components, labels = connected_components(A, directed=False)
+        order = np.argsort(labels, kind='stable')
+        bounds = np.flatnonzero(np.diff(labels[order])) + 1
+        return [
+            [nodes[i] for i in group]
+            for group in np.split(order, bounds)
+        ]
+
+    def _ensure_cooccurrence_index(self, conn: sqlite3.Connection):
+        """Create the composite index used by build_network's filters (once)."""
+        if self._index_checked:
+            return
+        conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_coocc_run_pmi
+        ON semantic_cooccurrence(run_id, pmi, cooccurrence_count)
+        """)
+        conn.commit()
+        self._index_checked = True
 
     def build_network(
         self,
@@ -58,38 +343,37 @@ class SemanticNetwork:
             NetworkX graph with categories as nodes
         """
         conn = sqlite3.connect(self.db_path)
+        self._ensure_cooccurrence_index(conn)
 
-        # Load co-occurrence data
+        # Load co-occurrence data, filtered by SQLite
         query = """
-        SELECT category1, category2, cooccurrence_count, pmi, is_significant
+        SELECT category1, category2,
+               pmi AS weight, cooccurrence_count AS cooccurrence
         FROM semantic_cooccurrence
-        WHERE run_id = ?
+        WHERE run_id = ? AND pmi >= ? AND cooccurrence_count >= ?
         """
-        df = pd.read_sql_query(query, conn, params=(run_id,))
+        if significant_only:
+            query += " AND is_significant = 1"
+        # Keep node insertion order independent of the index SQLite picks
+        query += " ORDER BY category1, category2"
+        df = pd.read_sql_query(
+            query, conn, params=(run_id, min_pmi, min_cooccurrence)
+        )
         conn.close()
 
-        # Filter by criteria
-        if significant_only:
-            df = df[df['is_significant'] == 1]
-        df = df[df['pmi'] >= min_pmi]
-        df = df[df['cooccurrence_count'] >= min_cooccurrence]
-
-        # Build graph
-        G = nx.Graph()
-
-        # Add edges with weights
-        for _, row in df.iterrows():
-            cat1, cat2 = row['category1'], row['category2']
-            pmi = row['pmi']
-            count = row['cooccurrence_count']
-
-            G.add_edge(
-                cat1, cat2,
-                weight=pmi,
-                cooccurrence=count
-            )
+        # Build graph (PMI as edge weight)
+        G = nx.from_pandas_edgelist(
+            df,
+            source='category1',
+            target='category2',
+            edge_attr=['weight', 'cooccurrence'],
+            create_using=nx.Graph
+        )
 
         self.graph = G
+        self._centrality_cache = None
+        self._stats_cache = None
+        self._build_adjacency()
         return G
 
     def build_network_from_bigrams(
@@ -117,16 +401,20 @@ class SemanticNetwork:
         df = pd.read_sql_query(query, conn, params=(min_pmi, min_frequency))
         conn.close()
 
-        # Build graph
-        G = nx.Graph()
-        for _, row in df.iterrows():
-            G.add_edge(
-                row['category1'], row['category2'],
-                weight=row['pmi'],
-                frequency=row['frequency']
-            )
+        # Build graph (PMI as edge weight)
+        df = df.rename(columns={'pmi': 'weight'})
+        G = nx.from_pandas_edgelist(
+            df,
+            source='category1',
+            target='category2',
+            edge_attr=['weight', 'frequency'],
+            create_using=nx.Graph
+        )
 
         self.graph = G
+        self._centrality_cache = None
+        self._stats_cache = None
+        self._build_adjacency()
         return G
 
     def detect_communities(
@@ -138,7 +426,8 @@ class SemanticNetwork:
         Detect communities in semantic network.
 
         Args:
-            method: Community detection method ('louvain', 'label_propagation', 'greedy')
+            method: Community detection method ('louvain', 'label_propagation', 'greedy').
+                Louvain uses networkit's parallel PLM when networkit is installed.
             resolution: Resolution parameter for modularity (louvain only)
 
         Returns:
@@ -147,12 +436,10 @@ class SemanticNetwork:
         if self.graph is None:
             raise ValueError("Must build network first")
 
-        if method == 'louvain':
-            communities_generator = community.louvain_communities(
-                self.graph,
-                weight='weight',
-                resolution=resolution
-            )
+        if method == 'louvain' and NETWORKIT_AVAILABLE:
+            communities_generator = self._louvain_networkit(resolution)
+        elif method == 'louvain':
+            communities_generator = self._louvain_networkx(resolution)
         elif method == 'label_propagation':
             communities_generator = community.label_propagation_communities(self.graph)
         elif method == 'greedy':
@@ -170,31 +457,123 @@ class SemanticNetwork:
                 category_to_community[category] = comm_id
 
         self.communities = category_to_community
+        self._stats_cache = None
         return category_to_community
 
-    def compute_centrality(self) -> Dict[str, Dict[str, float]]:
+    def _louvain_networkx(self, resolution: float) -> List[Set[str]]:
+        """
+        Run networkx Louvain level by level with a shrinking gain tolerance.
+
+        Each level is scored with ``_modularity_csr``; aggregation stops
+        once a level improves modularity by less than ``0.01 / 10**level``.
+
+        Args:
+            resolution: Modularity resolution
+
+        Returns:
+            List of communities as node sets from the last level kept
+        """
+        A, nodes = self._adjacency()
+        node_idx = {node: i for i, node in enumerate(nodes)}
+        labels = np.zeros(len(nodes), dtype=np.int64)
+
+        kept = [{node} for node in nodes]
+        prev_modularity = -np.inf
+        for level, partition in enumerate(community.louvain_partitions(
+            self.graph,
+            weight='weight',
+            resolution=resolution
+        )):
+            for comm_id, comm_set in enumerate(partition):
+                labels[[node_idx[node] for node in comm_set]] = comm_id
+            modularity = _modularity_csr(A, labels, resolution)
+            if modularity - prev_modularity < 0.01 / 10 ** level:
+                # This level's gain is too small; keep the previous one
+                break
+            kept = partition
+            prev_modularity = modularity
+
+        return kept
+
+    def _louvain_networkit(self, resolution: float) -> List[Set[str]]:
+        """
+        Run networkit's parallel Louvain (PLM) on the current graph.
+
+        Args:
+            resolution: Modularity resolution (PLM gamma)
+
+        Returns:
+            List of communities as node sets, in order of first member
+        """
+        nodes = list(self.graph.nodes())
+        # nx2nk numbers nodes 0..n-1 in self.graph.nodes() order
+        nk_graph = nk.nxadapter.nx2nk(self.graph, weightAttr='weight')
+        plm = nk.community.PLM(nk_graph, refine=True, gamma=resolution)
+        plm.run()
+        partition = plm.getPartition()
+
+        comm_sets = {}
+        for idx, node in enumerate(nodes):
+            comm_sets.setdefault(partition.subsetOf(idx), set()).add(node)
+        return list(comm_sets.values())
+
+    def compute_centrality(
+        self,
+        bc_samples: Optional[int] = None,
+        bc_threshold: int = 10000,
+        n_jobs: int = 1
+    ) -> Dict[str, Dict[str, float]]:
         """
         Compute centrality measures for all nodes.
 
+        Betweenness is exact up to ``bc_threshold`` nodes. Larger graphs use
+        Brandes-Pich pivot sampling, so their betweenness values are
+        estimates (rescaled to the full node count), seeded for
+        reproducibility.
+
+        The result is cached until the network is rebuilt.
+
+        Args:
+            bc_samples: Number of betweenness pivots for large graphs
+                (default: 2% of nodes)
+            bc_threshold: Node count above which betweenness is sampled
+            n_jobs: Worker processes for per-component closeness on
+                disconnected graphs (-1 = all cores)
+
         Returns:
             Dictionary with centrality metrics for each category
         """
         if self.graph is None:
             raise ValueError("Must build network first")
 
+        cache_key = (bc_samples, bc_threshold)
+        if self._centrality_cache is not None and self._centrality_cache[0] == cache_key:
+            return self._centrality_cache[1]
+
         centrality_metrics = {}
+        num_nodes = self.graph.number_of_nodes()
 
         # Degree centrality
         degree_cent = nx.degree_centrality(self.graph)
 
-        # Betweenness centrality
-        betweenness_cent = nx.betweenness_centrality(
-            self.graph,
-            weight='weight'
-        )
+        # Betweenness centrality (pivot-sampled on large graphs)
+        if num_nodes > bc_threshold:
+            k = bc_samples if bc_samples is not None else max(1, num_nodes // 50)
+            betweenness_cent = nx.betweenness_centrality(
+                self.graph,
+                k=min(k, num_nodes),
+                weight='weight',
+                seed=42
+            )
+        else:
+            betweenness_cent = nx.betweenness_centrality(
+                self.graph,
+                weight='weight'
+            )
 
         # Closeness centrality
-        if nx.is_connected(self.graph):
+        components = self._components()
+        if len(components) == 1:
             closeness_cent = nx.closeness_centrality(
                 self.graph,
                 distance='weight'
@@ -202,19 +581,27 @@ class SemanticNetwork:
         else:
             # For disconnected graphs, compute per component
             closeness_cent = {}
-            for component in nx.connected_components(self.graph):
-                subgraph = self.graph.subgraph(component)
-                closeness = nx.closeness_centrality(subgraph, distance='weight')
-                closeness_cent.update(closeness)
+            workers = os.cpu_count() if n_jobs == -1 else n_jobs
+            if workers and workers > 1 and len(components) > 1:
+                # Components are independent; ship plain edge lists to workers
+                jobs = [
+                    (nodes, list(self.graph.subgraph(nodes).edges(data='weight')))
+                    for nodes in components
+                ]
+                with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as executor:
+                    for closeness in executor.map(_component_closeness, *zip(*jobs)):
+                        closeness_cent.update(closeness)
+            else:
+                for component in components:
+                    subgraph = self.graph.subgraph(component)
+                    closeness = nx.closeness_centrality(subgraph, distance='weight')
+                    closeness_cent.update(closeness)
 
         # Eigenvector centrality
+        A, nodes = self._adjacency()
         try:
-            eigenvector_cent = nx.eigenvector_centrality(
-                self.graph,
-                weight='weight',
-                max_iter=1000
-            )
-        except nx.PowerIterationFailedConvergence:
+            eigenvector_cent = dict(zip(nodes, _eigenvector_csr(A).tolist()))
+        except ArpackNoConvergence:
             eigenvector_cent = {node: 0.0 for node in self.graph.nodes()}
 
         # PageRank centrality
@@ -230,14 +617,22 @@ class SemanticNetwork:
                 'pagerank': pagerank_cent.get(node, 0.0)
             }
 
+        self._centrality_cache = (cache_key, centrality_metrics)
         return centrality_metrics
 
-    def compute_pagerank(self, alpha: float = 0.85) -> Dict[str, float]:
+    def compute_pagerank(
+        self,
+        alpha: float = 0.85,
+        tol: float = 1e-6,
+        max_iter: int = 100
+    ) -> Dict[str, float]:
         """
-        Compute PageRank centrality.
+        Compute weighted PageRank centrality.
 
         Args:
             alpha: Damping parameter (default 0.85)
+            tol: Convergence tolerance (L1, scaled by node count)
+            max_iter: Maximum number of power iterations
 
         Returns:
             Dictionary mapping node to PageRank score
@@ -245,43 +640,57 @@ class SemanticNetwork:
         if self.graph is None:
             raise ValueError("Must build network first")
 
-        return nx.pagerank(
-            self.graph,
-            alpha=alpha,
-            weight='weight'
-        )
+        A, nodes = self._adjacency()
+        scores = _pagerank_csr(A, alpha=alpha, tol=tol, max_iter=max_iter)
+        return dict(zip(nodes, scores.tolist()))
 
-    def get_network_stats(self) -> Dict:
+    def get_network_stats(self, apsp_max_nodes: Optional[int] = 5000) -> Dict:
         """
         Compute network-level statistics.
 
+        Diameter (hop count) and the weighted average shortest path are
+        computed with SciPy's all-pairs Dijkstra. Both are None for
+        disconnected graphs or graphs larger than ``apsp_max_nodes``.
+
+        The result is cached until the network is rebuilt or communities
+        are re-detected.
+
+        Args:
+            apsp_max_nodes: Node cap for all-pairs shortest paths (None = no cap)
+
         Returns:
             Dictionary with network statistics
         """
         if self.graph is None:
             raise ValueError("Must build network first")
 
+        if self._stats_cache is not None and self._stats_cache[0] == apsp_max_nodes:
+            return self._stats_cache[1]
+
+        A, _ = self._adjacency()
+        num_nodes = self.graph.number_of_nodes()
+        num_edges = self.graph.number_of_edges()
+        num_components = len(self._components())
         stats = {
-            'num_nodes': self.graph.number_of_nodes(),
-            'num_edges': self.graph.number_of_edges(),
-            'density': nx.density(self.graph),
-            'is_connected': nx.is_connected(self.graph),
-            'num_components': nx.number_connected_components(self.graph)
+            'num_nodes': num_nodes,
+            'num_edges': num_edges,
+            'density': 2 * num_edges / (num_nodes * (num_nodes - 1)) if num_nodes > 1 else 0,
+            'is_connected': num_components == 1,
+            'num_components': num_components
         }
 
         # Average clustering coefficient
-        stats['avg_clustering'] = nx.average_clustering(
-            self.graph,
-            weight='weight'
-        )
+        stats['avg_clustering'] = _average_clustering_csr(A)
 
         # Diameter (only for connected graphs)
-        if stats['is_connected']:
-            stats['diameter'] = nx.diameter(self.graph)
-            stats['avg_shortest_path'] = nx.average_shortest_path_length(
-                self.graph,
-                weight='weight'
-            )
+        if stats['is_connected'] and (apsp_max_nodes is None or num_nodes <= apsp_max_nodes):
+            hops = shortest_path(A, method='D', directed=False, unweighted=True)
+            stats['diameter'] = int(hops.max())
+            if num_nodes > 1:
+                dist = shortest_path(A, method='D', directed=False)
+                stats['avg_shortest_path'] = float(dist.sum() / (num_nodes * (num_nodes - 1)))
+            else:
+                stats['avg_shortest_path'] = 0
         else:
             stats['diameter'] = None
             stats['avg_shortest_path'] = None
@@ -304,6 +713,7 @@ class SemanticNetwork:
             stats['modularity'] = None
             stats['num_communities'] = None
 
+        self._stats_cache = (apsp_max_nodes, stats)
         return stats
 
     def find_bridges(self) -> List[Tuple[str, str]]:
@@ -354,149 +764,197 @@ class SemanticNetwork:
         if category not in self.graph:
             return []
 
-        neighbors = []
-        for neighbor in self.graph.neighbors(category):
-            edge_data = self.graph[category][neighbor]
-            value = edge_data.get(sort_by, 0.0)
-            neighbors.append((neighbor, value))
-
-        # Sort and return top-K
-        neighbors.sort(key=lambda x: x[1], reverse=True)
-        return neighbors[:top_k]
+        # Partial selection of top-K (same order as a stable descending sort)
+        return heapq.nlargest(
+            top_k,
+            (
+                (neighbor, edge_data.get(sort_by, 0.0))
+                for neighbor, edge_data in self.graph.adj[category].items()
+            ),
+            key=lambda x: x[1]
+        )
 
-    def export_to_json(self, output_path: str):
+    def compute_all(self, **centrality_kwargs) -> Dict:
         """
-        Export network to JSON format for visualization.
+        Compute centrality and network statistics once for saving/exporting.
 
         Args:
-            output_path: Output JSON file path
+            **centrality_kwargs: Passed through to compute_centrality
+
+        Returns:
+            Dictionary with 'centrality', 'stats' and 'communities'
         """
         if self.graph is None:
             raise ValueError("Must build network first")
 
-        # Prepare nodes
-        nodes = []
-        centrality = self.compute_centrality()
-
-        for node in self.graph.nodes():
-            node_data = {
-                'id': node,
-                'label': node,
-                'degree': self.graph.degree(node),
-                'centrality': centrality.get(node, {})
-            }
-
-            if self.communities:
-                node_data['community'] = self.communities.get(node)
+        return {
+            'centrality': self.compute_centrality(**centrality_kwargs),
+            'stats': self.get_network_stats(),
+            'communities': self.communities
+        }
 
-            nodes.append(node_data)
+    def export_to_json(self, output_path: str, results: Optional[Dict] = None):
+        """
+        Export network to JSON format for visualization.
 
-        # Prepare edges
-        edges = []
-        for u, v, data in self.graph.edges(data=True):
-            edges.append({
-                'source': u,
-                'target': v,
-                'weight': data.get('weight', 0.0),
-                'cooccurrence': data.get('cooccurrence', 0)
-            })
+        Args:
+            output_path: Output JSON file path
+            results: Precomputed output of compute_all (computed if omitted)
+        """
+        if self.graph is None:
+            raise ValueError("Must build network first")
 
-        # Export
-        output_data = {
-            'nodes': nodes,
-            'edges': edges,
-            'stats': self.get_network_stats()
-        }
+        if results is None:
+            results = self.compute_all()
+        centrality = results['centrality']
+        communities = results['communities']
+
+        def iter_nodes():
+            for node in self.graph.nodes():
+                node_data = {
+                    'id': node,
+                    'label': node,
+                    'degree': self.graph.degree(node),
+                    'centrality': centrality.get(node, {})
+                }
+
+                if communities:
+                    node_data['community'] = communities.get(node)
+
+                yield node_data
+
+        def iter_edges():
+            for u, v, data in self.graph.edges(data=True):
+                yield {
+                    'source': u,
+                    'target': v,
+                    'weight': data.get('weight', 0.0),
+                    'cooccurrence': data.get('cooccurrence', 0)
+                }
 
         output_path = Path(output_path)
         output_path.parent.mkdir(parents=True, exist_ok=True)
 
+        # Stream one record per line instead of building the full document
         with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(output_data, f, ensure_ascii=False, indent=2)
-
-    def save_to_database(self, run_id: str):
+            for key, items in (('nodes', iter_nodes()), ('edges', iter_edges())):
+                f.write('{\n' if key == 'nodes' else ',\n')
+                f.write(f'  "{key}": [')
+                for i, item in enumerate(items):
+                    f.write(',\n    ' if i else '\n    ')
+                    f.write(_json_dumps(item))
+                f.write('\n  ]')
+            f.write(',\n  "stats": ')
+            f.write(_json_dumps(results['stats']))
+            f.write('\n}\n')
+
+    def save_to_database(self, run_id: str, results: Optional[Dict] = None):
         """
         Save network analysis results to database.
 
         Args:
             run_id: Network analysis run ID
+            results: Precomputed output of compute_all (computed if omitted)
         """
         if self.graph is None:
             raise ValueError("Must build network first")
 
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-
-        # Create tables if not exist
-        cursor.execute("""
-        CREATE TABLE IF NOT EXISTS semantic_network_stats (
-            run_id TEXT PRIMARY KEY,
-            num_nodes INTEGER,
-            num_edges INTEGER,
-            density REAL,
-            is_connected INTEGER,
-            num_components INTEGER,
-            avg_clustering REAL,
-            diameter INTEGER,
-            avg_shortest_path REAL,
-            modularity REAL,
-            num_communities INTEGER,
-            created_at REAL
+        if results is None:
+            results = self.compute_all()
+        stats = results['stats']
+        centrality = results['centrality']
+        communities = results['communities'] or {}
+
+        # Column-oriented centrality frame in the table's column order
+        cent_df = (
+            pd.DataFrame.from_dict(
+                centrality,
+                orient='index',
+                columns=['degree', 'betweenness', 'closeness', 'eigenvector', 'pagerank']
+            )
+            .rename_axis('category')
+            .reset_index()
+            .rename(columns={
+                'degree': 'degree_centrality',
+                'betweenness': 'betweenness_centrality',
+                'closeness': 'closeness_centrality',
+                'eigenvector': 'eigenvector_centrality'
+            })
         )
-        """)
+        cent_df.insert(0, 'run_id', run_id)
+        cent_df['community_id'] = cent_df['category'].map(communities).astype('Int64')
 
-        cursor.execute("""
-        CREATE TABLE IF NOT EXISTS semantic_network_centrality (
-            run_id TEXT NOT NULL,
-            category TEXT NOT NULL,
-            degree_centrality REAL,
-            betweenness_centrality REAL,
-            closeness_centrality REAL,
-            eigenvector_centrality REAL,
-            pagerank REAL,
-            community_id INTEGER,
-            PRIMARY KEY (run_id, category)
-        )
-        """)
+        conn = sqlite3.connect(self.db_path)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+
+        # Tables, stats and centrality rows written in one transaction
+        with conn:
+            cursor = conn.cursor()
+
+            # Create tables if not exist
+            cursor.execute("""
+            CREATE TABLE IF NOT EXISTS semantic_network_stats (
+                run_id TEXT PRIMARY KEY,
+                num_nodes INTEGER,
+                num_edges INTEGER,
+                density REAL,
+                is_connected INTEGER,
+                num_components INTEGER,
+                avg_clustering REAL,
+                diameter INTEGER,
+                avg_shortest_path REAL,
+                modularity REAL,
+                num_communities INTEGER,
+                created_at REAL
+            )
+            """)
 
-        # Save network stats
-        stats = self.get_network_stats()
-        cursor.execute("""
-        INSERT OR REPLACE INTO semantic_network_stats
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
-            run_id,
-            stats['num_nodes'],
-            stats['num_edges'],
-            stats['density'],
-            1 if stats['is_connected'] else 0,
-            stats['num_components'],
-            stats['avg_clustering'],
-            stats['diameter'],
-            stats['avg_shortest_path'],
-            stats['modularity'],
-            stats['num_communities'],
-            pd.Timestamp.now().timestamp()
-        ))
-
-        # Save centrality measures
-        centrality = self.compute_centrality()
-        for category, metrics in centrality.items():
-            community_id = self.communities.get(category) if self.communities else None
             cursor.execute("""
-            INSERT OR REPLACE INTO semantic_network_centrality
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            CREATE TABLE IF NOT EXISTS semantic_network_centrality (
+                run_id TEXT NOT NULL,
+                category TEXT NOT NULL,
+                degree_centrality REAL,
+                betweenness_centrality REAL,
+                closeness_centrality REAL,
+                eigenvector_centrality REAL,
+                pagerank REAL,
+                community_id INTEGER,
+                PRIMARY KEY (run_id, category)
+            )
+            """)
+
+            # Save network stats
+            cursor.execute("""
+            INSERT OR REPLACE INTO semantic_network_stats
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
             """, (
                 run_id,
-                category,
-                metrics['degree'],
-                metrics['betweenness'],
-                metrics['closeness'],
-                metrics['eigenvector'],
-                metrics['pagerank'],
-                community_id
+                stats['num_nodes'],
+                stats['num_edges'],
+                stats['density'],
+                1 if stats['is_connected'] else 0,
+                stats['num_components'],
+                stats['avg_clustering'],
+                stats['diameter'],
+                stats['avg_shortest_path'],
+                stats['modularity'],
+                stats['num_communities'],
+                pd.Timestamp.now().timestamp()
             ))
 
-        conn.commit()
-        conn.close()
+            # Save centrality measures (replace any previous rows for this run)
+            cursor.execute(
+                "DELETE FROM semantic_network_centrality WHERE run_id = ?",
+                (run_id,)
+            )
+            cent_df.to_sql(
+                'semantic_network_centrality',
+                conn,
+                if_exists='append',
+                index=False,
+                method='multi',
+                chunksize=1000
+            )
 
+        conn.close()
@@ -18,7 +18,7 @@ from typing import List, Optional, Dict, Any
 import json
 import time
 import logging
-import pickle
+import joblib
 from src.schema import REGION_LEVELS
 
 from ..clustering.feature_builder import RegionFeatureBuilder
@@ -30,6 +30,7 @@ from ..data.db_writer import (
     write_cluster_profiles,
     write_clustering_metrics
 )
+from ..utils.csv_writer import write_csv
 
 logger = logging.getLogger(__name__)
 
@@ -50,6 +51,8 @@ def run_clustering_pipeline(
     pca_n_components: int = 50,
     n_init: int = 20,
     max_iter: int = 500,
+    minibatch_sweep: bool = False,
+    n_jobs: int = -1,
     random_state: int = 42,
     semantic_lexicon_path: str = 'data/semantic_lexicon_v1.json',
     output_dir: Optional[str] = None
@@ -73,6 +76,9 @@ def run_clustering_pipeline(
         pca_n_components: Number of PCA components
         n_init: KMeans initialization count
         max_iter: KMeans max iterations
+        minibatch_sweep: Screen k_range with MiniBatchKMeans and refit only
+            the best k with full KMeans
+        n_jobs: Number of k values fitted in parallel (-1 = all cores)
         random_state: Random seed
         semantic_lexicon_path: Semantic lexicon used to choose semantic categories
         output_dir: Optional output directory for CSV exports
@@ -111,8 +117,8 @@ def run_clustering_pipeline(
 
         logger.info(f"Built feature matrix: {len(region_df)} regions × {len(feature_names)} features")
 
-        # Extract feature matrix
-        X = region_df[feature_names].values
+        # Extract feature matrix (float32: half the bandwidth for scaler/PCA/KMeans)
+        X = region_df[feature_names].to_numpy(dtype=np.float32)
 
         # Step 3: Preprocess features
         logger.info("Preprocessing features...")
@@ -123,11 +129,25 @@ def run_clustering_pipeline(
 
         # Step 4: Run KMeans clustering
         logger.info(f"Running KMeans clustering for k={k_range}...")
-        results = engine.fit_kmeans(X_processed, k_range=k_range, n_init=n_init, max_iter=max_iter)
+        results = engine.fit_kmeans(
+            X_processed,
+            k_range=k_range,
+            n_init=n_init,
+            max_iter=max_iter,
+            minibatch=minibatch_sweep,
+            n_jobs=n_jobs
+        )
 
         # Step 5: Select best k
         logger.info("Selecting best k...")
         best_result = engine.select_best_k(results, metric='silhouette_score')
+        if minibatch_sweep:
+            logger.info(f"Refitting full KMeans for k={best_result['k']}...")
+            best_index = results.index(best_result)
+            best_result = engine.refit_kmeans(
+                X_processed, best_result['k'], n_init=n_init, max_iter=max_iter
+            )
+            results[best_index] = best_result
         best_k = best_result['k']
         best_model = best_result['model']
         best_labels = best_result['labels']
@@ -210,10 +230,10 @@ def run_clustering_pipeline(
             assignments_df = region_df[['region_name']].copy()
             assignments_df['cluster_id'] = best_labels
             assignments_df['distance_to_centroid'] = distances
-            assignments_df.to_csv(output_path / 'cluster_assignments_kmeans.csv', index=False, encoding='utf-8-sig')
+            write_csv(assignments_df, output_path / 'cluster_assignments_kmeans.csv')
 
             # Export cluster profiles
-            profiles_df.to_csv(output_path / 'cluster_profiles_kmeans.csv', index=False, encoding='utf-8-sig')
+            write_csv(profiles_df, output_path / 'cluster_profiles_kmeans.csv')
 
             # Export clustering metrics
             metrics_df = pd.DataFrame([{
@@ -223,21 +243,18 @@ def run_clustering_pipeline(
                 'calinski_harabasz_score': r['calinski_harabasz_score'],
                 'inertia': r['inertia']
             } for r in results])
-            metrics_df.to_csv(output_path / 'clustering_metrics.csv', index=False, encoding='utf-8-sig')
+            write_csv(metrics_df, output_path / 'clustering_metrics.csv')
 
             # Save models
             models_dir = output_path / 'models'
             models_dir.mkdir(exist_ok=True)
 
-            with open(models_dir / 'scaler.pkl', 'wb') as f:
-                pickle.dump(engine.scaler, f)
+            joblib.dump(engine.scaler, models_dir / 'scaler.joblib', compress=3)
 
             if engine.pca:
-                with open(models_dir / 'pca.pkl', 'wb') as f:
-                    pickle.dump(engine.pca, f)
+                joblib.dump(engine.pca, models_dir / 'pca.joblib', compress=3)
 
-            with open(models_dir / f'kmeans_k{best_k}.pkl', 'wb') as f:
-                pickle.dump(best_model, f)
+            joblib.dump(best_model, models_dir / f'kmeans_k{best_k}.joblib', compress=3)
 
             logger.info(f"Exported results to {output_path}")
 
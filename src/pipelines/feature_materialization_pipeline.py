@@ -8,6 +8,7 @@ import sqlite3
 import logging
 import time
 import json
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 import pandas as pd
@@ -16,10 +17,18 @@ import numpy as np
 from src.schema import REGION_LEVELS, VillageTableSchema, DEFAULT_SCHEMA, get_schema
 from src.features.feature_extractor import VillageFeatureExtractor
 from src.data.db_writer import (
+    configure_bulk_write_pragmas,
     create_feature_materialization_tables,
     create_feature_materialization_indexes
 )
 from src.pipelines.region_aggregation import compute_and_write_all_aggregates
+from src.utils.csv_writer import write_csv
+
+try:
+    import pyarrow  # noqa: F401
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
 
 
 logger = logging.getLogger(__name__)
@@ -39,128 +48,106 @@ def load_villages(conn: sqlite3.Connection,
     """
     logger.info("Loading villages from database")
 
-    # Query all columns and rename them
-    # Column order: known from raw table schema (市级, ...)
-    query = f"SELECT * FROM {schema.raw_table}"
+    # Query only the needed columns and rename them
+    # Column order: known from raw table schema (市级, ...); the first six
+    # are the region levels, village name and pinyin
+    needed = [REGION_LEVELS[0], REGION_LEVELS[1], REGION_LEVELS[2], REGION_LEVELS[3], 'village_name', 'pinyin']
+    raw_cols = [row[1] for row in conn.execute(f"PRAGMA table_info({schema.raw_table})")]
+    select_sql = ', '.join('"' + col.replace('"', '""') + '"' for col in raw_cols[:len(needed)])
+    query = f"SELECT {select_sql} FROM {schema.raw_table}"
 
     df = pd.read_sql_query(query, conn)
 
     # Rename columns to English
-    df.columns = [REGION_LEVELS[0], REGION_LEVELS[1], REGION_LEVELS[2], REGION_LEVELS[3], 'village_name', 'pinyin',
-                  'language_distribution', 'longitude', 'latitude', 'notes', 'update_time', 'data_source']
+    df.columns = needed
+
+    # Arrow-backed strings keep the merges and group-bys downstream on
+    # contiguous UTF-8 buffers instead of Python objects
+    if PYARROW_AVAILABLE:
+        df = df.astype('string[pyarrow]')
 
-    # Keep only needed columns
-    df = df[[REGION_LEVELS[0], REGION_LEVELS[1], REGION_LEVELS[2], REGION_LEVELS[3], 'village_name', 'pinyin']]
+    # Drop villages without a name up front so feature extraction, the
+    # cluster merge and the aggregates never see rows that are not written.
+    # Empty names are kept: they are written with has_valid_chars=0
+    df = df[df['village_name'].notna()].reset_index(drop=True)
 
     logger.info(f"Loaded {len(df)} villages")
 
     return df
 
 
-def load_cluster_assignments(conn: sqlite3.Connection, run_id: str) -> Dict[str, pd.DataFrame]:
+CLUSTER_ALGORITHMS = ('kmeans', 'dbscan', 'gmm')
+
+
+def load_cluster_assignments(conn: sqlite3.Connection, run_id: str) -> pd.DataFrame:
     """
     Load cluster assignments from database.
 
+    All algorithms are read in one query and pivoted to one column per
+    algorithm.
+
     Args:
         conn: SQLite database connection
         run_id: Run identifier for clustering results
 
     Returns:
-        Dict mapping algorithm names to DataFrames with cluster assignments
+        DataFrame indexed by village_name with one <algorithm>_cluster_id
+        column per CLUSTER_ALGORITHMS entry (NaN where an algorithm has no
+        assignment)
     """
     logger.info(f"Loading cluster assignments for run_id={run_id}")
 
-    assignments = {}
+    cluster_cols = [f'{algorithm}_cluster_id' for algorithm in CLUSTER_ALGORITHMS]
+    exists = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type='table' AND name='cluster_assignments'"
+    ).fetchone() is not None
+    if not exists:
+        logger.warning("Could not load cluster assignments: no cluster_assignments table")
+        return pd.DataFrame(columns=cluster_cols, index=pd.Index([], name='village_name'))
+
+    placeholders = ','.join('?' for _ in CLUSTER_ALGORITHMS)
+    query = f"""
+        SELECT village_name, algorithm, cluster_id
+        FROM cluster_assignments
+        WHERE run_id = ? AND algorithm IN ({placeholders})
+    """
+    df = pd.read_sql_query(query, conn, params=(run_id, *CLUSTER_ALGORITHMS))
 
-    # Try to load KMeans assignments
-    try:
-        query = """
-            SELECT village_name, cluster_id
-            FROM cluster_assignments
-            WHERE run_id = ? AND algorithm = 'kmeans'
-        """
-        df = pd.read_sql_query(query, conn, params=(run_id,))
-        if len(df) > 0:
-            assignments['kmeans'] = df
-            logger.info(f"Loaded {len(df)} KMeans assignments")
-    except Exception as e:
-        logger.warning(f"Could not load KMeans assignments: {e}")
-
-    # Try to load DBSCAN assignments
-    try:
-        query = """
-            SELECT village_name, cluster_id
-            FROM cluster_assignments
-            WHERE run_id = ? AND algorithm = 'dbscan'
-        """
-        df = pd.read_sql_query(query, conn, params=(run_id,))
-        if len(df) > 0:
-            assignments['dbscan'] = df
-            logger.info(f"Loaded {len(df)} DBSCAN assignments")
-    except Exception as e:
-        logger.warning(f"Could not load DBSCAN assignments: {e}")
-
-    # Try to load GMM assignments
-    try:
-        query = """
-            SELECT village_name, cluster_id
-            FROM cluster_assignments
-            WHERE run_id = ? AND algorithm = 'gmm'
-        """
-        df = pd.read_sql_query(query, conn, params=(run_id,))
-        if len(df) > 0:
-            assignments['gmm'] = df
-            logger.info(f"Loaded {len(df)} GMM assignments")
-    except Exception as e:
-        logger.warning(f"Could not load GMM assignments: {e}")
+    for algorithm, count in df['algorithm'].value_counts().items():
+        logger.info(f"Loaded {count} {algorithm} assignments")
 
-    return assignments
+    # Indexed by village_name so the merge joins against the index
+    wide = (
+        df.drop_duplicates(['village_name', 'algorithm'])
+        .pivot(index='village_name', columns='algorithm', values='cluster_id')
+        .add_suffix('_cluster_id')
+        .reindex(columns=cluster_cols)
+    )
+    wide.columns.name = None
+    return wide
 
 
-def merge_cluster_assignments(villages_df: pd.DataFrame, assignments: Dict[str, pd.DataFrame]) -> pd.DataFrame:
+def merge_cluster_assignments(villages_df: pd.DataFrame, assignments: pd.DataFrame) -> pd.DataFrame:
     """
     Merge cluster assignments into villages DataFrame.
 
     Args:
         villages_df: DataFrame with village data
-        assignments: Dict mapping algorithm names to assignment DataFrames
+        assignments: Assignments indexed by village_name, from
+            load_cluster_assignments
 
     Returns:
-        DataFrame with cluster assignments merged
+        DataFrame with kmeans/dbscan/gmm cluster id columns merged
     """
-    result_df = villages_df.copy()
-
-    # Merge KMeans assignments
-    if 'kmeans' in assignments:
-        result_df = result_df.merge(
-            assignments['kmeans'].rename(columns={'cluster_id': 'kmeans_cluster_id'}),
-            on='village_name',
-            how='left'
-        )
-    else:
-        result_df['kmeans_cluster_id'] = None
-
-    # Merge DBSCAN assignments
-    if 'dbscan' in assignments:
-        result_df = result_df.merge(
-            assignments['dbscan'].rename(columns={'cluster_id': 'dbscan_cluster_id'}),
-            on='village_name',
-            how='left'
-        )
-    else:
-        result_df['dbscan_cluster_id'] = None
-
-    # Merge GMM assignments
-    if 'gmm' in assignments:
-        result_df = result_df.merge(
-            assignments['gmm'].rename(columns={'cluster_id': 'gmm_cluster_id'}),
-            on='village_name',
-            how='left'
-        )
-    else:
-        result_df['gmm_cluster_id'] = None
-
-    return result_df
+    # Single index-aligned join; merge already returns a new frame (and
+    # Copy-on-Write defers copying the village columns)
+    return villages_df.merge(
+        assignments,
+        left_on='village_name',
+        right_index=True,
+        how='left',
+        validate='many_to_one'
+    )
 
 
 def write_village_features(
@@ -174,6 +161,10 @@ def write_village_features(
     """
     Write village features to database.
 
+    Feature rows are staged in a temp table and village_id is attached by
+    joining against the preprocessed table inside SQLite, so that table is
+    never pulled into pandas.
+
     Args:
         conn: SQLite database connection
         run_id: Run identifier (kept for backward compatibility, not used)
@@ -181,45 +172,12 @@ def write_village_features(
         batch_size: Batch size for insertion
     """
     # Filter out rows with NULL village names
-    df = df[df['village_name'].notna()].copy()
+    df = df[df['village_name'].notna()]
 
     logger.info(f"Writing {len(df)} village features to database")
 
-    # Get village_id mapping from preprocessed table
-    logger.info("Loading village_id mapping from preprocessed table...")
-    S = schema
-    id_mapping_query = f"""
-    SELECT
-        {S.city_col}, {S.county_col}, {S.township_col},
-        {S.committee_col_preprocessed}, {S.village_name_col_prefix_removed},
-        {S.village_id_col}
-    FROM {S.preprocessed_table}
-    WHERE {S.village_id_col} IS NOT NULL
-    """
-    id_mapping = pd.read_sql(id_mapping_query, conn)
-
-    # Merge village_id into features dataframe
-    # Match on: city, county, town, village_committee, village_name
-    right_cols = [S.city_col, S.county_col, S.township_col,
-                  S.committee_col_preprocessed, S.village_name_col_prefix_removed]
-    df = df.merge(
-        id_mapping,
-        left_on=[REGION_LEVELS[0], REGION_LEVELS[1], REGION_LEVELS[2], REGION_LEVELS[3], 'village_name'],
-        right_on=right_cols,
-        how='left'
-    )
-
-    # Drop the Chinese column names from merge
-    df = df.drop(columns=right_cols, errors='ignore')
-
-    # Check coverage
-    null_count = df['village_id'].isna().sum()
-    if null_count > 0:
-        logger.warning(f"{null_count} villages could not be mapped to village_id")
-
-    logger.info(f"Successfully mapped village_id for {len(df) - null_count} villages")
-
     cursor = conn.cursor()
+    S = schema
 
     # Load lexicon for dynamic column names
     from src.semantic.lexicon_loader import SemanticLexicon
@@ -233,30 +191,62 @@ def write_village_features(
         'kmeans_cluster_id', 'dbscan_cluster_id', 'gmm_cluster_id',
         'has_valid_chars'
     ]
-
-    # Insert in batches
-    total_batches = (len(df) + batch_size - 1) // batch_size
-    for i in range(0, len(df), batch_size):
-        batch = df.iloc[i:i+batch_size]
+    stage_columns = columns[1:]
+
+    # Align to the staged column order once (missing columns become NULL)
+    # and drop to a plain object array so batches are O(1) slices
+    df_sub = df.reindex(columns=stage_columns)
+    rows = df_sub.astype(object).where(df_sub.notna(), None).to_numpy()
+
+    placeholders = ','.join(['?' for _ in stage_columns])
+    stage_sql = f"INSERT INTO _stage_features VALUES ({placeholders})"
+
+    # Stage in batches, all inside one explicit transaction
+    if not conn.in_transaction:
+        cursor.execute("BEGIN")
+    cursor.execute("DROP TABLE IF EXISTS temp._stage_features")
+    cursor.execute(f"CREATE TEMP TABLE _stage_features ({','.join(stage_columns)})")
+    total_batches = (len(rows) + batch_size - 1) // batch_size
+    for i in range(0, len(rows), batch_size):
         batch_num = i // batch_size + 1
+        cursor.executemany(stage_sql, map(tuple, rows[i:i+batch_size]))
 
-        # Prepare values
-        values = []
-        for _, row in batch.iterrows():
-            values.append(tuple(row[col] if col in row else None for col in columns))
+        logger.info(f"Staged batch {batch_num}/{total_batches}")
 
-        # Insert
-        placeholders = ','.join(['?' for _ in columns])
-        cursor.executemany(f"""
-            INSERT OR REPLACE INTO village_features
-            ({','.join(columns)})
-            VALUES ({placeholders})
-        """, values)
+    # Get village_id from preprocessed table
+    # Match on: city, county, town, village_committee, village_name
+    # (IS matches NULL parts to each other; the village-name index drives it)
+    match = [f"p.{S.village_name_col_prefix_removed} = s.village_name"]
+    for preprocessed_col, level in zip(
+        [S.city_col, S.county_col, S.township_col, S.committee_col_preprocessed], REGION_LEVELS
+    ):
+        match.append(f"p.{preprocessed_col} IS s.{level}")
+    match.append(f"p.{S.village_id_col} IS NOT NULL")
+
+    rowid_floor = cursor.execute("SELECT COALESCE(MAX(rowid), 0) FROM village_features").fetchone()[0]
+    cursor.execute(f"""
+        INSERT OR REPLACE INTO village_features
+        ({','.join(columns)})
+        SELECT p.{S.village_id_col}, {','.join(f's.{col}' for col in stage_columns)}
+        FROM _stage_features s
+        LEFT JOIN {S.preprocessed_table} p ON {' AND '.join(match)}
+        ORDER BY s.rowid, p.rowid
+    """)
+    written = cursor.rowcount
+    cursor.execute("DROP TABLE temp._stage_features")
+
+    # Check coverage
+    null_count = cursor.execute(
+        "SELECT COUNT(*) FROM village_features WHERE rowid > ? AND village_id IS NULL",
+        (rowid_floor,)
+    ).fetchone()[0]
+    if null_count > 0:
+        logger.warning(f"{null_count} villages could not be mapped to village_id")
 
-        logger.info(f"Inserted batch {batch_num}/{total_batches}")
+    logger.info(f"Successfully mapped village_id for {written - null_count} villages")
 
     conn.commit()
-    logger.info(f"Successfully wrote {len(df)} village features")
+    logger.info(f"Successfully wrote {written} village features")
 
 
 def run_feature_materialization_pipeline(
@@ -286,12 +276,16 @@ def run_feature_materialization_pipeline(
 
     # Connect to database
     conn = sqlite3.connect(db_path)
+    configure_bulk_write_pragmas(conn)
+    # village_features is one bounded table; keep its dirty pages in the
+    # page cache until commit rather than spilling them mid-transaction
+    conn.execute("PRAGMA cache_spill=OFF")
 
     try:
         # Create tables
         logger.info("Creating feature materialization tables")
         create_feature_materialization_tables(conn, lexicon_path=lexicon_path)
-        create_feature_materialization_indexes(conn, lexicon_path=lexicon_path)
+        create_feature_materialization_indexes(conn, lexicon_path=lexicon_path, schema=schema)
 
         # Load villages
         villages_df = load_villages(conn, schema=schema)
@@ -299,42 +293,51 @@ def run_feature_materialization_pipeline(
         # Initialize feature extractor
         extractor = VillageFeatureExtractor(lexicon_path)
 
-        # Extract features
-        features_df = extractor.extract_batch(villages_df, village_name_col='village_name')
-
-        # Combine with village data
-        result_df = pd.concat([villages_df, features_df], axis=1)
+        # Extract features straight into the village frame
+        extractor.extract_batch_inplace(villages_df, village_name_col='village_name')
+        result_df = villages_df
 
         # Load and merge cluster assignments if provided
         if clustering_run_id:
             assignments = load_cluster_assignments(conn, clustering_run_id)
             result_df = merge_cluster_assignments(result_df, assignments)
 
-        # Write to database
+        # Write to database; rows written (or replaced) now get rowids above
+        # the current maximum, which scopes the statistics query below
+        rowid_floor = conn.execute("SELECT COALESCE(MAX(rowid), 0) FROM village_features").fetchone()[0]
         write_village_features(conn, run_id, result_df, lexicon_path=lexicon_path, schema=schema)
 
-        # Compute and write region aggregates
-        logger.info("Computing region aggregates")
-        compute_and_write_all_aggregates(conn, run_id)
-
+        # Calculate statistics in one SQLite scan of the rows just written
+        categories = extractor.categories
+        sum_cols = ', '.join(f'SUM(sem_{cat})' for cat in categories)
+        row_count, avg_name_length, *tag_sums = conn.execute(
+            f"SELECT COUNT(*), AVG(name_length), {sum_cols} FROM village_features WHERE rowid > ?",
+            (rowid_floor,)
+        ).fetchone()
+
+        # Export CSV if output directory provided, on a worker thread while
+        # the region aggregates run in SQLite (neither depends on the other)
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            csv_future = None
+            if output_dir:
+                output_path = Path(output_dir)
+                output_path.mkdir(parents=True, exist_ok=True)
+                csv_path = output_path / f"village_features_{run_id}.csv"
+                csv_future = executor.submit(write_csv, result_df, csv_path)
+
+            # Compute and write region aggregates
+            logger.info("Computing region aggregates")
+            compute_and_write_all_aggregates(conn, run_id)
+
+            if csv_future is not None:
+                csv_future.result()
+                logger.info(f"Exported CSV to {csv_path}")
 
-        # Export CSV if output directory provided
-        if output_dir:
-            output_path = Path(output_dir)
-            output_path.mkdir(parents=True, exist_ok=True)
-            csv_path = output_path / f"village_features_{run_id}.csv"
-            result_df.to_csv(csv_path, index=False, encoding='utf-8-sig')
-            logger.info(f"Exported CSV to {csv_path}")
-
-        # Calculate statistics
         stats = {
             'run_id': run_id,
-            'total_villages': int(len(result_df)),
-            'avg_name_length': float(result_df['name_length'].mean()),
-            'semantic_tag_counts': {
-                cat: int(result_df[f'sem_{cat}'].sum())
-                for cat in lexicon.list_categories()
-            },
+            'total_villages': int(row_count),
+            'avg_name_length': float(avg_name_length or 0.0),
+            'semantic_tag_counts': {cat: int(total or 0) for cat, total in zip(categories, tag_sums)},
             'runtime_seconds': float(time.time() - start_time)
         }
 
@@ -363,6 +366,10 @@ def run_feature_generation_pipeline(
 
     start_time = time.time()
     conn = sqlite3.connect(db_path)
+    configure_bulk_write_pragmas(conn)
+    # village_features is one bounded table; keep its dirty pages in the
+    # page cache until commit rather than spilling them mid-transaction
+    conn.execute("PRAGMA cache_spill=OFF")
 
     try:
         S = get_schema(schema_name)
@@ -385,12 +392,10 @@ def run_feature_generation_pipeline(
         logger.info(f"Loaded {len(df):,} villages")
 
         extractor = VillageFeatureExtractor(lexicon_path)
-        features_df = extractor.extract_batch(df, village_name_col='village_name')
-        logger.info(f"Extracted features for {len(features_df)} villages")
+        combined = df.reset_index(drop=True)
+        extractor.extract_batch_inplace(combined, village_name_col='village_name')
+        logger.info(f"Extracted features for {len(combined)} villages")
 
-        df = df.reset_index(drop=True)
-        features_df = features_df.reset_index(drop=True)
-        combined = pd.concat([df, features_df], axis=1)
         combined['run_id'] = run_id
 
         for col in ['kmeans_cluster_id', 'dbscan_cluster_id', 'gmm_cluster_id']:
@@ -408,16 +413,15 @@ def run_feature_generation_pipeline(
             'has_valid_chars', 'kmeans_cluster_id', 'dbscan_cluster_id', 'gmm_cluster_id',
         ]
 
-        for i in range(0, len(df_to_write), batch_size):
-            batch = df_to_write.iloc[i:i + batch_size]
-            values = [tuple(
-                row.get(col) for col in columns_to_write
-            ) for _, row in batch.iterrows()]
-            placeholders = '(' + ','.join(['?'] * len(columns_to_write)) + ')'
-            cursor.executemany(
-                f"INSERT OR REPLACE INTO village_features ({', '.join(columns_to_write)}) VALUES {placeholders}",
-                values,
-            )
+        # Align columns and NULLs once, then stream row tuples per batch
+        df_sub = df_to_write.reindex(columns=columns_to_write)
+        rows = df_sub.astype(object).where(df_sub.notna(), None).to_numpy()
+        placeholders = '(' + ','.join(['?'] * len(columns_to_write)) + ')'
+        insert_sql = f"INSERT OR REPLACE INTO village_features ({', '.join(columns_to_write)}) VALUES {placeholders}"
+
+        for i in range(0, len(rows), batch_size):
+            batch = rows[i:i + batch_size]
+            cursor.executemany(insert_sql, map(tuple, batch))
             if (i // batch_size + 1) % 10 == 0:
                 logger.info(f"  Batch {i // batch_size + 1}: {len(batch)} rows")
 
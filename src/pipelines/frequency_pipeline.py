@@ -1,12 +1,15 @@
 """Main pipeline orchestration for character frequency analysis."""
 
 import logging
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from datetime import datetime
+import numpy as np
 import pandas as pd
 from typing import List
 
 from ..utils.config import PipelineConfig
+from ..utils.csv_writer import write_csv
 from ..data.db_loader import (
     get_db_connection, validate_database_schema,
     load_villages, get_total_village_count
@@ -23,6 +26,32 @@ from ..analysis.diagnostic_reports import create_comprehensive_report
 
 logger = logging.getLogger(__name__)
 
+# Villages frame handed to each level worker once, at process start
+_worker_villages = None
+
+
+def _init_level_worker(villages_df: pd.DataFrame):
+    global _worker_villages
+    _worker_villages = villages_df
+
+
+def _level_frequency(level: str) -> pd.DataFrame:
+    return compute_char_frequency_by_region(_worker_villages, level)
+
+
+def _level_tendency(freq_df: pd.DataFrame, global_freq: pd.DataFrame, tendency_config) -> pd.DataFrame:
+    # Add global stats and compute lift
+    freq_with_lift = calculate_lift(freq_df, global_freq)
+
+    # Compute tendency metrics
+    return compute_regional_tendency(
+        freq_with_lift,
+        smoothing_alpha=tendency_config.smoothing_alpha,
+        min_global_support=tendency_config.min_global_support,
+        min_regional_support=tendency_config.min_regional_support,
+        compute_z=tendency_config.compute_z_score
+    )
+
 
 class CharacterFrequencyPipeline:
     """Pipeline for character frequency analysis."""
@@ -107,8 +136,11 @@ class CharacterFrequencyPipeline:
         # Get total count
         total_count = get_total_village_count(conn, schema=self.schema)
 
-        # Load and process in chunks
-        all_chunks = []
+        # Load and process in chunks, filling preallocated column buffers
+        # rather than concatenating a list of chunks at the end, so the
+        # processed rows are held once instead of twice
+        buffers = {}
+        filled = 0
         chunk_num = 0
 
         for chunk in load_villages(conn, chunk_size=self.config.frequency.chunk_size, schema=self.schema):
@@ -123,12 +155,31 @@ class CharacterFrequencyPipeline:
                 min_name_length=self.config.cleaning.min_name_length
             )
 
-            all_chunks.append(processed)
+            if not buffers:
+                buffers = {
+                    col: np.empty(
+                        total_count,
+                        dtype=processed[col].dtype if processed[col].dtype.kind in 'biuf' else object
+                    )
+                    for col in processed.columns
+                }
+            end = filled + len(processed)
+            for col, buf in buffers.items():
+                buf[filled:end] = processed[col].to_numpy()
+            filled = end
 
         conn.close()
 
-        # Combine all chunks
-        villages_df = pd.concat(all_chunks, ignore_index=True)
+        # Wrap the filled slices without copying them
+        villages_df = pd.DataFrame(
+            {col: buf[:filled] for col, buf in buffers.items()}, copy=False
+        )
+
+        # Region names repeat across hundreds of thousands of rows;
+        # dictionary-encode them once so the per-level groupbys run on codes
+        region_cols = [self.schema.city_col, self.schema.county_col, self.schema.township_col]
+        region_cols = [col for col in region_cols if col in villages_df.columns]
+        villages_df[region_cols] = villages_df[region_cols].astype('category')
 
         logger.info(f"Loaded {len(villages_df):,} villages total")
 
@@ -146,27 +197,47 @@ class CharacterFrequencyPipeline:
 
         # Save
         output_path = self.output_dir / "char_frequency_global.csv"
-        global_freq.to_csv(output_path, index=False, encoding='utf-8-sig')
+        write_csv(global_freq, output_path)
         logger.info(f"Saved global frequencies to {output_path}")
 
         return global_freq
 
+    def _level_workers(self, num_levels: int) -> int:
+        """Number of worker processes to use for per-level computation."""
+        n_jobs = self.config.frequency.n_jobs
+        return num_levels if n_jobs == -1 else min(n_jobs, num_levels)
+
     def _compute_regional_frequencies(
         self,
         villages_df: pd.DataFrame
     ) -> dict:
         """Compute regional frequencies for all configured levels."""
-        regional_freqs = {}
-
-        for level in self.config.frequency.region_levels:
-            logger.info(f"Computing {level}-level frequencies...")
-
-            freq_df = compute_char_frequency_by_region(villages_df, level)
-            regional_freqs[level] = freq_df
+        levels = list(self.config.frequency.region_levels)
+        workers = self._level_workers(len(levels))
+
+        if workers > 1:
+            # Levels are independent scans; the frame goes to each worker
+            # once through the initializer rather than with every task
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_init_level_worker,
+                initargs=(villages_df,)
+            ) as executor:
+                futures = {}
+                for level in levels:
+                    logger.info(f"Computing {level}-level frequencies...")
+                    futures[level] = executor.submit(_level_frequency, level)
+                regional_freqs = {level: future.result() for level, future in futures.items()}
+        else:
+            regional_freqs = {}
+            for level in levels:
+                logger.info(f"Computing {level}-level frequencies...")
+                regional_freqs[level] = compute_char_frequency_by_region(villages_df, level)
 
+        for level, freq_df in regional_freqs.items():
             # Save
             output_path = self.output_dir / f"char_frequency_{level}.csv"
-            freq_df.to_csv(output_path, index=False, encoding='utf-8-sig')
+            write_csv(freq_df, output_path)
             logger.info(f"Saved {level} frequencies to {output_path}")
 
         return regional_freqs
@@ -177,27 +248,30 @@ class CharacterFrequencyPipeline:
         global_freq: pd.DataFrame
     ):
         """Compute regional tendency metrics for all levels."""
-        for level, freq_df in regional_freqs.items():
-            logger.info(f"Computing {level}-level tendencies...")
-
-            # Add global stats and compute lift
-            freq_with_lift = calculate_lift(freq_df, global_freq)
-
-            # Compute tendency metrics
-            tendency_df = compute_regional_tendency(
-                freq_with_lift,
-                smoothing_alpha=self.config.tendency.smoothing_alpha,
-                min_global_support=self.config.tendency.min_global_support,
-                min_regional_support=self.config.tendency.min_regional_support,
-                compute_z=self.config.tendency.compute_z_score
-            )
-
+        workers = self._level_workers(len(regional_freqs))
+
+        if workers > 1:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                futures = {}
+                for level, freq_df in regional_freqs.items():
+                    logger.info(f"Computing {level}-level tendencies...")
+                    futures[level] = executor.submit(
+                        _level_tendency, freq_df, global_freq, self.config.tendency
+                    )
+                tendencies = {level: future.result() for level, future in futures.items()}
+        else:
+            tendencies = {}
+            for level, freq_df in regional_freqs.items():
+                logger.info(f"Computing {level}-level tendencies...")
+                tendencies[level] = _level_tendency(freq_df, global_freq, self.config.tendency)
+
+        for level, tendency_df in tendencies.items():
             # Add run_id
             tendency_df.insert(0, 'run_id', self.config.run_id)
 
             # Save
             output_path = self.output_dir / f"regional_tendency_{level}.csv"
-            tendency_df.to_csv(output_path, index=False, encoding='utf-8-sig')
+            write_csv(tendency_df, output_path)
             logger.info(f"Saved {level} tendencies to {output_path}")
 
             # Generate diagnostic report
@@ -208,7 +282,7 @@ class CharacterFrequencyPipeline:
     def _save_cleaned_villages(self, villages_df: pd.DataFrame):
         """Save cleaned villages to CSV."""
         output_path = self.output_dir / "village_cleaned.csv"
-        villages_df.to_csv(output_path, index=False, encoding='utf-8-sig')
+        write_csv(villages_df, output_path)
         logger.info(f"Saved cleaned villages to {output_path}")
 
     def _generate_cleaning_report(self, villages_df: pd.DataFrame):
@@ -220,8 +294,13 @@ class CharacterFrequencyPipeline:
             f.write("Village Name Cleaning Report\n")
             f.write("=" * 80 + "\n\n")
 
+            # All flag counts in one reduction; the validity mask is reused
+            # for the reason and length breakdowns below
+            flag_counts = villages_df[['is_valid', 'had_brackets', 'had_noise']].sum()
+            valid_mask = villages_df['is_valid'].to_numpy(dtype=bool)
+
             total = len(villages_df)
-            valid = villages_df['is_valid'].sum()
+            valid = flag_counts['is_valid']
             invalid = total - valid
 
             f.write(f"Total villages: {total:,}\n")
@@ -229,35 +308,35 @@ class CharacterFrequencyPipeline:
             f.write(f"Invalid villages: {invalid:,} ({invalid/total*100:.2f}%)\n\n")
 
             # Bracket statistics
-            had_brackets = villages_df['had_brackets'].sum()
+            had_brackets = flag_counts['had_brackets']
             f.write(f"Villages with brackets: {had_brackets:,} ({had_brackets/total*100:.2f}%)\n")
 
             # Noise statistics
-            had_noise = villages_df['had_noise'].sum()
+            had_noise = flag_counts['had_noise']
             f.write(f"Villages with noise: {had_noise:,} ({had_noise/total*100:.2f}%)\n\n")
 
             # Invalid reasons
             if invalid > 0:
                 f.write("Invalid reasons:\n")
-                reason_counts = villages_df[~villages_df['is_valid']]['invalid_reason'].value_counts()
+                reason_counts = villages_df.loc[~valid_mask, 'invalid_reason'].value_counts()
                 for reason, count in reason_counts.items():
                     f.write(f"  - {reason}: {count:,}\n")
                 f.write("\n")
 
             # Name length statistics
-            valid_df = villages_df[villages_df['is_valid']]
-            if len(valid_df) > 0:
+            valid_lens = villages_df['name_len'].to_numpy()[valid_mask]
+            if len(valid_lens) > 0:
                 f.write("Name length statistics (valid villages):\n")
-                f.write(f"  - Mean: {valid_df['name_len'].mean():.2f}\n")
-                f.write(f"  - Median: {valid_df['name_len'].median():.0f}\n")
-                f.write(f"  - Min: {valid_df['name_len'].min()}\n")
-                f.write(f"  - Max: {valid_df['name_len'].max()}\n\n")
+                f.write(f"  - Mean: {valid_lens.mean():.2f}\n")
+                f.write(f"  - Median: {np.median(valid_lens):.0f}\n")
+                f.write(f"  - Min: {valid_lens.min()}\n")
+                f.write(f"  - Max: {valid_lens.max()}\n\n")
 
                 # Length distribution
                 f.write("Length distribution:\n")
-                len_dist = valid_df['name_len'].value_counts().sort_index()
-                for length, count in len_dist.head(10).items():
-                    f.write(f"  - {length} chars: {count:,} ({count/len(valid_df)*100:.2f}%)\n")
+                lengths, counts = np.unique(valid_lens, return_counts=True)
+                for length, count in zip(lengths[:10], counts[:10]):
+                    f.write(f"  - {length} chars: {count:,} ({count/len(valid_lens)*100:.2f}%)\n")
 
         logger.info(f"Saved cleaning report to {output_path}")
 
@@ -1,12 +1,14 @@
 """Main pipeline orchestration for morphology pattern analysis."""
 
 import logging
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
 import pandas as pd
 from typing import List
 
 from ..utils.config import PipelineConfig
+from ..utils.csv_writer import write_csv
 from src.schema import get_schema
 from ..data.db_loader import (
     get_db_connection, validate_database_schema,
@@ -14,14 +16,116 @@ from ..data.db_loader import (
 )
 from ..preprocessing.morphology_extractor import extract_morphology_features
 from ..analysis.morphology_frequency import (
-    compute_pattern_frequency_global,
-    compute_pattern_frequency_by_region,
+    count_patterns,
+    compute_pattern_frequencies,
     calculate_pattern_lift
 )
 from ..analysis.regional_analysis import compute_regional_tendency
 
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
+_worker_villages = None
+
+
+def _init_pattern_worker(villages_df: pd.DataFrame):
+    global _worker_villages
+    _worker_villages = villages_df
+
+
+def _pattern_worker(pattern_col: str, output_dir: Path, region_levels: List[str], tendency_config):
+    _analyze_pattern(_worker_villages, pattern_col, output_dir, region_levels, tendency_config)
+
+
+def _top_patterns(patterns: pd.Series, top_k: int):
+    """
+    Unique count and top-k (pattern, count) pairs of a pattern column.
+
+    Uses Arrow's hash value_counts when pyarrow is installed, else
+    count_patterns; both order by count descending, ties by first
+    appearance, nulls excluded.
+
+    Args:
+        patterns: Pattern column (object, string or categorical)
+        top_k: Number of top patterns to return
+
+    Returns:
+        Tuple of (unique pattern count, [(pattern, count), ...])
+    """
+    if not PYARROW_AVAILABLE:
+        counts = count_patterns(patterns)
+        return counts.size, list(counts.head(top_k).items())
+
+    column = pa.array(patterns, from_pandas=True)
+    if pa.types.is_dictionary(column.type):
+        column = column.dictionary_decode()
+    value_counts = pc.value_counts(pc.drop_null(column))
+    order = pc.array_sort_indices(value_counts.field('counts'), order='descending')
+    top = value_counts.take(order[:top_k])
+    return len(value_counts), list(zip(top.field('values').to_pylist(), top.field('counts').to_pylist()))
+
+
+def _analyze_pattern(
+    villages_df: pd.DataFrame,
+    pattern_col: str,
+    output_dir: Path,
+    region_levels: List[str],
+    tendency_config
+):
+    """Analyze a single pattern type and save its frequency/tendency CSVs."""
+    # Compute global and regional frequencies in one pass
+    logger.info(f"Computing frequencies for {pattern_col}...")
+    global_freq, regional_freqs = compute_pattern_frequencies(villages_df, pattern_col, region_levels)
+
+    # CSV writes run on background threads, overlapping the next level's
+    # computation; the frames handed over are not modified afterwards
+    with ThreadPoolExecutor(max_workers=2) as io_executor:
+        writes = []
+
+        # Save
+        output_path = output_dir / f"{pattern_col}_frequency_global.csv"
+        writes.append((io_executor.submit(write_csv, global_freq, output_path), f"Saved to {output_path}"))
+
+        # Save regional frequencies and compute tendencies
+        for level in region_levels:
+            regional_freq = regional_freqs[level]
+
+            # Save regional frequency
+            output_path = output_dir / f"{pattern_col}_frequency_{level}.csv"
+            writes.append((io_executor.submit(write_csv, regional_freq, output_path), None))
+
+            # Add global stats and compute lift
+            freq_with_lift = calculate_pattern_lift(regional_freq, global_freq)
+
+            # Compute tendency metrics
+            tendency_df = compute_regional_tendency(
+                freq_with_lift,
+                smoothing_alpha=tendency_config.smoothing_alpha,
+                min_global_support=tendency_config.min_global_support,
+                min_regional_support=tendency_config.min_regional_support,
+                compute_z=tendency_config.compute_z_score
+            )
+
+            # Save tendency
+            output_path = output_dir / f"{pattern_col}_tendency_{level}.csv"
+            writes.append((
+                io_executor.submit(write_csv, tendency_df, output_path),
+                f"Saved {level} tendencies to {output_path}"
+            ))
+
+        # Wait for every write (re-raises write errors)
+        for future, message in writes:
+            future.result()
+            if message:
+                logger.info(message)
+
 
 class MorphologyPipeline:
     """Pipeline for morphology pattern analysis (suffix/prefix)."""
@@ -100,6 +204,23 @@ class MorphologyPipeline:
             logger.error(f"Pipeline failed: {e}", exc_info=True)
             raise
 
+    def _morphology_schema(self) -> 'pa.Schema':
+        """
+        Arrow schema for the Parquet morphology output.
+
+        Declared up front rather than inferred from the first chunk: a pattern
+        column that is all None in that chunk (e.g. suffix_3 when every name
+        has two characters) would otherwise be typed null and later chunks
+        could not be written.
+        """
+        pattern_cols = [f'suffix_{n}' for n in self.suffix_lengths] + [f'prefix_{n}' for n in self.prefix_lengths]
+        return pa.schema(
+            [pa.field(col, pa.string()) for col in ['市级', '区县级', '乡镇级', 'raw_name', 'clean_name']]
+            + [pa.field('name_len', pa.int64()), pa.field('is_valid', pa.bool_()),
+               pa.field('invalid_reason', pa.string())]
+            + [pa.field(col, pa.string()) for col in pattern_cols]
+        )
+
     def _load_and_extract_morphology(self) -> pd.DataFrame:
         """Load villages from database and extract morphology features."""
         # Connect to database
@@ -113,7 +234,10 @@ class MorphologyPipeline:
         total_count = get_total_village_count(conn, schema=self.schema)
         logger.info(f"Total villages in database: {total_count:,}")
 
-        # Load and process in chunks
+        # Load and process in chunks. With pyarrow each chunk is appended to
+        # the Parquet output as a row group, so only one chunk is held at a time
+        output_path = self.output_dir / "village_morphology.parquet"
+        writer = None
         all_chunks = []
         chunk_num = 0
 
@@ -131,20 +255,38 @@ class MorphologyPipeline:
                 min_name_length=self.config.cleaning.min_name_length
             )
 
-            all_chunks.append(processed)
+            if PYARROW_AVAILABLE:
+                table = pa.Table.from_pandas(
+                    processed,
+                    schema=writer.schema if writer is not None else self._morphology_schema(),
+                    preserve_index=False
+                )
+                if writer is None:
+                    writer = pq.ParquetWriter(output_path, table.schema, compression='zstd')
+                writer.write_table(table)
+            else:
+                all_chunks.append(processed)
 
         conn.close()
 
-        # Combine all chunks
-        villages_df = pd.concat(all_chunks, ignore_index=True)
+        if writer is not None:
+            writer.close()
+            villages_df = pd.read_parquet(output_path)
+        else:
+            # Combine all chunks and save morphology features
+            villages_df = pd.concat(all_chunks, ignore_index=True)
+            output_path = self.output_dir / "village_morphology.csv"
+            write_csv(villages_df, output_path)
 
         logger.info(f"Loaded {len(villages_df):,} villages total")
-
-        # Save morphology features
-        output_path = self.output_dir / "village_morphology.csv"
-        villages_df.to_csv(output_path, index=False, encoding='utf-8-sig')
         logger.info(f"Saved morphology features to {output_path}")
 
+        # Dictionary-encode the low-cardinality pattern columns so counting
+        # and grouping hash integer codes instead of strings
+        for col in [f'suffix_{n}' for n in self.suffix_lengths] + [f'prefix_{n}' for n in self.prefix_lengths]:
+            if col in villages_df.columns:
+                villages_df[col] = villages_df[col].astype('category')
+
         return villages_df
 
     def _analyze_all_patterns(self, villages_df: pd.DataFrame):
@@ -158,50 +300,40 @@ class MorphologyPipeline:
 
         logger.info(f"Analyzing {len(pattern_cols)} pattern types: {pattern_cols}")
 
-        for pattern_col in pattern_cols:
-            logger.info(f"\n--- Analyzing {pattern_col} ---")
-            self._analyze_single_pattern(villages_df, pattern_col)
+        workers = self._pattern_workers(len(pattern_cols))
+        if workers > 1:
+            # Pattern types are independent; each worker receives the
+            # villages once via the initializer
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_init_pattern_worker,
+                initargs=(villages_df,)
+            ) as executor:
+                futures = []
+                for pattern_col in pattern_cols:
+                    logger.info(f"\n--- Analyzing {pattern_col} ---")
+                    futures.append(executor.submit(
+                        _pattern_worker, pattern_col, self.output_dir,
+                        list(self.config.frequency.region_levels), self.config.tendency
+                    ))
+                for future in futures:
+                    future.result()
+        else:
+            for pattern_col in pattern_cols:
+                logger.info(f"\n--- Analyzing {pattern_col} ---")
+                self._analyze_single_pattern(villages_df, pattern_col)
+
+    def _pattern_workers(self, num_patterns: int) -> int:
+        """Number of worker processes to use for per-pattern analysis."""
+        n_jobs = self.config.frequency.n_jobs
+        return num_patterns if n_jobs == -1 else min(n_jobs, num_patterns)
 
     def _analyze_single_pattern(self, villages_df: pd.DataFrame, pattern_col: str):
         """Analyze a single pattern type."""
-        # Compute global frequency
-        logger.info(f"Computing global frequencies for {pattern_col}...")
-        global_freq = compute_pattern_frequency_global(villages_df, pattern_col)
-
-        # Save
-        output_path = self.output_dir / f"{pattern_col}_frequency_global.csv"
-        global_freq.to_csv(output_path, index=False, encoding='utf-8-sig')
-        logger.info(f"Saved to {output_path}")
-
-        # Compute regional frequencies and tendencies
-        for level in self.config.frequency.region_levels:
-            logger.info(f"Computing {level}-level frequencies for {pattern_col}...")
-
-            # Regional frequency
-            regional_freq = compute_pattern_frequency_by_region(
-                villages_df, level, pattern_col
-            )
-
-            # Save regional frequency
-            output_path = self.output_dir / f"{pattern_col}_frequency_{level}.csv"
-            regional_freq.to_csv(output_path, index=False, encoding='utf-8-sig')
-
-            # Add global stats and compute lift
-            freq_with_lift = calculate_pattern_lift(regional_freq, global_freq)
-
-            # Compute tendency metrics
-            tendency_df = compute_regional_tendency(
-                freq_with_lift,
-                smoothing_alpha=self.config.tendency.smoothing_alpha,
-                min_global_support=self.config.tendency.min_global_support,
-                min_regional_support=self.config.tendency.min_regional_support,
-                compute_z=self.config.tendency.compute_z_score
-            )
-
-            # Save tendency
-            output_path = self.output_dir / f"{pattern_col}_tendency_{level}.csv"
-            tendency_df.to_csv(output_path, index=False, encoding='utf-8-sig')
-            logger.info(f"Saved {level} tendencies to {output_path}")
+        _analyze_pattern(
+            villages_df, pattern_col, self.output_dir,
+            self.config.frequency.region_levels, self.config.tendency
+        )
 
     def _generate_summary_report(self, villages_df: pd.DataFrame):
         """Generate summary statistics report."""
@@ -226,29 +358,20 @@ class MorphologyPipeline:
             f.write(f"  Suffix lengths: {self.suffix_lengths}\n")
             f.write(f"  Prefix lengths: {self.prefix_lengths}\n\n")
 
-            # Sample patterns for each type
-            valid_df = villages_df[villages_df['is_valid']]
-
-            for n in self.suffix_lengths:
-                col = f'suffix_{n}'
-                if col in valid_df.columns:
-                    unique_count = valid_df[col].nunique()
-                    top_patterns = valid_df[col].value_counts().head(10)
-                    f.write(f"\n{col} - {unique_count:,} unique patterns:\n")
-                    f.write("-" * 60 + "\n")
-                    for pattern, count in top_patterns.items():
-                        freq = count / len(valid_df)
-                        f.write(f"  {pattern:<10} {count:>8,} ({freq:>6.2%})\n")
-
-            for n in self.prefix_lengths:
-                col = f'prefix_{n}'
-                if col in valid_df.columns:
-                    unique_count = valid_df[col].nunique()
-                    top_patterns = valid_df[col].value_counts().head(10)
-                    f.write(f"\n{col} - {unique_count:,} unique patterns:\n")
-                    f.write("-" * 60 + "\n")
-                    for pattern, count in top_patterns.items():
-                        freq = count / len(valid_df)
-                        f.write(f"  {pattern:<10} {count:>8,} ({freq:>6.2%})\n")
+            # Sample patterns for each type; prune to the pattern columns and
+            # take unique count and top patterns from one counting pass
+            pattern_cols = [f'suffix_{n}' for n in self.suffix_lengths] + \
+                [f'prefix_{n}' for n in self.prefix_lengths]
+            pattern_cols = [col for col in pattern_cols if col in villages_df.columns]
+            valid_df = villages_df.loc[villages_df['is_valid'], pattern_cols]
+            n_valid = len(valid_df)
+
+            for col in pattern_cols:
+                unique_count, top_patterns = _top_patterns(valid_df[col], 10)
+                f.write(f"\n{col} - {unique_count:,} unique patterns:\n")
+                f.write("-" * 60 + "\n")
+                for pattern, count in top_patterns:
+                    freq = count / n_valid
+                    f.write(f"  {pattern:<10} {count:>8,} ({freq:>6.2%})\n")
 
         logger.info(f"Saved summary report to {output_path}")
@@ -8,14 +8,75 @@ import sqlite3
 import logging
 import time
 import json
-from typing import Dict, List
+from collections import defaultdict
+from typing import Dict, List, Optional
 import pandas as pd
-import numpy as np
 from src.schema import REGION_LEVELS
 
 logger = logging.getLogger(__name__)
 
 
+def _ranked_value_counts(
+    conn: sqlite3.Connection,
+    run_id: str,
+    group_cols: List[str],
+    col: str,
+    top_n: Optional[int] = None
+) -> Dict[tuple, List[tuple]]:
+    """
+    Count and rank the values of a column within each region in SQLite.
+
+    Values are ranked like value_counts(): by count descending, ties in
+    order of first appearance (lowest rowid), NULL excluded.
+
+    Args:
+        conn: SQLite database connection
+        run_id: Run identifier
+        group_cols: Region grouping columns
+        col: Column whose values are counted
+        top_n: Keep only the top N values per region (optional)
+
+    Returns:
+        Dict mapping region key tuples to [(value, count), ...]
+    """
+    group_sql = ', '.join(group_cols)
+    not_null = ' AND '.join(f'{c} IS NOT NULL' for c in group_cols + [col])
+
+    if top_n is None:
+        # Full distribution: no per-region cut-off, so one grouped count
+        # ordered within each region is enough (no window function)
+        cursor = conn.execute(f"""
+            SELECT {group_sql}, {col} AS value, COUNT(*) AS c
+            FROM village_features
+            WHERE run_id = ? AND {not_null}
+            GROUP BY {group_sql}, {col}
+            ORDER BY {group_sql}, c DESC, MIN(rowid)
+        """, (run_id,))
+    else:
+        cursor = conn.execute(f"""
+            WITH counts AS (
+                SELECT {group_sql}, {col} AS value, COUNT(*) AS c,
+                       ROW_NUMBER() OVER (
+                           PARTITION BY {group_sql}
+                           ORDER BY COUNT(*) DESC, MIN(rowid)
+                       ) AS rn
+                FROM village_features
+                WHERE run_id = ? AND {not_null}
+                GROUP BY {group_sql}, {col}
+            )
+            SELECT {group_sql}, value, c
+            FROM counts
+            WHERE rn <= ?
+            ORDER BY {group_sql}, rn
+        """, (run_id, top_n))
+
+    ranked = defaultdict(list)
+    n_keys = len(group_cols)
+    for row in cursor:
+        ranked[row[:n_keys]].append((row[n_keys], row[n_keys + 1]))
+    return ranked
+
+
 def compute_region_aggregates(
     conn: sqlite3.Connection,
     run_id: str,
@@ -25,6 +86,10 @@ def compute_region_aggregates(
     """
     Compute region-level aggregates.
 
+    All grouping runs inside SQLite (GROUP BY for the region statistics,
+    ROW_NUMBER() for the top-N rankings), so only one row per region and
+    top-N value is transferred into Python.
+
     Args:
         conn: SQLite database connection
         run_id: Run identifier
@@ -46,69 +111,79 @@ def compute_region_aggregates(
     else:
         raise ValueError(f"Invalid region_level: {region_level}")
 
-    # Load village features
-    query = f"""
-        SELECT *
-        FROM village_features
-        WHERE run_id = ?
-    """
-    df = pd.read_sql_query(query, conn, params=(run_id,))
-
-    logger.info(f"Loaded {len(df)} village features")
-
     from src.semantic.lexicon_loader import SemanticLexicon
     lexicon = SemanticLexicon('data/semantic_lexicon_v1.json')
+    sem_cols = [f'sem_{cat}' for cat in lexicon.list_categories()]
 
-    # Group by region
-    aggregates = []
-
-    for region_values, group in df.groupby(group_cols):
-        if not isinstance(region_values, tuple):
-            region_values = (region_values,)
-
-        agg = {}
-
-        # Region identification
-        for i, col in enumerate(group_cols):
-            agg[col] = region_values[i]
-
-        # Basic statistics
-        agg['total_villages'] = len(group)
-        agg['avg_name_length'] = group['name_length'].mean()
-
-        # Semantic tag counts and percentages
-        for cat in lexicon.list_categories():
-            col_name = f'sem_{cat}'
-            agg[f'{col_name}_count'] = group[col_name].sum()
-            agg[f'{col_name}_pct'] = (group[col_name].sum() / len(group)) * 100
-
-        # Top suffixes
-        suffix_counts = group['suffix_2'].value_counts().head(top_n)
-        agg['top_suffixes_json'] = json.dumps(
-            [{'suffix': k, 'count': int(v)} for k, v in suffix_counts.items()],
-            ensure_ascii=False
-        )
-
-        # Top prefixes
-        prefix_counts = group['prefix_2'].value_counts().head(top_n)
-        agg['top_prefixes_json'] = json.dumps(
-            [{'prefix': k, 'count': int(v)} for k, v in prefix_counts.items()],
+    # Basic statistics and semantic tag counts, one row per region
+    group_sql = ', '.join(group_cols)
+    sem_sql = ''.join(f',\n               COALESCE(SUM({col}), 0) AS {col}_count' for col in sem_cols)
+    query = f"""
+        SELECT {group_sql},
+               COUNT(*) AS total_villages,
+               AVG(name_length) AS avg_name_length{sem_sql}
+        FROM village_features
+        WHERE run_id = ? AND {' AND '.join(f'{c} IS NOT NULL' for c in group_cols)}
+        GROUP BY {group_sql}
+        ORDER BY {group_sql}
+    """
+    base = pd.read_sql_query(query, conn, params=(run_id,))
+
+    logger.info(f"Loaded aggregates for {len(base)} regions")
+
+    if base.empty:
+        logger.info("Computed aggregates for 0 regions")
+        return pd.DataFrame()
+
+    # All-NULL name lengths come back as object dtype
+    base['avg_name_length'] = pd.to_numeric(base['avg_name_length'])
+
+    # Semantic tag percentages: each count is read once and scaled by the
+    # region's 100/total (one divide per region, not per category), then
+    # interleaved with the counts
+    count_cols = [f'{col}_count' for col in sem_cols]
+    pct_cols = [f'{col}_pct' for col in sem_cols]
+    pct_scale = 100.0 / base['total_villages'].to_numpy()
+    pct = pd.DataFrame(
+        base[count_cols].to_numpy() * pct_scale[:, None],
+        columns=pct_cols,
+        index=base.index
+    )
+    stat_cols = group_cols + ['total_villages', 'avg_name_length']
+    for count_col, pct_col in zip(count_cols, pct_cols):
+        stat_cols += [count_col, pct_col]
+    base = pd.concat([base, pct], axis=1)[stat_cols]
+
+    # Top suffixes/prefixes and cluster distribution per region
+    region_keys = list(base[group_cols].itertuples(index=False, name=None))
+
+    top_suffixes = _ranked_value_counts(conn, run_id, group_cols, 'suffix_2', top_n)
+    base['top_suffixes_json'] = [
+        json.dumps([{'suffix': k, 'count': v} for k, v in top_suffixes.get(key, [])], ensure_ascii=False)
+        for key in region_keys
+    ]
+
+    top_prefixes = _ranked_value_counts(conn, run_id, group_cols, 'prefix_2', top_n)
+    base['top_prefixes_json'] = [
+        json.dumps([{'prefix': k, 'count': v} for k, v in top_prefixes.get(key, [])], ensure_ascii=False)
+        for key in region_keys
+    ]
+
+    feature_cols = {row[1] for row in conn.execute("PRAGMA table_info(village_features)")}
+    cluster_counts = {
+        algo: _ranked_value_counts(conn, run_id, group_cols, f'{algo}_cluster_id')
+        for algo in ['kmeans', 'dbscan', 'gmm']
+        if f'{algo}_cluster_id' in feature_cols
+    }
+    base['cluster_distribution_json'] = [
+        json.dumps(
+            {algo: {int(k): v for k, v in counts.get(key, [])} for algo, counts in cluster_counts.items()},
             ensure_ascii=False
         )
+        for key in region_keys
+    ]
 
-        # Cluster distribution
-        cluster_dist = {}
-        for algo in ['kmeans', 'dbscan', 'gmm']:
-            col_name = f'{algo}_cluster_id'
-            if col_name in group.columns:
-                dist = group[col_name].value_counts().to_dict()
-                cluster_dist[algo] = {int(k): int(v) for k, v in dist.items() if pd.notna(k)}
-
-        agg['cluster_distribution_json'] = json.dumps(cluster_dist, ensure_ascii=False)
-
-        aggregates.append(agg)
-
-    result_df = pd.DataFrame(aggregates)
+    result_df = base
     logger.info(f"Computed aggregates for {len(result_df)} regions")
 
     return result_df
@@ -144,15 +219,15 @@ def write_region_aggregates(
     # Prepare columns
     columns = list(df.columns)
 
-    # Insert
+    # Insert (NaN -> NULL once, then stream plain row tuples)
     placeholders = ','.join(['?' for _ in columns])
-    values = [tuple(row[col] if col in row else None for col in columns) for _, row in df.iterrows()]
+    rows = df[columns].astype(object).where(df[columns].notna(), None)
 
     cursor.executemany(f"""
         INSERT OR REPLACE INTO {table_name}
         ({','.join(columns)})
         VALUES ({placeholders})
-    """, values)
+    """, rows.itertuples(index=False, name=None))
 
     conn.commit()
     logger.info(f"Successfully wrote {len(df)} {region_level}-level aggregates")
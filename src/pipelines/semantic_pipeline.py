@@ -11,7 +11,6 @@ This pipeline:
 """
 
 import logging
-import sqlite3
 import time
 from pathlib import Path
 from typing import List, Optional
@@ -22,8 +21,10 @@ from src.schema import REGION_LEVELS, get_schema
 from src.semantic.lexicon_loader import SemanticLexicon
 from src.semantic.vtf_calculator import VTFCalculator
 from src.semantic.semantic_index import SemanticIndexCalculator
+from src.data.db_loader import get_db_connection
 from src.data.db_writer import (
     create_analysis_tables,
+    create_indexes,
     create_semantic_tables,
     write_semantic_vtf_global,
     write_semantic_indices,
@@ -74,11 +75,12 @@ def run_semantic_analysis_pipeline(
 
     # Step 2: Connect to database and load character frequency data
     logger.info("\\n=== Step 2: Loading character frequency data ===")
-    conn = sqlite3.connect(db_path)
+    conn = get_db_connection(db_path)
 
     try:
         # Create tables if needed
         create_analysis_tables(conn)
+        create_indexes(conn)
         create_semantic_tables(conn)
 
         # Load global character frequency (no run_id after database optimization)
@@ -88,12 +90,15 @@ def run_semantic_analysis_pipeline(
         """, conn)
         logger.info(f"Loaded {len(global_char_df)} global character frequencies")
 
-        # Load regional character frequency (from char_regional_analysis after optimization)
-        regional_char_df = pd.read_sql_query("""
+        # Load regional character frequency (from char_regional_analysis after optimization),
+        # only for the requested levels so idx_regional_level can serve the lookup
+        level_placeholders = ','.join('?' for _ in region_levels)
+        regional_char_df = pd.read_sql_query(f"""
             SELECT region_level, region_name, char as character,
                    village_count, total_villages, frequency
             FROM char_regional_analysis
-        """, conn)
+            WHERE region_level IN ({level_placeholders})
+        """, conn, params=tuple(region_levels))
         logger.info(f"Loaded {len(regional_char_df)} regional character frequencies")
 
         # Step 3: Calculate VTF
@@ -124,8 +124,10 @@ def run_spatial_analysis_pipeline(
         clusterer = SpatialClusterer(eps_km=eps_km, min_samples=min_samples, method=method)
         labels = clusterer.fit(coords)
 
-        n_clusters = len(set(labels)) - (1 if -1 in labels else 0)
-        n_noise = list(labels).count(-1)
+        unique_labels, label_counts = np.unique(labels, return_counts=True)
+        is_noise = unique_labels == -1
+        n_clusters = int(len(unique_labels) - is_noise.sum())
+        n_noise = int(label_counts[is_noise].sum())
         logger.info(f"Found {n_clusters} spatial clusters")
         logger.info(f"Noise points: {n_noise} ({n_noise/n_villages*100:.1f}%)")
 
@@ -146,12 +148,9 @@ def run_spatial_analysis_pipeline(
         logger.info("Step 7: Calculating regional aggregates")
         logger.info("="*80)
 
-        aggregates_list = []
-        for region_level in [REGION_LEVELS[0], REGION_LEVELS[1], REGION_LEVELS[2]]:
-            agg_df = density_analyzer.calculate_regional_aggregates(features_df, region_level)
-            aggregates_list.append(agg_df)
-
-        aggregates_df = pd.concat(aggregates_list, ignore_index=True)
+        aggregates_df = density_analyzer.calculate_regional_aggregates_multi(
+            features_df, [REGION_LEVELS[0], REGION_LEVELS[1], REGION_LEVELS[2]]
+        )
 
         # Step 7: Write to database
         logger.info("\n" + "="*80)
@@ -368,8 +367,15 @@ def run_hotspot_pipeline(
     cluster_min_samples: int = 5,
     full_count_radius_km: float = 3.0,
     sample_seed: int = 20260712,
+    kernel: str = 'epanechnikov',
+    use_grid_hash: bool = True,
 ) -> dict[str, Any]:
-    """Generate spatial_hotspots from preprocessed coordinate data."""
+    """Generate spatial_hotspots from preprocessed coordinate data.
+
+    The default Epanechnikov kernel has compact support, so the KDE is
+    evaluated over a bandwidth grid hash instead of a tree query over all
+    villages; pass kernel='gaussian', use_grid_hash=False for the old KDE.
+    """
     from src.schema import get_schema
     from src.data.db_writer import create_spatial_analysis_tables, create_spatial_analysis_indexes, write_spatial_hotspots
     from src.spatial.hotspot_detector import HotspotDetector
@@ -382,7 +388,7 @@ def run_hotspot_pipeline(
     logger.info("=" * 80)
     logger.info(f"Database: {db_path}, Run ID: {run_id}")
     logger.info(f"Hotspot params: bandwidth={bandwidth_km}km, threshold=p{threshold_percentile}, "
-                f"sample={sample_size}, cluster_eps={cluster_eps_km}km")
+                f"sample={sample_size}, cluster_eps={cluster_eps_km}km, kernel={kernel}")
 
     start_time = time.time()
     conn = sqlite3.connect(db_path)
@@ -406,6 +412,8 @@ def run_hotspot_pipeline(
             cluster_min_samples=cluster_min_samples,
             sample_seed=sample_seed,
             full_count_radius_km=full_count_radius_km,
+            kernel=kernel,
+            use_grid_hash=use_grid_hash,
         )
         hotspots_df = detector.detect_density_hotspots(coords, coords_df, sample_size=sample_size)
 
@@ -1,10 +1,10 @@
 """Character set extraction with per-village deduplication."""
 
-import json
 import logging
-from typing import Set
+from functools import lru_cache
+from typing import Set, Tuple
 import pandas as pd
-from .text_cleaner import normalize_village_name
+from .text_cleaner import normalize_village_names
 
 logger = logging.getLogger(__name__)
 
@@ -25,6 +25,22 @@ def extract_char_set(clean_name: str) -> Set[str]:
     return set(clean_name)
 
 
+@lru_cache(maxsize=1 << 17)
+def _char_set_fields(clean_name: str) -> Tuple[int, str]:
+    """
+    Unique character count and JSON array of sorted unique characters.
+
+    Cleaned names contain only CJK characters, which never need JSON
+    escaping, so the array is joined directly instead of going through
+    json.dumps (output is identical to json.dumps(..., ensure_ascii=False)).
+    Cached because many villages share the same cleaned name.
+    """
+    chars = sorted(extract_char_set(clean_name))
+    if not chars:
+        return 0, '[]'
+    return len(chars), '["' + '", "'.join(chars) + '"]'
+
+
 def process_village_batch(
     df: pd.DataFrame,
     bracket_mode: str = "remove_content",
@@ -52,41 +68,32 @@ def process_village_batch(
         - invalid_reason: Reason if invalid
         - char_set_json: JSON array of unique chars (sorted)
     """
-    results = []
-
-    for _, row in df.iterrows():
-        raw_name = row['自然村']
-
-        # Clean name
-        cleaned = normalize_village_name(
-            raw_name,
-            bracket_mode=bracket_mode,
-            keep_rare_chars=keep_rare_chars,
-            min_name_length=min_name_length
-        )
-
-        # Extract character set
-        char_set = extract_char_set(cleaned.clean_name) if cleaned.is_valid else set()
-
-        # Build result row
-        result = {
-            '市级': row['市级'],
-            '区县级': row['区县级'],
-            '乡镇级': row['乡镇级'],
-            'raw_name': cleaned.raw_name,
-            'clean_name': cleaned.clean_name,
-            'name_len': len(cleaned.clean_name),
-            'unique_char_cnt': len(char_set),
-            'had_brackets': cleaned.had_brackets,
-            'had_noise': cleaned.had_noise,
-            'is_valid': cleaned.is_valid,
-            'invalid_reason': cleaned.invalid_reason,
-            'char_set_json': json.dumps(sorted(char_set), ensure_ascii=False)
-        }
-
-        results.append(result)
-
-    result_df = pd.DataFrame(results)
+    # Clean names (each distinct raw name once)
+    cleaned = normalize_village_names(
+        df['自然村'].tolist(),
+        bracket_mode=bracket_mode,
+        keep_rare_chars=keep_rare_chars,
+        min_name_length=min_name_length
+    )
+
+    # Extract character sets (empty for invalid names)
+    char_sets = [_char_set_fields(c.clean_name) if c.is_valid else (0, '[]') for c in cleaned]
+
+    # Assemble column-wise instead of building one dict per row
+    result_df = pd.DataFrame({
+        '市级': df['市级'].to_numpy(),
+        '区县级': df['区县级'].to_numpy(),
+        '乡镇级': df['乡镇级'].to_numpy(),
+        'raw_name': [c.raw_name for c in cleaned],
+        'clean_name': [c.clean_name for c in cleaned],
+        'name_len': [len(c.clean_name) for c in cleaned],
+        'unique_char_cnt': [count for count, _ in char_sets],
+        'had_brackets': [c.had_brackets for c in cleaned],
+        'had_noise': [c.had_noise for c in cleaned],
+        'is_valid': [c.is_valid for c in cleaned],
+        'invalid_reason': [c.invalid_reason for c in cleaned],
+        'char_set_json': [char_json for _, char_json in char_sets]
+    })
 
     # Log statistics
     total = len(result_df)
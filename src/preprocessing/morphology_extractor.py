@@ -4,7 +4,13 @@ import json
 import logging
 from typing import Optional, List
 import pandas as pd
-from .text_cleaner import normalize_village_name
+from .text_cleaner import normalize_village_names
+
+try:
+    import pyarrow  # noqa: F401
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
@@ -75,51 +81,58 @@ def extract_morphology_features(
 
     logger.info(f"Extracting morphology: suffix_lengths={suffix_lengths}, prefix_lengths={prefix_lengths}")
 
-    results = []
-
-    for _, row in villages_df.iterrows():
-        raw_name = row['自然村']
-
-        # Clean name
-        cleaned = normalize_village_name(
-            raw_name,
-            bracket_mode=bracket_mode,
-            keep_rare_chars=keep_rare_chars,
-            min_name_length=min_name_length
-        )
-
-        # Build result row
-        result = {
-            '市级': row['市级'],
-            '区县级': row['区县级'],
-            '乡镇级': row['乡镇级'],
-            'raw_name': cleaned.raw_name,
-            'clean_name': cleaned.clean_name,
-            'name_len': len(cleaned.clean_name),
-            'is_valid': cleaned.is_valid,
-            'invalid_reason': cleaned.invalid_reason
-        }
-
-        # Extract suffix patterns
-        if cleaned.is_valid:
-            for n in suffix_lengths:
-                suffix = extract_suffix(cleaned.clean_name, n)
-                result[f'suffix_{n}'] = suffix
-
-            # Extract prefix patterns
-            for n in prefix_lengths:
-                prefix = extract_prefix(cleaned.clean_name, n)
-                result[f'prefix_{n}'] = prefix
-        else:
-            # Set all patterns to None for invalid names
-            for n in suffix_lengths:
-                result[f'suffix_{n}'] = None
-            for n in prefix_lengths:
-                result[f'prefix_{n}'] = None
-
-        results.append(result)
-
-    result_df = pd.DataFrame(results)
+    # Clean names (each distinct raw name once)
+    cleaned = normalize_village_names(
+        villages_df['自然村'].tolist(),
+        bracket_mode=bracket_mode,
+        keep_rare_chars=keep_rare_chars,
+        min_name_length=min_name_length
+    )
+
+    clean_names = [c.clean_name for c in cleaned]
+    name_lens = [len(name) for name in clean_names]
+
+    # Assemble column-wise instead of building one dict per row
+    columns = {
+        '市级': villages_df['市级'].to_numpy(),
+        '区县级': villages_df['区县级'].to_numpy(),
+        '乡镇级': villages_df['乡镇级'].to_numpy(),
+        'raw_name': [c.raw_name for c in cleaned],
+        'clean_name': clean_names,
+        'name_len': name_lens,
+        'is_valid': [c.is_valid for c in cleaned],
+        'invalid_reason': [c.invalid_reason for c in cleaned]
+    }
+
+    # Slice suffix/prefix patterns inline (same rules as extract_suffix /
+    # extract_prefix). Invalid names get length -1 so every pattern is None.
+    pattern_lens = [
+        length if c.is_valid else -1 for c, length in zip(cleaned, name_lens)
+    ]
+    for n in suffix_lengths:
+        columns[f'suffix_{n}'] = [
+            name[-n:] if length >= n else None
+            for name, length in zip(clean_names, pattern_lens)
+        ]
+    for n in prefix_lengths:
+        columns[f'prefix_{n}'] = [
+            name[:n] if length >= n else None
+            for name, length in zip(clean_names, pattern_lens)
+        ]
+
+    result_df = pd.DataFrame(columns)
+
+    # Text columns as Arrow strings for the Parquet output; pattern columns
+    # are left alone since the morphology pipeline casts them to category.
+    # Columns that are already Arrow-backed (pandas >= 3 str) are kept as is
+    if PYARROW_AVAILABLE:
+        text_cols = [
+            col for col in ['市级', '区县级', '乡镇级', 'raw_name', 'clean_name', 'invalid_reason']
+            if not (isinstance(result_df[col].dtype, pd.StringDtype)
+                    and result_df[col].dtype.storage == 'pyarrow')
+        ]
+        if text_cols:
+            result_df[text_cols] = result_df[text_cols].astype('string[pyarrow]')
 
     # Log statistics
     total = len(result_df)
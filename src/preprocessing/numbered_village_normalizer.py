@@ -14,10 +14,21 @@ Design Philosophy:
 
 import re
 import logging
-from typing import Tuple
+from typing import Iterable, Tuple
+
+import numpy as np
 
 logger = logging.getLogger(__name__)
 
+# Chinese numerals
+_NUMERALS = "一二三四五六七八九十"
+_NUMERAL_SET = frozenset(_NUMERALS)
+
+# Pattern 1: 村名 + 数字 + 村
+_PATTERN1 = re.compile(f"^(.+?)([{_NUMERALS}]+)村$")
+# Pattern 2: 村名 + 数字
+_PATTERN2 = re.compile(f"^(.+?)([{_NUMERALS}]+)$")
+
 
 def detect_trailing_numeral(village_name: str) -> Tuple[bool, str, str]:
     """
@@ -33,18 +44,11 @@ def detect_trailing_numeral(village_name: str) -> Tuple[bool, str, str]:
     Returns:
         Tuple of (has_numeral, base_name, numeral_suffix)
     """
-    # Chinese numerals
-    numerals = "一二三四五六七八九十"
-
-    # Pattern 1: 村名 + 数字 + 村
-    pattern1 = f"^(.+?)([{numerals}]+)村$"
-    match = re.match(pattern1, village_name)
+    match = _PATTERN1.match(village_name)
     if match and len(match.group(1)) >= 1:
         return (True, match.group(1), match.group(2) + "村")
 
-    # Pattern 2: 村名 + 数字
-    pattern2 = f"^(.+?)([{numerals}]+)$"
-    match = re.match(pattern2, village_name)
+    match = _PATTERN2.match(village_name)
     if match and len(match.group(1)) >= 1:
         return (True, match.group(1), match.group(2))
 
@@ -73,3 +77,42 @@ def normalize_numbered_village(village_name: str) -> str:
         return base_name
     else:
         return village_name
+
+
+def _may_have_trailing_numeral(village_name: str) -> bool:
+    """
+    Cheap pre-check: does the name end in a numeral, or a numeral + 村?
+
+    Names failing this check can never match either pattern, so the
+    regexes only run on the (small) remainder. A single trailing newline
+    is skipped to mirror how ``$`` matches.
+    """
+    tail = village_name[:-1] if village_name.endswith("\n") else village_name
+    if not tail:
+        return False
+    if tail[-1] in _NUMERAL_SET:
+        return True
+    return len(tail) > 1 and tail[-1] == "村" and tail[-2] in _NUMERAL_SET
+
+
+def normalize_numbered_village_batch(village_names: Iterable[str]) -> np.ndarray:
+    """
+    Normalize many village names at once.
+
+    Equivalent to calling normalize_numbered_village on each name, but
+    names without a trailing numeral skip the regex match entirely.
+
+    Args:
+        village_names: Village names to normalize
+
+    Returns:
+        Object array of normalized base names, in input order
+    """
+    names = list(village_names)
+    result = np.empty(len(names), dtype=object)
+    for i, name in enumerate(names):
+        if _may_have_trailing_numeral(name):
+            result[i] = detect_trailing_numeral(name)[1]
+        else:
+            result[i] = name
+    return result
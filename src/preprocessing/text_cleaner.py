@@ -3,7 +3,7 @@
 import re
 import logging
 from dataclasses import dataclass
-from typing import Optional, Tuple
+from typing import Iterable, List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
@@ -157,3 +157,38 @@ def normalize_village_name(raw_name: str, bracket_mode: str = "remove_content",
         is_valid=is_valid,
         invalid_reason=invalid_reason
     )
+
+
+def normalize_village_names(raw_names: Iterable[str], bracket_mode: str = "remove_content",
+                            keep_rare_chars: bool = True,
+                            min_name_length: int = 1) -> List[CleanedName]:
+    """
+    Normalize many village names, cleaning each distinct name only once.
+
+    Village names repeat heavily across regions, so results are cached per
+    raw name for the duration of the call. Duplicate names share the same
+    CleanedName object; callers must treat the results as read-only.
+
+    Args:
+        raw_names: Raw village names from database
+        bracket_mode: "remove_content" or "keep_all"
+        keep_rare_chars: Keep rare CJK Extension characters
+        min_name_length: Minimum valid length after cleaning
+
+    Returns:
+        List of CleanedName objects, one per input name in order
+    """
+    cache = {}
+    results = []
+    for raw_name in raw_names:
+        cleaned = cache.get(raw_name)
+        if cleaned is None:
+            cleaned = normalize_village_name(
+                raw_name,
+                bracket_mode=bracket_mode,
+                keep_rare_chars=keep_rare_chars,
+                min_name_length=min_name_length
+            )
+            cache[raw_name] = cleaned
+        results.append(cleaned)
+    return results
@@ -99,8 +99,8 @@ class VTFCalculator:
               - frequency
               - rank_within_region
         """
-        # Filter by region level
-        level_df = char_freq_df[char_freq_df['region_level'] == level].copy()
+        # Filter by region level (only read below, so the slice is not copied)
+        level_df = char_freq_df[char_freq_df['region_level'] == level]
 
         if level_df.empty:
             return pd.DataFrame()
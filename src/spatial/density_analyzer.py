@@ -6,7 +6,7 @@ Calculates local density and regional aggregates.
 
 import numpy as np
 import pandas as pd
-from typing import Dict
+from typing import Dict, List
 import logging
 from src.schema import REGION_LEVELS
 
@@ -72,69 +72,85 @@ class DensityAnalyzer:
         Returns:
             DataFrame with regional aggregates
         """
-        logger.info(f"Calculating regional spatial aggregates for {region_level}")
-
-        agg_dict = {
-            'village_name': 'count',
-            'nn_distance_1': 'mean',
-            'local_density_5km': 'mean',
-            'isolation_score': 'mean',
-            'is_isolated': 'sum',
-            'spatial_cluster_id': lambda x: x.nunique()
-        }
-
-        # Determine grouping columns based on region level
-        if region_level == REGION_LEVELS[2]:
-            group_cols = [REGION_LEVELS[0], REGION_LEVELS[1], REGION_LEVELS[2]]
-        elif region_level == REGION_LEVELS[1]:
-            group_cols = [REGION_LEVELS[0], REGION_LEVELS[1]]
-        else:  # city
-            group_cols = [REGION_LEVELS[0]]
-
-        agg_df = features_df.groupby(group_cols).agg(agg_dict).reset_index()
-
-        # Extract hierarchy columns
-        if region_level == REGION_LEVELS[2]:
-            agg_df['region_name'] = agg_df[REGION_LEVELS[2]]
-            hierarchy_cols = [REGION_LEVELS[0], REGION_LEVELS[1], REGION_LEVELS[2]]
-        elif region_level == REGION_LEVELS[1]:
-            agg_df['region_name'] = agg_df[REGION_LEVELS[1]]
-            hierarchy_cols = [REGION_LEVELS[0], REGION_LEVELS[1]]
-            agg_df[REGION_LEVELS[2]] = None
-        else:  # city
-            agg_df['region_name'] = agg_df[REGION_LEVELS[0]]
-            hierarchy_cols = [REGION_LEVELS[0]]
-            agg_df[REGION_LEVELS[1]] = None
-            agg_df[REGION_LEVELS[2]] = None
-
-        # Rename aggregated columns
-        agg_df = agg_df.rename(columns={
-            'village_name': 'total_villages',
-            'nn_distance_1': 'avg_nn_distance',
-            'local_density_5km': 'avg_local_density',
-            'isolation_score': 'avg_isolation_score',
-            'is_isolated': 'n_isolated_villages',
-            'spatial_cluster_id': 'n_spatial_clusters'
-        })
-
-        # Add region level
-        agg_df.insert(0, 'region_level', region_level)
-
-        # Calculate spatial dispersion (coefficient of variation of nn_distance)
-        dispersion = features_df.groupby(group_cols)['nn_distance_1'].std() / \
-                    features_df.groupby(group_cols)['nn_distance_1'].mean()
-        agg_df['spatial_dispersion'] = dispersion.values
-
-        # Reorder columns: region_level, city, county, town, region_name, then metrics
-        cols = ['region_level', REGION_LEVELS[0], REGION_LEVELS[1], REGION_LEVELS[2], 'region_name',
-                'total_villages', 'avg_nn_distance', 'avg_local_density',
-                'avg_isolation_score', 'n_isolated_villages', 'n_spatial_clusters',
-                'spatial_dispersion']
-        agg_df = agg_df[cols]
-
-        logger.info(f"Generated aggregates for {len(agg_df)} regions")
-
-        return agg_df
+        return self.calculate_regional_aggregates_multi(features_df, [region_level])
+
+    def calculate_regional_aggregates_multi(
+        self,
+        features_df: pd.DataFrame,
+        region_levels: List[str] = None
+    ) -> pd.DataFrame:
+        """
+        Calculate spatial aggregates for several region levels at once.
+
+        The (city, county, township) key is hashed once; each level groups
+        by integer codes derived from those keys instead of re-hashing the
+        string columns. Output matches concatenating
+        calculate_regional_aggregates for each level.
+
+        Args:
+            features_df: DataFrame with spatial features
+            region_levels: Region levels to aggregate (default: city, county, township)
+
+        Returns:
+            DataFrame with regional aggregates for all levels, in level order
+        """
+        if region_levels is None:
+            region_levels = REGION_LEVELS[:3]
+        hierarchy = [REGION_LEVELS[0], REGION_LEVELS[1], REGION_LEVELS[2]]
+
+        # One pass over the full hierarchy; keys come back in sorted order
+        grouped = features_df.groupby(hierarchy, dropna=False)
+        base_codes = grouped.ngroup().to_numpy()
+        base_keys = grouped.size().index.to_frame(index=False)
+        metrics = features_df[[
+            'village_name', 'nn_distance_1', 'local_density_5km',
+            'isolation_score', 'is_isolated', 'spatial_cluster_id'
+        ]]
+
+        aggregates_list = []
+        for region_level in region_levels:
+            logger.info(f"Calculating regional spatial aggregates for {region_level}")
+
+            # Determine grouping columns based on region level
+            if region_level == REGION_LEVELS[2]:
+                group_cols = hierarchy
+            elif region_level == REGION_LEVELS[1]:
+                group_cols = hierarchy[:2]
+            else:  # city
+                group_cols = hierarchy[:1]
+
+            # Map each village to its region via the (sorted) base keys;
+            # regions with a missing key are dropped, as groupby does
+            key_grouped = base_keys.groupby(group_cols, dropna=False, sort=False)
+            level_keys = key_grouped.size().index.to_frame(index=False)
+            row_codes = key_grouped.ngroup().to_numpy()[base_codes]
+            has_key = level_keys.notna().all(axis=1).to_numpy()
+            keep = has_key[row_codes]
+            level_keys = level_keys[has_key].reset_index(drop=True)
+
+            stats = metrics[keep].groupby(row_codes[keep]).agg(
+                total_villages=('village_name', 'count'),
+                avg_nn_distance=('nn_distance_1', 'mean'),
+                avg_local_density=('local_density_5km', 'mean'),
+                avg_isolation_score=('isolation_score', 'mean'),
+                n_isolated_villages=('is_isolated', 'sum'),
+                n_spatial_clusters=('spatial_cluster_id', 'nunique'),
+                nn_distance_std=('nn_distance_1', 'std')
+            ).reset_index(drop=True)
+
+            agg_df = pd.DataFrame({'region_level': region_level}, index=stats.index)
+            for col in hierarchy:
+                agg_df[col] = level_keys[col] if col in group_cols else None
+            agg_df['region_name'] = level_keys[group_cols[-1]]
+            agg_df = pd.concat([agg_df, stats.drop(columns='nn_distance_std')], axis=1)
+
+            # Spatial dispersion (coefficient of variation of nn_distance)
+            agg_df['spatial_dispersion'] = stats['nn_distance_std'] / stats['avg_nn_distance']
+
+            logger.info(f"Generated aggregates for {len(agg_df)} regions")
+            aggregates_list.append(agg_df)
+
+        return pd.concat(aggregates_list, ignore_index=True)
 
     def calculate_hotspot_coverage(
         self,
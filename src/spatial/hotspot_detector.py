@@ -13,6 +13,9 @@ from src.schema import REGION_LEVELS
 
 logger = logging.getLogger(__name__)
 
+# Max (evaluation point, source point) pairs per grid KDE distance block
+_GRID_BLOCK_PAIRS = 1 << 21
+
 
 class HotspotDetector:
     """Detect spatial hotspots using KDE."""
@@ -25,6 +28,8 @@ class HotspotDetector:
         cluster_min_samples: int = 3,
         sample_seed: int = 20260712,
         full_count_radius_km: float = 3.0,
+        kernel: str = 'gaussian',
+        use_grid_hash: bool = False,
     ):
         """
         Initialize hotspot detector.
@@ -36,13 +41,104 @@ class HotspotDetector:
             cluster_min_samples: DBSCAN min_samples for hotspot candidate points
             sample_seed: Random seed for reproducible KDE evaluation sampling
             full_count_radius_km: Radius used to count all villages around each hotspot center
+            kernel: KDE kernel ('gaussian', 'epanechnikov', ... as in sklearn KernelDensity)
+            use_grid_hash: Evaluate the Epanechnikov KDE by summing only over
+                bandwidth-sized grid cells around each point (requires
+                kernel='epanechnikov', whose support is one bandwidth)
         """
+        if use_grid_hash and kernel != 'epanechnikov':
+            raise ValueError("use_grid_hash requires kernel='epanechnikov'")
+
         self.bandwidth_deg = bandwidth_km / 111.0  # Rough conversion to degrees
         self.threshold_percentile = threshold_percentile
         self.cluster_eps_deg = cluster_eps_km / 111.0
         self.cluster_min_samples = cluster_min_samples
         self.sample_seed = sample_seed
         self.full_count_radius_km = full_count_radius_km
+        self.kernel = kernel
+        self.use_grid_hash = use_grid_hash
+
+    def compute_density(self, fit_coords: np.ndarray, eval_coords: np.ndarray) -> np.ndarray:
+        """
+        Evaluate the KDE fitted on fit_coords at eval_coords.
+
+        Args:
+            fit_coords: Points the density is estimated from
+            eval_coords: Points to evaluate the density at
+
+        Returns:
+            Density values (not log density) for each evaluation point
+        """
+        if self.use_grid_hash:
+            return self._grid_epanechnikov_density(fit_coords, eval_coords)
+
+        # Use sklearn's KernelDensity (supports tree-based algorithms for speed)
+        kde = KernelDensity(
+            bandwidth=self.bandwidth_deg,
+            algorithm='ball_tree',
+            kernel=self.kernel,
+            metric='euclidean'
+        )
+        kde.fit(fit_coords)
+        return np.exp(kde.score_samples(eval_coords))
+
+    def _grid_epanechnikov_density(self, fit_coords: np.ndarray, eval_coords: np.ndarray) -> np.ndarray:
+        """
+        Exact Epanechnikov KDE using a bandwidth-sized grid hash.
+
+        Points are binned into square cells one bandwidth wide. The kernel is
+        zero beyond one bandwidth, so each evaluation point only needs the
+        points in its own cell and the 8 neighbouring cells. Matches
+        sklearn's KernelDensity(kernel='epanechnikov') up to rounding.
+
+        Args:
+            fit_coords: Points the density is estimated from
+            eval_coords: Points to evaluate the density at
+
+        Returns:
+            Density values for each evaluation point
+        """
+        h = self.bandwidth_deg
+        origin = fit_coords.min(axis=0)
+
+        def bin_points(points):
+            cells = np.floor((points - origin) / h).astype(np.int64)
+            order = np.lexsort((cells[:, 1], cells[:, 0]))
+            keys, starts, counts = np.unique(
+                cells[order], axis=0, return_index=True, return_counts=True
+            )
+            return order, keys, starts, counts
+
+        fit_order, fit_keys, fit_starts, fit_counts = bin_points(fit_coords)
+        sorted_fit = fit_coords[fit_order]
+        fit_bins = {
+            (int(x), int(y)): (start, start + count)
+            for (x, y), start, count in zip(fit_keys, fit_starts, fit_counts)
+        }
+
+        kernel_sum = np.zeros(len(eval_coords))
+        eval_order, eval_keys, eval_starts, eval_counts = bin_points(eval_coords)
+        for (x, y), start, count in zip(eval_keys, eval_starts, eval_counts):
+            neighbours = [
+                sorted_fit[slice(*fit_bins[cell])]
+                for cell in ((x + dx, y + dy) for dx in (-1, 0, 1) for dy in (-1, 0, 1))
+                if cell in fit_bins
+            ]
+            if not neighbours:
+                continue
+            sources = np.concatenate(neighbours)
+            # Bound the (points x sources) distance block for dense cells
+            step = max(1, _GRID_BLOCK_PAIRS // len(sources))
+            for block_start in range(start, start + count, step):
+                idx = eval_order[block_start:min(block_start + step, start + count)]
+                sq_dist = (
+                    np.square(eval_coords[idx, 0, None] - sources[None, :, 0])
+                    + np.square(eval_coords[idx, 1, None] - sources[None, :, 1])
+                ) / (h * h)
+                kernel_sum[idx] = np.clip(1.0 - sq_dist, 0.0, None).sum(axis=1)
+
+        # 2-D Epanechnikov normalization: 2 / (pi * h^2), averaged over points
+        return kernel_sum * (2.0 / np.pi) / (len(fit_coords) * h * h)
 
     def detect_density_hotspots(
         self,
@@ -61,20 +157,10 @@ class HotspotDetector:
         Returns:
             DataFrame with hotspot information
         """
-        logger.info("Detecting density hotspots using KDE (sklearn implementation)")
+        logger.info(f"Detecting density hotspots using KDE (kernel={self.kernel}, grid_hash={self.use_grid_hash})")
 
-        # Use sklearn's KernelDensity (much faster than scipy)
         n_points = coords.shape[0]
-
-        # Compute KDE using sklearn (supports tree-based algorithms for speed)
         logger.info(f"Computing KDE with bandwidth={self.bandwidth_deg:.4f} degrees")
-        kde = KernelDensity(
-            bandwidth=self.bandwidth_deg,
-            algorithm='ball_tree',  # Use ball_tree for faster computation
-            kernel='gaussian',
-            metric='euclidean'
-        )
-        kde.fit(coords)
 
         # Use all data or sample for density evaluation
         if sample_size is not None and sample_size > 0 and n_points > sample_size:
@@ -87,10 +173,9 @@ class HotspotDetector:
             eval_coords = coords
             sample_indices = np.arange(n_points)
 
-        # Evaluate density at sampled points (returns log density)
+        # Evaluate density at sampled points
         logger.info("Evaluating density at sample points...")
-        log_density = kde.score_samples(eval_coords)
-        density = np.exp(log_density)  # Convert log density to density
+        density = self.compute_density(coords, eval_coords)
 
         # Find threshold
         threshold = np.percentile(density, self.threshold_percentile)
@@ -239,16 +324,8 @@ class HotspotDetector:
             category_coords = coords[mask]
             category_df = df[mask]
 
-            # Compute KDE for this category using sklearn
-            kde = KernelDensity(
-                bandwidth=self.bandwidth_deg,
-                algorithm='ball_tree',
-                kernel='gaussian',
-                metric='euclidean'
-            )
-            kde.fit(category_coords)
-            log_density = kde.score_samples(category_coords)
-            density = np.exp(log_density)
+            # Compute KDE for this category
+            density = self.compute_density(category_coords, category_coords)
 
             # Find high-density areas for this category
             threshold = np.percentile(density, 90)  # Lower threshold for categories
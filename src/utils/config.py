@@ -31,6 +31,7 @@ class FrequencyConfig:
     min_count_threshold: int = 10  # Minimum count for reporting
     chunk_size: int = 10000  # Chunk size for streaming processing
     persist_batch_size: int = 10000  # Rows to insert per database batch
+    n_jobs: int = 1  # Worker processes for per-level/per-pattern computation (-1 = one per task)
 
     def validate(self):
         """Validate configuration parameters."""
@@ -42,6 +43,8 @@ class FrequencyConfig:
             raise ValueError("chunk_size must be >= 1")
         if self.persist_batch_size < 1:
             raise ValueError("persist_batch_size must be >= 1")
+        if self.n_jobs != -1 and self.n_jobs < 1:
+            raise ValueError("n_jobs must be >= 1 or -1")
 
 
 @dataclass
@@ -0,0 +1,91 @@
+"""CSV export helpers shared by the analysis pipelines."""
+
+import os
+from pathlib import Path
+from typing import Optional, Union
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.csv as pacsv
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+# Characters that make the csv module quote a field
+_QUOTE_CHARS = r'[,"\r\n]'
+
+
+def _arrow_csv_table(df: pd.DataFrame) -> Optional['pa.Table']:
+    """
+    Convert df for pyarrow's CSV writer, or return None if its output
+    would differ from DataFrame.to_csv.
+
+    Bool and float columns are formatted to text the way pandas writes
+    them (True/False, repr floats, empty for NaN) and everything is written
+    unquoted. That only matches to_csv when every column is then text,
+    integer or all-null, no header or value needs quoting, and lines end
+    in '\\n'; otherwise (including mixed-type object columns Arrow cannot
+    convert) the caller falls back to to_csv.
+    """
+    if os.linesep != '\n' or len(df.columns) < 2:
+        # to_csv writes os.linesep; single-column rows with an empty
+        # value are written as "" by the csv module
+        return None
+    if any(pd.Series([str(col) for col in df.columns]).str.contains(_QUOTE_CHARS)):
+        return None
+
+    arrays = []
+    for i in range(len(df.columns)):
+        values = df.iloc[:, i]
+        if pd.api.types.is_bool_dtype(values) and not values.hasnans:
+            values = values.map({True: 'True', False: 'False'})
+        elif pd.api.types.is_float_dtype(values):
+            # numpy's float -> str matches how to_csv formats each width
+            numeric = values.to_numpy(dtype=getattr(values.dtype, 'numpy_dtype', values.dtype), na_value=np.nan)
+            values = pd.Series(numeric.astype(str), dtype=object).where(values.notna().to_numpy(), None)
+        try:
+            arrays.append(pa.array(values, from_pandas=True))
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            return None
+    table = pa.Table.from_arrays(arrays, names=[str(col) for col in df.columns])
+
+    for field, column in zip(table.schema, table.columns):
+        value_type = field.type.value_type if pa.types.is_dictionary(field.type) else field.type
+        if pa.types.is_integer(value_type) or pa.types.is_null(value_type):
+            continue
+        if not (pa.types.is_string(value_type) or pa.types.is_large_string(value_type)):
+            return None
+        if pa.types.is_dictionary(field.type):
+            column = column.cast(value_type)
+        if pc.any(pc.match_substring_regex(column, _QUOTE_CHARS)).as_py():
+            return None
+    return table
+
+
+def write_csv(df: pd.DataFrame, path: Union[str, Path]) -> None:
+    """
+    Write a CSV report (UTF-8 with BOM so Excel reads Chinese names).
+
+    Uses pyarrow's C++ CSV writer when installed and the frame can be
+    written byte-for-byte as pandas would; otherwise pandas.
+
+    Args:
+        df: DataFrame to write (index is not written)
+        path: Output CSV path
+    """
+    table = _arrow_csv_table(df) if PYARROW_AVAILABLE else None
+    if table is not None:
+        # Arrow quotes header names regardless of quoting_style, so the
+        # header line is written here
+        header = ','.join(table.column_names) + '\n'
+        with open(path, 'wb') as f:
+            f.write(('\ufeff' + header).encode('utf-8'))
+            pacsv.write_csv(
+                table, f, pacsv.WriteOptions(include_header=False, quoting_style='none')
+            )
+    else:
+        df.to_csv(path, index=False, encoding='utf-8-sig')
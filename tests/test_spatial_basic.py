@@ -224,6 +224,40 @@ class TestHotspotDetector:
         assert hotspots[0]['radius_km'] == 3.0
         assert hotspots[0]['village_count'] == 4
 
+    def test_grid_hash_density_matches_sklearn_epanechnikov(self):
+        from sklearn.neighbors import KernelDensity
+
+        rng = np.random.default_rng(0)
+        coords = rng.normal([23.0, 113.0], 0.2, size=(2000, 2))
+        eval_coords = np.vstack([coords[:300], [[30.0, 120.0]]])
+        detector = HotspotDetector(bandwidth_km=5.0, kernel='epanechnikov', use_grid_hash=True)
+
+        density = detector.compute_density(coords, eval_coords)
+
+        kde = KernelDensity(bandwidth=detector.bandwidth_deg, kernel='epanechnikov')
+        expected = np.exp(kde.fit(coords).score_samples(eval_coords))
+        np.testing.assert_allclose(density, expected, rtol=1e-9)
+
+    def test_grid_hash_density_in_small_blocks(self, monkeypatch):
+        from sklearn.neighbors import KernelDensity
+        import src.spatial.hotspot_detector as hotspot_detector
+
+        # Duplicated coordinates put every point in one dense cell
+        rng = np.random.default_rng(1)
+        coords = np.vstack([np.repeat([[23.0, 113.0]], 500, axis=0), rng.normal([23.0, 113.0], 0.05, size=(500, 2))])
+        monkeypatch.setattr(hotspot_detector, '_GRID_BLOCK_PAIRS', 1000)
+        detector = HotspotDetector(bandwidth_km=5.0, kernel='epanechnikov', use_grid_hash=True)
+
+        density = detector.compute_density(coords, coords)
+
+        kde = KernelDensity(bandwidth=detector.bandwidth_deg, kernel='epanechnikov')
+        expected = np.exp(kde.fit(coords).score_samples(coords))
+        np.testing.assert_allclose(density, expected, rtol=1e-9)
+
+    def test_grid_hash_requires_epanechnikov(self):
+        with pytest.raises(ValueError):
+            HotspotDetector(kernel='gaussian', use_grid_hash=True)
+
 
 if __name__ == '__main__':
     pytest.main([__file__, '-v'])
@@ -135,3 +135,21 @@ class TestProcessVillageBatch:
 
         # Should contain correct characters
         assert set(char_list) == {'村', '新', '大'}
+
+    def test_char_set_json_matches_json_dumps(self):
+        """Test that the fast JSON path matches json.dumps, including rare chars."""
+        names = ['石石岭岭村', '𠀀村', '新村', '123', '石石岭岭村']
+        df = pd.DataFrame({
+            '市级': ['广州市'] * len(names),
+            '区县级': ['天河区'] * len(names),
+            '乡镇级': ['某镇'] * len(names),
+            '自然村': names
+        })
+
+        result = process_village_batch(df)
+
+        for clean_name, is_valid, char_set_json in zip(
+            result['clean_name'], result['is_valid'], result['char_set_json']
+        ):
+            expected = sorted(set(clean_name)) if is_valid else []
+            assert char_set_json == json.dumps(expected, ensure_ascii=False)
@@ -0,0 +1,54 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+from sklearn.cluster import KMeans, MiniBatchKMeans
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from src.clustering.clustering_engine import ClusteringEngine
+
+
+def _blobs(n_per_cluster=60, seed=0):
+    rng = np.random.default_rng(seed)
+    centers = np.array([[0, 0, 0], [6, 6, 0], [0, 6, 6], [6, 0, 6]], dtype=float)
+    return np.vstack([c + rng.normal(size=(n_per_cluster, 3)) for c in centers])
+
+
+def test_minibatch_sweep_then_refit_picks_full_kmeans():
+    X = _blobs()
+    engine = ClusteringEngine(random_state=0)
+
+    results = engine.fit_kmeans(X, k_range=[2, 4, 6], n_init=5, minibatch=True)
+    assert all(isinstance(r['model'], MiniBatchKMeans) for r in results)
+
+    best = engine.select_best_k(results)
+    refit = engine.refit_kmeans(X, best['k'], n_init=5)
+
+    assert best['k'] == 4
+    assert isinstance(refit['model'], KMeans)
+    assert refit['k'] == 4 and len(refit['labels']) == len(X)
+
+
+def test_silhouette_is_sampled_above_threshold():
+    X = _blobs()
+    engine = ClusteringEngine(random_state=0)
+
+    exact = engine.fit_kmeans(X, k_range=[4], n_init=5)[0]
+    sampled = engine.fit_kmeans(X, k_range=[4], n_init=5, silhouette_sample_size=100)[0]
+
+    assert np.array_equal(exact['labels'], sampled['labels'])
+    assert abs(exact['silhouette_score'] - sampled['silhouette_score']) < 0.05
+
+
+def test_parallel_sweep_matches_serial():
+    X = _blobs()
+    engine = ClusteringEngine(random_state=0)
+
+    serial = engine.fit_kmeans(X, k_range=[3, 4, 5], n_init=3)
+    parallel = engine.fit_kmeans(X, k_range=[3, 4, 5], n_init=3, n_jobs=2)
+
+    assert [r['k'] for r in parallel] == [3, 4, 5]
+    for a, b in zip(serial, parallel):
+        assert np.array_equal(a['labels'], b['labels'])
+        assert a['silhouette_score'] == b['silhouette_score']
@@ -0,0 +1,32 @@
+"""Unit tests for the shared CSV writer."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.utils.csv_writer import write_csv
+
+
+def make_frame():
+    return pd.DataFrame({
+        'region': ['广州市', '深圳市', None, ''],
+        'village_count': [1, 20, 300, 4000],
+        'frequency': [1.0, 1e-05, np.nan, 0.1 + 0.2],
+        'score32': np.array([0.977281, 0.5, 2.0, 1e-8], dtype='float32'),
+        'is_significant': [True, False, True, False],
+        'pattern': pd.Categorical(['村', '围', '村', '坑']),
+        'rank': pd.array([1, None, 3, 4], dtype='Int64'),
+    })
+
+
+@pytest.mark.parametrize('frame', [
+    make_frame(),
+    make_frame().assign(region=['a,b', 'say "hi"', 'x', 'y']),
+    make_frame().assign(mixed=[1, 'a', 2.5, None]),
+    make_frame()[['region']],
+])
+def test_write_csv_matches_pandas_output(tmp_path, frame):
+    write_csv(frame, tmp_path / 'out.csv')
+    frame.to_csv(tmp_path / 'expected.csv', index=False, encoding='utf-8-sig')
+
+    assert (tmp_path / 'out.csv').read_bytes() == (tmp_path / 'expected.csv').read_bytes()
@@ -8,6 +8,7 @@ import tempfile
 import pandas as pd
 from pathlib import Path
 from src.data.db_writer import (
+    configure_bulk_write_pragmas,
     create_analysis_tables,
     create_indexes,
     save_run_metadata,
@@ -30,6 +31,14 @@ def temp_db():
     Path(db_path).unlink()
 
 
+def test_bulk_write_pragmas_leave_cache_spill_on(temp_db):
+    """Shared bulk-write pragmas must not pin large transactions in memory."""
+    configure_bulk_write_pragmas(temp_db)
+
+    assert temp_db.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    assert temp_db.execute("PRAGMA cache_spill").fetchone()[0] != 0
+
+
 def test_create_analysis_tables(temp_db):
     """Test table creation."""
     create_analysis_tables(temp_db)
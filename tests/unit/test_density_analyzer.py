@@ -0,0 +1,45 @@
+"""Unit tests for spatial regional aggregates."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.spatial.density_analyzer import DensityAnalyzer
+
+
+def make_features(n=200, seed=0):
+    rng = np.random.default_rng(seed)
+    county = rng.choice(['x', 'y', 'z'], n).astype(object)
+    county[:5] = None
+    return pd.DataFrame({
+        'city': rng.choice(['广州', '深圳'], n),
+        'county': county,
+        'township': rng.choice([f't{i}' for i in range(6)], n),
+        'village_name': [f'v{i}' for i in range(n)],
+        'nn_distance_1': rng.random(n) * 5,
+        'local_density_5km': rng.integers(0, 50, n),
+        'isolation_score': rng.random(n),
+        'is_isolated': rng.integers(0, 2, n),
+        'spatial_cluster_id': rng.integers(-1, 8, n),
+    })
+
+
+@pytest.mark.parametrize('level, group_cols', [
+    ('city', ['city']),
+    ('county', ['city', 'county']),
+    ('township', ['city', 'county', 'township']),
+])
+def test_multi_level_aggregates_match_groupby(level, group_cols):
+    features_df = make_features()
+    result = DensityAnalyzer().calculate_regional_aggregates_multi(features_df)
+    result = result[result['region_level'] == level].reset_index(drop=True)
+
+    grouped = features_df.groupby(group_cols)
+    expected_nn = grouped['nn_distance_1']
+    assert result['region_name'].tolist() == grouped.size().index.get_level_values(-1).tolist()
+    assert result['total_villages'].tolist() == grouped.size().tolist()
+    assert result['n_spatial_clusters'].tolist() == grouped['spatial_cluster_id'].nunique().tolist()
+    np.testing.assert_array_equal(result['avg_nn_distance'], expected_nn.mean())
+    np.testing.assert_array_equal(
+        result['spatial_dispersion'], expected_nn.std() / expected_nn.mean()
+    )
@@ -6,7 +6,13 @@ import pandas as pd
 
 sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
 
-from src.pipelines.feature_materialization_pipeline import write_village_features
+from src.features.feature_extractor import VillageFeatureExtractor
+from src.pipelines.feature_materialization_pipeline import (
+    load_cluster_assignments,
+    load_villages,
+    merge_cluster_assignments,
+    write_village_features,
+)
 from src.semantic.lexicon_loader import SemanticLexicon
 from src.schema import get_schema
 
@@ -91,3 +97,72 @@ def test_write_village_features_uses_configured_schema_for_id_mapping():
 
     row = conn.execute("SELECT village_id FROM village_features").fetchone()
     assert row == ("nat_001",)
+
+
+def test_cluster_assignments_are_pivoted_and_merged_once():
+    conn = sqlite3.connect(":memory:")
+    conn.execute(
+        "CREATE TABLE cluster_assignments (run_id TEXT, village_name TEXT, algorithm TEXT, cluster_id INTEGER)"
+    )
+    conn.executemany(
+        "INSERT INTO cluster_assignments VALUES (?, ?, ?, ?)",
+        [
+            ("run_a", "水口", "kmeans", 1),
+            ("run_a", "石岗", "kmeans", 2),
+            ("run_a", "水口", "gmm", 5),
+            ("run_b", "水口", "dbscan", 9),
+        ],
+    )
+    villages = pd.DataFrame({"village_name": ["水口", "石岗", "新村"], "name_length": [2, 2, 2]})
+
+    merged = merge_cluster_assignments(villages, load_cluster_assignments(conn, "run_a"))
+
+    assert list(merged.columns) == [
+        "village_name", "name_length", "kmeans_cluster_id", "dbscan_cluster_id", "gmm_cluster_id"
+    ]
+    assert merged["kmeans_cluster_id"].tolist()[:2] == [1, 2]
+    assert merged["dbscan_cluster_id"].isna().all()
+    assert merged["gmm_cluster_id"].iloc[0] == 5 and pd.isna(merged["gmm_cluster_id"].iloc[1])
+
+
+def test_cluster_assignments_missing_table_yields_empty_columns():
+    conn = sqlite3.connect(":memory:")
+    villages = pd.DataFrame({"village_name": ["水口"], "name_length": [2]})
+
+    merged = merge_cluster_assignments(villages, load_cluster_assignments(conn, "run_a"))
+
+    assert merged[["kmeans_cluster_id", "dbscan_cluster_id", "gmm_cluster_id"]].isna().all().all()
+
+
+def test_extract_batch_stores_flags_as_int8():
+    extractor = VillageFeatureExtractor("data/semantic_lexicon_v1.json")
+    villages = pd.DataFrame({"village_name": ["水口", "石岗", ""]})
+
+    features = extractor.extract_batch(villages, village_name_col="village_name")
+
+    flag_cols = [f"sem_{cat}" for cat in extractor.categories] + ["has_valid_chars"]
+    assert (features[flag_cols].dtypes == "int8").all()
+    assert features["has_valid_chars"].tolist() == [1, 1, 0]
+    assert features["name_length"].dtype == "int64"
+
+    extractor.extract_batch_inplace(villages, village_name_col="village_name")
+    pd.testing.assert_frame_equal(villages.drop(columns="village_name"), features)
+
+
+def test_load_villages_drops_unnamed_rows_before_extraction():
+    schema = get_schema("guangdong")
+    conn = sqlite3.connect(":memory:")
+    conn.execute(f"CREATE TABLE {schema.raw_table} (c1, c2, c3, c4, c5, c6, c7, c8, c9, c10, c11, c12)")
+    conn.executemany(
+        f"INSERT INTO {schema.raw_table} VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        [
+            ("广州市", "番禺区", "石楼镇", "村委", "水口", "shuikou", None, None, None, None, None, None),
+            ("广州市", "番禺区", "石楼镇", "村委", None, None, None, None, None, None, None, None),
+            ("广州市", "番禺区", "石楼镇", "村委", "", None, None, None, None, None, None, None),
+        ],
+    )
+
+    villages = load_villages(conn, schema=schema)
+
+    assert villages["village_name"].tolist() == ["水口", ""]
+    assert villages.index.tolist() == [0, 1]
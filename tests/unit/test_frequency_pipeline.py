@@ -0,0 +1,51 @@
+"""Unit tests for the character frequency pipeline."""
+
+import pandas as pd
+
+from src.pipelines.frequency_pipeline import CharacterFrequencyPipeline
+from src.preprocessing.char_extractor import process_village_batch
+from src.analysis.char_frequency import compute_char_frequency_global
+from src.utils.config import PipelineConfig
+
+
+def make_villages():
+    names = ['石头村', '新村', '大村', '石岭', '新围', '大坑', '上村', '下围']
+    rows = []
+    for i in range(80):
+        rows.append({
+            '市级': f'市{i % 2}',
+            '区县级': f'县{i % 4}',
+            '乡镇级': f'镇{i % 8}',
+            '自然村': names[i % len(names)],
+        })
+    return process_village_batch(pd.DataFrame(rows))
+
+
+def run_levels(tmp_path, n_jobs):
+    config = PipelineConfig.create_default(
+        db_path='unused.db', output_dir=str(tmp_path), run_id=f'jobs_{n_jobs}'
+    )
+    config.frequency.n_jobs = n_jobs
+    config.tendency.min_global_support = 1
+    config.tendency.min_regional_support = 1
+    pipeline = CharacterFrequencyPipeline(config)
+
+    villages_df = make_villages()
+    global_freq = compute_char_frequency_global(villages_df)
+    regional_freqs = pipeline._compute_regional_frequencies(villages_df)
+    pipeline._compute_regional_tendencies(regional_freqs, global_freq)
+    return pipeline.output_dir
+
+
+def test_parallel_levels_match_serial(tmp_path):
+    serial_dir = run_levels(tmp_path, n_jobs=1)
+    parallel_dir = run_levels(tmp_path, n_jobs=-1)
+
+    for level in ('city', 'county', 'township'):
+        for name in (f'char_frequency_{level}.csv', f'regional_tendency_{level}.csv'):
+            serial = pd.read_csv(serial_dir / name)
+            parallel = pd.read_csv(parallel_dir / name)
+            pd.testing.assert_frame_equal(
+                serial.drop(columns='run_id', errors='ignore'),
+                parallel.drop(columns='run_id', errors='ignore'),
+            )
@@ -0,0 +1,266 @@
+"""
+Unit tests for LLM labeler batching (no network calls).
+"""
+
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from src.nlp.llm_labeler import LabelingCache, LLMLabeler
+
+
+class FakeChatClient:
+    """Minimal stand-in for the OpenAI chat completions client."""
+
+    def __init__(self, replies):
+        self.replies = list(replies)
+        self.prompts = []
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    def _create(self, **kwargs):
+        self.prompts.append(kwargs["messages"][-1]["content"])
+        content = self.replies.pop(0)
+        message = SimpleNamespace(content=content)
+        usage = SimpleNamespace(
+            prompt_tokens=1000,
+            completion_tokens=500,
+            prompt_tokens_details=SimpleNamespace(cached_tokens=0),
+        )
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)], usage=usage)
+
+
+def make_labeler(replies, cache=None, **kwargs):
+    labeler = LLMLabeler(provider="openai", model="gpt-4", api_key="test", **kwargs)
+    labeler.client = FakeChatClient(replies)
+    labeler.cache = cache
+    return labeler
+
+
+def char_data(char):
+    return {
+        "char": char,
+        "frequency": 10,
+        "example_villages": [f"{char}村"],
+        "similar_chars": [("山", 0.9)],
+    }
+
+
+def label(char, category="mountain"):
+    return {
+        "char": char,
+        "category": category,
+        "confidence": 0.9,
+        "reasoning": "test",
+        "alternative_categories": [],
+        "is_new_category": False,
+    }
+
+
+def test_batch_label_packs_characters_into_one_call():
+    reply = json.dumps({"results": [label("岭"), label("峰")]}, ensure_ascii=False)
+    labeler = make_labeler([reply])
+
+    results = labeler.batch_label_characters(
+        [char_data("岭"), char_data("峰")], ["mountain"], rate_limit_delay=0, batch_size=5
+    )
+
+    assert [r.char for r in results] == ["岭", "峰"]
+    assert len(labeler.client.prompts) == 1
+
+
+def test_batch_label_retries_missing_characters_individually():
+    batch_reply = "```json\n" + json.dumps({"results": [label("峰")]}, ensure_ascii=False) + "\n```"
+    single_reply = json.dumps(label("岭", "terrain"), ensure_ascii=False)
+    labeler = make_labeler([batch_reply, single_reply])
+
+    results = labeler.batch_label_characters(
+        [char_data("岭"), char_data("峰")], ["mountain"], rate_limit_delay=0, batch_size=2
+    )
+
+    assert [(r.char, r.category) for r in results] == [("岭", "terrain"), ("峰", "mountain")]
+    assert len(labeler.client.prompts) == 2
+
+
+def test_poll_batch_parses_output_file():
+    record = {
+        "custom_id": "岭",
+        "response": {
+            "body": {
+                "choices": [{"message": {"content": json.dumps(label("岭"), ensure_ascii=False)}}]
+            }
+        },
+    }
+    labeler = make_labeler([])
+    labeler.client.batches = SimpleNamespace(
+        retrieve=lambda batch_id: SimpleNamespace(status="completed", output_file_id="file-1")
+    )
+    labeler.client.files = SimpleNamespace(
+        content=lambda file_id: SimpleNamespace(text=json.dumps(record, ensure_ascii=False) + "\n")
+    )
+
+    results = labeler.poll_batch("batch-1", poll_interval=0)
+
+    assert [(r.char, r.category) for r in results] == [("岭", "mountain")]
+
+
+def attach_batch_api(labeler, status, output_records, error_records=()):
+    """Give a fake client the Batch API endpoints, returning fixed files."""
+    files = {
+        "file-out": "\n".join(json.dumps(r, ensure_ascii=False) for r in output_records),
+        "file-err": "\n".join(json.dumps(r, ensure_ascii=False) for r in error_records),
+    }
+    batch = SimpleNamespace(
+        id="batch-1",
+        status=status,
+        output_file_id="file-out" if output_records else None,
+        error_file_id="file-err" if error_records else None,
+    )
+    labeler.client.batches = SimpleNamespace(
+        create=lambda **kwargs: batch, retrieve=lambda batch_id: batch
+    )
+    labeler.client.files = SimpleNamespace(
+        create=lambda **kwargs: SimpleNamespace(id="file-in"),
+        content=lambda file_id: SimpleNamespace(text=files[file_id]),
+    )
+
+
+def batch_record(char, content, usage=None):
+    body = {"choices": [{"message": {"content": content}}]}
+    if usage is not None:
+        body["usage"] = usage
+    return {"custom_id": char, "response": {"body": body}}
+
+
+@pytest.mark.parametrize("status", ["completed", "failed"])
+def test_batch_api_leftovers_are_labeled_synchronously(status, caplog):
+    single_reply = json.dumps(label("峰", "terrain"), ensure_ascii=False)
+    labeler = make_labeler([single_reply] if status == "completed" else [
+        json.dumps(label(c, "terrain"), ensure_ascii=False) for c in "岭峰坡"
+    ])
+    output = [
+        batch_record("岭", json.dumps(label("岭"), ensure_ascii=False)),
+        batch_record("坡", json.dumps(label("坡"), ensure_ascii=False)),
+    ] if status == "completed" else []
+    errors = [{"custom_id": "峰", "error": {"code": "server_error", "message": "boom"}}]
+    attach_batch_api(labeler, status, output, errors)
+
+    results = labeler.batch_label_characters(
+        [char_data(c) for c in "岭峰坡"], ["mountain"],
+        rate_limit_delay=0, batch_size=1, use_batch_api=True,
+    )
+
+    assert [r.char for r in results] == list("岭峰坡")
+    assert results[1].category == "terrain"
+    assert len(labeler.client.prompts) == (1 if status == "completed" else 3)
+    assert "Batch request for '峰' failed" in caplog.text
+
+
+def test_poll_batch_counts_usage_at_batch_discount():
+    usage = {"prompt_tokens": 1000, "completion_tokens": 500, "prompt_tokens_details": {"cached_tokens": 0}}
+    labeler = make_labeler([])
+    attach_batch_api(labeler, "completed", [
+        batch_record(c, json.dumps(label(c), ensure_ascii=False), usage) for c in "岭峰"
+    ])
+
+    labeler.poll_batch("batch-1", poll_interval=0)
+
+    # gpt-4: $0.06 per 1000/500-token request, half price through the Batch API
+    assert labeler.total_input_tokens == 2000
+    assert abs(labeler.get_spent_usd() - 0.06) < 1e-9
+
+
+def test_batch_api_over_budget_estimate_labels_synchronously():
+    replies = [json.dumps(label(c), ensure_ascii=False) for c in "岭峰坡"]
+    # Estimate for 3 characters at the batch discount is $0.027
+    labeler = make_labeler(replies, max_budget_usd=0.02)
+    attach_batch_api(labeler, "completed", [])
+    submitted = []
+    labeler.client.batches.create = lambda **kwargs: submitted.append(kwargs)
+
+    results = labeler.batch_label_characters(
+        [char_data(c) for c in "岭峰坡"], ["mountain"],
+        rate_limit_delay=0, batch_size=1, use_batch_api=True,
+    )
+
+    assert submitted == []
+    assert [r.char for r in results] == ["岭"]
+
+
+def test_cached_characters_skip_the_api(tmp_path):
+    cache = LabelingCache(str(tmp_path / "llm_cache.db"))
+    reply = json.dumps({"results": [label("岭"), label("峰")]}, ensure_ascii=False)
+    first = make_labeler([reply], cache=cache)
+    first.batch_label_characters(
+        [char_data("岭"), char_data("峰")], ["mountain"], rate_limit_delay=0
+    )
+
+    second = make_labeler([], cache=cache)
+    results = second.batch_label_characters(
+        [char_data("峰"), char_data("岭")], ["mountain"], rate_limit_delay=0
+    )
+
+    assert [r.char for r in results] == ["峰", "岭"]
+    assert second.client.prompts == []
+    cache.close()
+
+
+def test_batch_label_stops_when_budget_exceeded():
+    replies = [json.dumps(label(c), ensure_ascii=False) for c in "岭峰坡"]
+    # gpt-4: 1000 input + 500 output tokens = $0.06 per call
+    labeler = make_labeler(replies, max_budget_usd=0.05)
+
+    results = labeler.batch_label_characters(
+        [char_data(c) for c in "岭峰坡"], ["mountain"], rate_limit_delay=0, batch_size=1
+    )
+
+    assert [r.char for r in results] == ["岭"]
+    assert labeler.total_input_tokens == 1000
+    assert abs(labeler.get_spent_usd() - 0.06) < 1e-9
+
+
+def test_iter_label_characters_yields_before_later_calls():
+    replies = [json.dumps(label(c), ensure_ascii=False) for c in "岭峰"]
+    labeler = make_labeler(replies)
+
+    stream = labeler.iter_label_characters(
+        [char_data("岭"), char_data("峰")], ["mountain"], rate_limit_delay=0, batch_size=1
+    )
+
+    assert next(stream).char == "岭"
+    assert len(labeler.client.prompts) == 1
+    assert [r.char for r in stream] == ["峰"]
+
+
+def test_dedup_threshold_propagates_label_to_similar_characters():
+    reply = json.dumps(label("岭"), ensure_ascii=False)
+    labeler = make_labeler([reply])
+    ridge = dict(char_data("岭"), similar_chars=[("峦", 0.92)])
+    hills = dict(char_data("峦"), similar_chars=[("岭", 0.92)])
+
+    results = labeler.batch_label_characters(
+        [ridge, hills], ["mountain"], rate_limit_delay=0, batch_size=1, dedup_threshold=0.85
+    )
+
+    assert [(r.char, r.category) for r in results] == [("岭", "mountain"), ("峦", "mountain")]
+    assert "propagated from 岭" in results[1].reasoning
+    assert len(labeler.client.prompts) == 1
+
+
+@pytest.mark.parametrize("content, expected", [
+    ('{"category": "山"}', {"category": "山"}),
+    ('回覆 [注意]：\n```json\n{"category": "山", "alternative_categories": ["山"]}\n```',
+     {"category": "山", "alternative_categories": ["山"]}),
+    ('```\n{"category": "水"}\n```\n如有疑問 {請} 告知', {"category": "水"}),
+    ('結果如下：{"category": "山"} 以上 {完}', {"category": "山"}),
+    ('[注意] {"results": [{"char": "岭"}]}', {"results": [{"char": "岭"}]}),
+    ('[{"char": "岭"}] 完', [{"char": "岭"}]),
+    ('見 [1] 及 [2]：{"category": "山"}', {"category": "山"}),
+])
+def test_parse_json_content_skips_fences_and_prose(content, expected):
+    assert LLMLabeler._parse_json_content(content) == expected
+
+
+def test_parse_json_content_rejects_reply_without_json():
+    with pytest.raises(ValueError):
+        LLMLabeler._parse_json_content("無法判斷")
@@ -25,3 +25,68 @@ def test_morphology_pipeline_accepts_configured_lengths_and_persist_batch_size(t
     assert pipeline.suffix_lengths == [2]
     assert pipeline.prefix_lengths == []
     assert pipeline.persist_batch_size == 250
+
+
+def run_patterns(tmp_path, n_jobs):
+    import pandas as pd
+    from src.preprocessing.morphology_extractor import extract_morphology_features
+
+    config = PipelineConfig.create_default(
+        db_path=str(tmp_path / "villages.db"),
+        output_dir=str(tmp_path / "results"),
+        run_id=f"morph_jobs_{n_jobs}",
+    )
+    config.frequency.n_jobs = n_jobs
+    config.tendency.min_global_support = 1
+    config.tendency.min_regional_support = 1
+    pipeline = MorphologyPipeline(config, suffix_lengths=[1, 2], prefix_lengths=[2])
+
+    names = ['石头村', '新村', '大岭村', '石岭', '新围', '大坑', '上村', '下围']
+    villages_df = extract_morphology_features(pd.DataFrame({
+        '市级': [f'市{i % 2}' for i in range(80)],
+        '区县级': [f'县{i % 4}' for i in range(80)],
+        '乡镇级': [f'镇{i % 8}' for i in range(80)],
+        '自然村': [names[i % len(names)] for i in range(80)],
+    }), suffix_lengths=[1, 2], prefix_lengths=[2])
+    pipeline._analyze_all_patterns(villages_df)
+    return pipeline.output_dir
+
+
+def test_parallel_patterns_match_serial(tmp_path):
+    serial_dir = run_patterns(tmp_path, n_jobs=1)
+    parallel_dir = run_patterns(tmp_path, n_jobs=-1)
+
+    csv_names = sorted(path.name for path in serial_dir.glob("*.csv"))
+    assert len(csv_names) == 3 * 7
+    for name in csv_names:
+        assert (serial_dir / name).read_bytes() == (parallel_dir / name).read_bytes()
+
+
+def test_parquet_chunks_with_all_none_pattern_in_first_chunk(tmp_path):
+    import sqlite3
+    import pandas as pd
+    import pytest
+
+    pytest.importorskip("pyarrow")
+
+    # First chunk has only two-character names, so suffix_3 is all None there
+    names = ['石村', '新围'] * 50 + ['石头村', '大岭村'] * 50
+    db_path = tmp_path / "villages.db"
+    conn = sqlite3.connect(db_path)
+    pd.DataFrame({
+        '市级': '市', '区县级': '县', '乡镇级': '镇', '村委会': '村委',
+        '自然村_规范名': names, '自然村_去前缀': names, 'village_id': range(len(names)),
+    }).to_sql('广东省自然村_预处理', conn, index=False)
+    conn.close()
+
+    config = PipelineConfig.create_default(
+        db_path=str(db_path), output_dir=str(tmp_path / "results"), run_id="morph_chunks"
+    )
+    config.frequency.chunk_size = 100
+    pipeline = MorphologyPipeline(config, suffix_lengths=[1, 3], prefix_lengths=[2])
+
+    villages_df = pipeline._load_and_extract_morphology()
+
+    assert len(villages_df) == 200
+    assert villages_df['suffix_3'].notna().sum() == 100
+    assert (pipeline.output_dir / "village_morphology.parquet").exists()
@@ -3,7 +3,8 @@
 import pytest
 from src.preprocessing.numbered_village_normalizer import (
     detect_trailing_numeral,
-    normalize_numbered_village
+    normalize_numbered_village,
+    normalize_numbered_village_batch
 )
 
 
@@ -91,6 +92,13 @@ class TestNormalizeNumberedVillage:
 
         assert normalized == ["东村", "东村", "南岭", "南岭", "石岭村"]
 
+    def test_vectorized_batch_matches_scalar(self):
+        """Test that the batch API matches per-name normalization."""
+        names = ["东村一村", "南岭二", "石岭村", "一村", "一", "", "北岗十一村", "东村1村", "三角村"]
+        normalized = normalize_numbered_village_batch(names)
+
+        assert list(normalized) == [normalize_numbered_village(name) for name in names]
+
     def test_aggregation_effect(self):
         """Test that normalization enables aggregation."""
         names = ["东村一村", "东村二村", "东村三村"]
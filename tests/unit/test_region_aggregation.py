@@ -0,0 +1,115 @@
+"""
+Unit tests for SQL region aggregation (checked against a pandas groupby).
+"""
+
+import json
+import sqlite3
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.pipelines.region_aggregation import compute_region_aggregates
+from src.schema import REGION_LEVELS, init_region_levels
+from src.semantic.lexicon_loader import SemanticLexicon
+
+SEM_COLS = [
+    f"sem_{cat}" for cat in SemanticLexicon("data/semantic_lexicon_v1.json").list_categories()
+]
+
+
+@pytest.fixture(autouse=True)
+def default_region_levels():
+    # Other tests load configs that replace REGION_LEVELS in place
+    saved = list(REGION_LEVELS)
+    init_region_levels(["city", "county", "township", "committee"])
+    yield
+    init_region_levels(saved)
+
+
+def make_features(n=300, seed=0):
+    rng = np.random.default_rng(seed)
+    city = rng.choice(["广州市", "深圳市"], n).astype(object)
+    county = rng.choice(["甲区", "乙区", "丙区"], n).astype(object)
+    township = rng.choice(["一镇", "二镇"], n).astype(object)
+    city[:3] = None
+    county[3:6] = None
+    township[6:9] = None
+
+    # Few distinct values so tied counts are common; NULLs are not counted
+    suffix = rng.choice(["村", "坑", "围", "屋", "塘", "岭", "寮", "圳", "田", "洞", "冲", "湖"], n).astype(object)
+    prefix = rng.choice(["大", "小", "新", "上", "下"], n).astype(object)
+    suffix[rng.random(n) < 0.1] = None
+    prefix[rng.random(n) < 0.1] = None
+    kmeans = rng.integers(0, 4, n).astype(float)
+    kmeans[rng.random(n) < 0.2] = np.nan
+
+    df = pd.DataFrame({
+        "run_id": "run1",
+        REGION_LEVELS[0]: city,
+        REGION_LEVELS[1]: county,
+        REGION_LEVELS[2]: township,
+        "name_length": rng.integers(2, 5, n),
+        "suffix_2": suffix,
+        "prefix_2": prefix,
+        "kmeans_cluster_id": kmeans,
+        "dbscan_cluster_id": np.nan,
+    })
+    for col in SEM_COLS:
+        df[col] = rng.integers(0, 2, n)
+    return df
+
+
+def ranked(values, top_n=None):
+    # value_counts ranking with ties kept in order of first appearance
+    counts = values.value_counts(sort=False).sort_values(ascending=False, kind="stable")
+    return counts if top_n is None else counts.head(top_n)
+
+
+def reference_aggregates(df, group_cols, top_n):
+    rows = []
+    for key, group in df.groupby(group_cols, sort=True):
+        row = dict(zip(group_cols, key))
+        row["total_villages"] = len(group)
+        row["avg_name_length"] = group["name_length"].mean()
+        for col in SEM_COLS:
+            row[f"{col}_count"] = group[col].sum()
+            row[f"{col}_pct"] = group[col].sum() / len(group) * 100
+        row["top_suffixes_json"] = json.dumps(
+            [{"suffix": k, "count": int(v)} for k, v in ranked(group["suffix_2"], top_n).items()],
+            ensure_ascii=False,
+        )
+        row["top_prefixes_json"] = json.dumps(
+            [{"prefix": k, "count": int(v)} for k, v in ranked(group["prefix_2"], top_n).items()],
+            ensure_ascii=False,
+        )
+        row["cluster_distribution_json"] = json.dumps({
+            algo: {int(k): int(v) for k, v in ranked(group[f"{algo}_cluster_id"]).items()}
+            for algo in ["kmeans", "dbscan"]
+        }, ensure_ascii=False)
+        rows.append(row)
+    return pd.DataFrame(rows)
+
+
+@pytest.mark.parametrize("level", [0, 1, 2])
+def test_region_aggregates_match_pandas_groupby(level):
+    df = make_features()
+    conn = sqlite3.connect(":memory:")
+    df.to_sql("village_features", conn, index=False)
+    # Rows of another run must not be counted
+    df.assign(run_id="run0").to_sql("village_features", conn, index=False, if_exists="append")
+
+    group_cols = REGION_LEVELS[:level + 1]
+    result = compute_region_aggregates(conn, "run1", REGION_LEVELS[level], top_n=3)
+    expected = reference_aggregates(df, group_cols, top_n=3)
+
+    assert result.columns.tolist() == expected.columns.tolist()
+    pd.testing.assert_frame_equal(result, expected, check_dtype=False)
+    assert any(len(json.loads(s)) == 3 for s in result["top_suffixes_json"])
+
+
+def test_region_aggregates_empty_run():
+    conn = sqlite3.connect(":memory:")
+    make_features().to_sql("village_features", conn, index=False)
+
+    assert compute_region_aggregates(conn, "missing", REGION_LEVELS[0]).empty
@@ -0,0 +1,158 @@
+"""
+Unit tests for semantic co-occurrence counting and persistence.
+"""
+
+import itertools
+import random
+import sqlite3
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import src.nlp.semantic_cooccurrence as semantic_cooccurrence
+from src.nlp.semantic_cooccurrence import SemanticCooccurrence
+
+
+def make_lexicon(n_categories):
+    # Two disjoint characters per category, plus one outside the BMP
+    chars = [chr(0x4E00 + i) for i in range(2 * n_categories)]
+    lexicon = {f"cat{i}": chars[2 * i:2 * i + 2] for i in range(n_categories)}
+    lexicon["cat0"].append("\U00020000")
+    return lexicon
+
+
+def make_villages(lexicon, n=400, seed=0):
+    rng = random.Random(seed)
+    pool = [char for chars in lexicon.values() for char in chars] + list("村坑围屋")
+    names = ["".join(rng.choices(pool, k=rng.randint(1, 6))) for _ in range(n)]
+    names[:3] = [None, "", "村"]
+    return pd.DataFrame({"自然村": names})
+
+
+def reference_cooccurrence(lexicon, villages_df):
+    categories = list(lexicon)
+    char_to_cat = {char: categories.index(cat) for cat, chars in lexicon.items() for char in chars}
+    expected = np.zeros((len(categories), len(categories)), dtype=np.int64)
+    for name in villages_df["自然村"].dropna():
+        present = {char_to_cat[char] for char in name if char in char_to_cat}
+        for a, b in itertools.product(present, repeat=2):
+            expected[a, b] += 1
+    return pd.DataFrame(expected, index=categories, columns=categories)
+
+
+@pytest.mark.parametrize("n_categories", [5, 64, 70])
+@pytest.mark.parametrize("numba", [False, True])
+def test_counting_paths_match_reference(monkeypatch, n_categories, numba):
+    # Up to 64 categories use the bitmask path; above that numba or sparse M.T @ M
+    if numba and n_categories > 64:
+        pytest.importorskip("numba")
+    monkeypatch.setattr(semantic_cooccurrence, "NUMBA_AVAILABLE", numba)
+
+    lexicon = make_lexicon(n_categories)
+    villages_df = make_villages(lexicon)
+    analyzer = SemanticCooccurrence(":memory:", lexicon)
+    result = analyzer.analyze_villages(villages_df)
+
+    expected = reference_cooccurrence(lexicon, villages_df)
+    pd.testing.assert_frame_equal(result, expected)
+    assert analyzer.total_villages == len(villages_df)
+    assert analyzer.category_counts == {
+        cat: count for cat, count in zip(expected.index, np.diag(expected)) if count > 0
+    }
+
+
+@pytest.mark.parametrize("names", [[], [None, ""]])
+def test_empty_input_gives_zero_matrix(names):
+    lexicon = make_lexicon(5)
+    analyzer = SemanticCooccurrence(":memory:", lexicon)
+    result = analyzer.analyze_villages(pd.DataFrame({"自然村": pd.Series(names, dtype=object)}))
+
+    assert result.shape == (5, 5)
+    assert (result.to_numpy() == 0).all()
+    assert analyzer.total_villages == len(names)
+    assert not analyzer.category_counts
+
+
+def test_save_to_database_round_trip(tmp_path):
+    lexicon = make_lexicon(5)
+    db_path = tmp_path / "cooccurrence.db"
+    analyzer = SemanticCooccurrence(str(db_path), lexicon)
+    analyzer.analyze_villages(make_villages(lexicon, n=2000))
+    analyzer.save_to_database("run1")
+    analyzer.save_to_database("run1")
+    analyzer.close()
+
+    with sqlite3.connect(db_path) as conn:
+        saved = pd.read_sql(
+            "SELECT category1, category2, cooccurrence_count, pmi, is_significant "
+            "FROM semantic_cooccurrence WHERE run_id = 'run1' ORDER BY category1, category2",
+            conn,
+        )
+
+    pairs = list(itertools.combinations(analyzer.categories, 2))
+    assert list(zip(saved["category1"], saved["category2"])) == pairs
+    assert saved["cooccurrence_count"].tolist() == [
+        int(analyzer.cooccurrence_matrix.loc[a, b]) for a, b in pairs
+    ]
+    np.testing.assert_allclose(saved["pmi"], [analyzer.pmi_matrix.loc[a, b] for a, b in pairs])
+
+    significant = analyzer.find_significant_pairs()
+    significant_pairs = set(zip(significant["category1"], significant["category2"]))
+    assert significant_pairs
+    assert saved["is_significant"].tolist() == [int(pair in significant_pairs) for pair in pairs]
+
+
+def make_contingency_analyzer(seed=0):
+    # 全 is in every village, 空 in none, and 戊 never appears with 丙
+    lexicon = {"full": ["全"], "empty": ["空"], "c": ["丙"], "d": ["丁"], "e": ["戊"]}
+    rng = random.Random(seed)
+    names = []
+    for _ in range(300):
+        name = "全村" + "".join(char for char in "丙丁" if rng.random() < 0.3)
+        if "丙" not in name and rng.random() < 0.1:
+            name += "戊"
+        names.append(name)
+    analyzer = SemanticCooccurrence(":memory:", lexicon)
+    analyzer.analyze_villages(pd.DataFrame({"自然村": names}))
+    return analyzer
+
+
+def test_chi_square_pvalues_match_scipy():
+    from scipy.stats import chi2_contingency
+
+    analyzer = make_contingency_analyzer()
+    pvalues = analyzer.compute_chi_square()
+    matrix, counts, n = analyzer.cooccurrence_matrix, analyzer.category_counts, analyzer.total_villages
+    assert matrix.loc["c", "e"] == 0
+
+    for cat1, cat2 in itertools.combinations(analyzer.categories, 2):
+        both = matrix.loc[cat1, cat2]
+        cat1_only = counts.get(cat1, 0) - both
+        cat2_only = counts.get(cat2, 0) - both
+        contingency = np.array([[both, cat1_only], [cat2_only, n - cat1_only - cat2_only - both]])
+        try:
+            expected = chi2_contingency(contingency, correction=True)[1]
+        except ValueError:
+            # A zero row or column (the full and empty categories) has no test
+            expected = 1.0
+        assert pvalues.loc[cat1, cat2] == pytest.approx(expected, rel=1e-9, abs=1e-300)
+        assert pvalues.loc[cat2, cat1] == pvalues.loc[cat1, cat2]
+    assert (np.diag(pvalues) == 1.0).all()
+
+
+def test_pmi_matches_scalar_formula():
+    analyzer = make_contingency_analyzer()
+    pmi = analyzer.compute_pmi()
+    matrix, counts, n = analyzer.cooccurrence_matrix, analyzer.category_counts, analyzer.total_villages
+
+    for cat1, cat2 in itertools.product(analyzer.categories, repeat=2):
+        cooccur_count = matrix.loc[cat1, cat2]
+        cat1_count, cat2_count = counts.get(cat1, 0), counts.get(cat2, 0)
+        if cooccur_count == 0 or cat1_count == 0 or cat2_count == 0:
+            expected = 0.0
+        else:
+            expected = np.log2((cooccur_count / n) / ((cat1_count / n) * (cat2_count / n)))
+        assert pmi.loc[cat1, cat2] == pytest.approx(expected, abs=1e-12)
+    assert pmi.loc["full", "full"] == 0.0
+    assert pmi.loc["c", "e"] == 0.0
@@ -0,0 +1,148 @@
+"""
+Unit tests for semantic network metrics (checked against networkx).
+"""
+
+import random
+
+import networkx as nx
+import numpy as np
+import pytest
+
+from src.nlp.semantic_network import SemanticNetwork, _modularity_csr
+
+
+def make_network(num_nodes=30, edge_prob=0.2, seed=0):
+    rng = random.Random(seed)
+    graph = nx.Graph()
+    for i in range(num_nodes):
+        for j in range(i + 1, num_nodes):
+            if rng.random() < edge_prob:
+                graph.add_edge(
+                    f"c{i}", f"c{j}",
+                    weight=round(rng.uniform(0.1, 3.0), 3),
+                    cooccurrence=rng.randint(5, 50),
+                )
+    # Zero-weight edge leaves a dangling node for PageRank
+    graph.add_edge("d0", "d1", weight=0.0, cooccurrence=5)
+
+    analyzer = SemanticNetwork(db_path=":memory:")
+    analyzer.graph = graph
+    return analyzer
+
+
+def test_pagerank_matches_networkx():
+    analyzer = make_network()
+    graph = analyzer.graph
+    reference = nx.pagerank(graph, alpha=0.85, weight="weight", tol=1e-14, max_iter=1000)
+
+    scores = analyzer.compute_pagerank(alpha=0.85, tol=1e-6)
+
+    # Adaptive skipping stops within the same L1 tolerance as networkx
+    assert scores.keys() == reference.keys()
+    assert sum(scores.values()) == pytest.approx(1.0)
+    error = sum(abs(scores[node] - value) for node, value in reference.items())
+    assert error < graph.number_of_nodes() * 1e-6
+
+
+def test_betweenness_is_sampled_above_threshold():
+    analyzer = make_network()
+    exact = nx.betweenness_centrality(analyzer.graph, weight="weight")
+    sampled = nx.betweenness_centrality(analyzer.graph, k=8, weight="weight", seed=42)
+
+    small = analyzer.compute_centrality()
+    large = analyzer.compute_centrality(bc_samples=8, bc_threshold=10)
+
+    for node in analyzer.graph:
+        assert small[node]["betweenness"] == pytest.approx(exact[node])
+        assert large[node]["betweenness"] == pytest.approx(sampled[node])
+
+
+def test_modularity_csr_matches_networkx():
+    analyzer = make_network()
+    graph = analyzer.graph
+    graph.add_edge("c0", "c0", weight=1.5, cooccurrence=5)
+    nodes = list(graph.nodes())
+    communities = nx.community.louvain_communities(graph, weight="weight", seed=1)
+    labels = np.zeros(len(nodes), dtype=np.int64)
+    for comm_id, comm_set in enumerate(communities):
+        for node in comm_set:
+            labels[nodes.index(node)] = comm_id
+    A = nx.to_scipy_sparse_array(graph, nodelist=nodes, weight="weight", format="csr")
+
+    for resolution in (0.5, 1.0):
+        expected = nx.community.modularity(
+            graph, communities, weight="weight", resolution=resolution
+        )
+        assert _modularity_csr(A, labels, resolution) == pytest.approx(expected)
+
+
+def test_louvain_returns_full_partition():
+    analyzer = make_network()
+
+    communities = analyzer.detect_communities(method="louvain")
+
+    assert communities.keys() == set(analyzer.graph.nodes())
+    assert sorted(set(communities.values())) == list(range(len(set(communities.values()))))
+
+
+def test_louvain_networkx_keeps_level_before_small_gain(monkeypatch):
+    analyzer = make_network()
+    good = nx.community.louvain_communities(analyzer.graph, weight="weight", seed=1)
+    merged = [set(analyzer.graph.nodes())]
+    # The merged level has lower modularity, so its gain fails the tolerance
+    monkeypatch.setattr(
+        "src.nlp.semantic_network.community.louvain_partitions",
+        lambda *args, **kwargs: iter([good, merged]),
+    )
+
+    assert analyzer._louvain_networkx(resolution=1.0) is good
+
+
+def test_parallel_closeness_matches_serial():
+    serial = make_network().compute_centrality()
+    parallel = make_network().compute_centrality(n_jobs=2)
+
+    for node, metrics in serial.items():
+        assert parallel[node]["closeness"] == pytest.approx(metrics["closeness"])
+
+
+def test_shortest_path_stats_match_networkx():
+    analyzer = make_network(edge_prob=0.3, seed=3)
+    analyzer.graph.remove_nodes_from(["d0", "d1"])
+    graph = analyzer.graph
+    assert nx.is_connected(graph)
+
+    stats = analyzer.get_network_stats()
+
+    assert stats["diameter"] == nx.diameter(graph)
+    assert stats["avg_shortest_path"] == pytest.approx(
+        nx.average_shortest_path_length(graph, weight="weight")
+    )
+    capped = analyzer.get_network_stats(apsp_max_nodes=10)
+    assert capped["diameter"] is None and capped["avg_shortest_path"] is None
+
+
+@pytest.mark.parametrize("num_nodes", [30, 250])
+def test_eigenvector_matches_networkx(num_nodes):
+    analyzer = make_network(num_nodes=num_nodes, edge_prob=0.3, seed=3)
+    analyzer.graph.remove_nodes_from(["d0", "d1"])
+    expected = nx.eigenvector_centrality(analyzer.graph, weight="weight", max_iter=1000, tol=1e-10)
+
+    centrality = analyzer.compute_centrality()
+
+    for node, value in expected.items():
+        assert centrality[node]["eigenvector"] == pytest.approx(value, abs=1e-6)
+
+
+def test_structure_stats_match_networkx():
+    analyzer = make_network()
+    graph = analyzer.graph
+
+    stats = analyzer.get_network_stats()
+
+    assert stats["num_components"] == nx.number_connected_components(graph)
+    assert stats["is_connected"] == nx.is_connected(graph)
+    assert stats["density"] == pytest.approx(nx.density(graph))
+    assert stats["avg_clustering"] == pytest.approx(
+        nx.average_clustering(graph, weight="weight")
+    )
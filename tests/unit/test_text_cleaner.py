@@ -5,7 +5,8 @@ from src.preprocessing.text_cleaner import (
     is_valid_chinese_char,
     remove_parenthetical_notes,
     extract_chinese_chars,
-    normalize_village_name
+    normalize_village_name,
+    normalize_village_names
 )
 
 
@@ -160,3 +161,21 @@ class TestNormalizeVillageName:
         result = normalize_village_name('大(土布)', bracket_mode='keep_all')
         assert result.clean_name == '大土布'
         assert result.had_brackets is False
+
+
+class TestNormalizeVillageNames:
+    """Test batch normalization with per-name caching."""
+
+    def test_matches_single_name_normalization(self):
+        """Test that results match normalize_village_name for every input."""
+        names = ['石头村', '大(土布)', '石头村', None, '', '123ABC', '村', '石头村']
+        results = normalize_village_names(names, min_name_length=2)
+
+        assert len(results) == len(names)
+        for name, result in zip(names, results):
+            assert result == normalize_village_name(name, min_name_length=2)
+
+    def test_duplicates_share_result(self):
+        """Test that repeated names are cleaned only once."""
+        results = normalize_village_names(['石头村', '大村', '石头村'])
+        assert results[0] is results[2]